@@ -1,19 +1,58 @@
-import re
 import os
-from uuid import uuid4
-from typing import Optional, List, cast
+import asyncio
+import httpx
+import time
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Optional,
+    List,
+    Tuple,
+    cast,
+)
 from fastapi import UploadFile, HTTPException
-from crawl4ai import AsyncWebCrawler, CrawlResult
-from crawl4ai.models import CrawlResultContainer
 from pydantic import HttpUrl
+from crawl4ai import CrawlResult
 from langchain_core.documents import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_pymupdf4llm import PyMuPDF4LLMLoader
 
-from src.configs import crawler_config
-from src.schemas.capture import KnowledgeExtractionHelperOutput
+from src.configs import crawler_config, settings
+from src.schemas.capture import (
+    KnowledgeExtractionHelperOutput,
+    UrlCaptureResult,
+    UrlRefreshResult,
+    UrlVersion,
+)
 from src.db.vectorstore import get_vector_store
+from src.db.embedding_cache import content_hash, embedding_cache
+from src.db.chunk_writer import ChunkWriter, open_chunk_writer
+from src.db.collection_settings import get_collection_settings
+from src.db.captured_sources import (
+    get_captured_source,
+    list_captured_urls,
+    mark_captured_source_checked,
+    upsert_captured_source,
+)
 from src.db.session import get_async_session
+from src.db.ingestion_jobs import (
+    ensure_ingestion_jobs_table,
+    create_ingestion_job,
+    update_ingestion_job,
+    get_ingestion_job,
+    list_unfinished_ingestion_jobs,
+)
+from src.utils.ingestion_worker import ingestion_workers
+from src.utils.selection_buffer import SelectionBuffer
+from src.utils.crawler_pool import crawler_pool
+from src.utils.crawl_cache import CrawledPage, crawl_cache
+from src.utils.site_crawler import crawl_site
+from src.utils.pdf_extraction import iter_pdf_pages, read_pdf_info
+from src.utils.uploads import save_upload
+from src.utils.capture_metrics import CaptureMetrics
+from src.utils.chunking import normalize_markdown, split_markdown
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -25,108 +64,144 @@ async def _handle_selection_capture(
     """
     Extracts text from a user's selection.
     """
-    cleaned = re.sub(r"\s+", " ", selection).strip()
+    cleaned = normalize_markdown(selection)
     if len(cleaned) > 0:
         return [
             KnowledgeExtractionHelperOutput(
-                content=cleaned, metadata={"source": str(url)}
+                content=cleaned,
+                metadata={
+                    "source": str(url),
+                    "type": "selection",
+                    # tells selections of the same page apart when they are parents
+                    "selection_id": content_hash(cleaned)[:16],
+                },
             )
         ]
 
     return None
 
 
-async def _handle_url_capture(
-    url: HttpUrl,
-) -> List[KnowledgeExtractionHelperOutput] | None:
+def _crawled_page(result: CrawlResult) -> Optional[CrawledPage]:
     """
-    Extracts content from a URL using crawl4ai.
+    Returns the extracted markdown and the validators of a crawled page.
     """
-    crawler = AsyncWebCrawler()
-    result = cast(
-        CrawlResultContainer[CrawlResult],
-        await crawler.arun(str(url), config=crawler_config),
+    if not (result.success and hasattr(result.markdown, "fit_markdown")):
+        return None
+    headers = {k.lower(): v for k, v in (result.response_headers or {}).items()}
+    return CrawledPage(
+        markdown=cast(str, result.markdown.fit_markdown),  # type: ignore
+        etag=headers.get("etag"),
+        last_modified=headers.get("last-modified"),
     )
-    if result.success and hasattr(result.markdown, "fit_markdown"):
-        fit_md = cast(str, result.markdown.fit_markdown)  # type: ignore
-        fit_md = re.sub(r"\s+", " ", fit_md).strip()
-        return [
-            KnowledgeExtractionHelperOutput(
-                content=fit_md, metadata={"source": str(url)}
-            )
-        ]
-    return None
 
 
-async def _handle_pdf_capture(
-    pdf: UploadFile,
-) -> List[KnowledgeExtractionHelperOutput] | None:
+def _knowledge_from_page(
+    url: str, page: Optional[CrawledPage]
+) -> Tuple[List[KnowledgeExtractionHelperOutput] | None, Optional[UrlVersion]]:
     """
-    Extracts content from a PDF file.
-    The UploadFile will be stored temporarily on disk for processing.
-    Then it will be immediately deleted.
+    Returns the content and the version of a crawled page.
     """
+    if page is None:
+        return None, None
+    fit_md = normalize_markdown(page.markdown)
+    return [
+        KnowledgeExtractionHelperOutput(content=fit_md, metadata={"source": url})
+    ], UrlVersion(
+        etag=page.etag,
+        last_modified=page.last_modified,
+        content_hash=content_hash(fit_md),
+    )
 
-    # write the uploaded file to a temp file
-    tmp_filepath = f"{os.getcwd()}/tmp/{uuid4()}_{pdf.filename}"
-    with open(tmp_filepath, "wb") as f:
-        f.write(await pdf.read())
 
-    # limitation: we do not extract images for now
-    loader = PyMuPDF4LLMLoader(
-        file_path=tmp_filepath,
-        mode="page",
-        extract_images=False,
-        table_strategy="lines_strict",
-    )
+async def _handle_url_capture(
+    url: HttpUrl, bypass_cache: bool = False
+) -> Tuple[List[KnowledgeExtractionHelperOutput] | None, Optional[UrlVersion]]:
+    """
+    Extracts content from a URL using crawl4ai, unless the page is cached.
+    With `bypass_cache`, the page is always crawled and its cache entry renewed.
+    Also returns the version of the page, to skip it when it is unchanged.
+    """
+    page = None if bypass_cache else await crawl_cache.get(str(url), crawler_config)
+    if page is None:
+        start = time.perf_counter()
+        result = await crawler_pool.crawl(str(url), crawler_config)
+        page = _crawled_page(result)
+        if page is not None:
+            await crawl_cache.put(
+                str(url), crawler_config, page, time.perf_counter() - start
+            )
+    return _knowledge_from_page(str(url), page)
 
-    # load and process the pdf
-    try:
-        docs = await loader.aload()
-        if len(docs) == 0:
-            return None
-
-        knowledge = []
-        for doc in docs:
-            page_md = re.sub(r"\s+", " ", doc.page_content).strip()
-            if len(page_md) > 0:
-                knowledge.append(
-                    KnowledgeExtractionHelperOutput(
-                        content=page_md,
-                        metadata={
-                            "source": pdf.filename,
-                            "page_number": doc.metadata.get("page", None),
-                            "author": doc.metadata.get("author", None),
-                            "title": doc.metadata.get("title", None),
-                            "subject": doc.metadata.get("subject", None),
-                            "keywords": doc.metadata.get("keywords", None),
-                            "total_pages": doc.metadata.get("total_pages", None),
-                            "creator": doc.metadata.get("creator", None),
-                            "producer": doc.metadata.get("producer", None),
-                        },
-                    )
-                )
 
-        if len(knowledge) == 0:
-            return None
+async def _record_url_version(
+    knowledge_base: str, url: str, version: Optional[UrlVersion]
+):
+    """
+    Remembers the captured version of a URL for later refreshes.
+    """
+    if version is not None:
+        await upsert_captured_source(
+            knowledge_base,
+            url,
+            etag=version.etag,
+            last_modified=version.last_modified,
+            content_hash=version.content_hash,
+        )
 
-        return knowledge
-    finally:
-        if os.path.exists(tmp_filepath):
-            os.remove(tmp_filepath)
 
+async def _iter_pdf_knowledge(
+    filepath: str, filename: Optional[str]
+) -> AsyncIterator[KnowledgeExtractionHelperOutput]:
+    """
+    Yields the content of a PDF file stored on disk, page by page.
+    Pages are converted in parallel by the PDF extraction process pool.
+    """
+    page_count, doc_metadata = await read_pdf_info(filepath)
 
-async def _save_to_vector_db(
-    knowledge: List[KnowledgeExtractionHelperOutput], knowledge_base: str
-):
+    async for page_number, page_content in iter_pdf_pages(filepath, page_count):
+        page_md = normalize_markdown(page_content)
+        if len(page_md) > 0:
+            yield KnowledgeExtractionHelperOutput(
+                content=page_md,
+                metadata={
+                    "source": filename,
+                    "page_number": page_number,
+                    "author": doc_metadata.get("author", None),
+                    "title": doc_metadata.get("title", None),
+                    "subject": doc_metadata.get("subject", None),
+                    "keywords": doc_metadata.get("keywords", None),
+                    "total_pages": doc_metadata.get("total_pages", None),
+                    "creator": doc_metadata.get("creator", None),
+                    "producer": doc_metadata.get("producer", None),
+                },
+            )
+
+
+async def _iter_site_knowledge(
+    url: HttpUrl, max_depth: int, max_pages: int, versions: Dict[str, UrlVersion]
+) -> AsyncIterator[KnowledgeExtractionHelperOutput]:
     """
-    Saves the extracted knowledge to the specified vector knowledge base.
+    Yields the content of the pages of a site as they are crawled.
+    The version of every page is added to `versions`, by canonical URL.
     """
+    async for page_url, result in crawl_site(
+        str(url), crawler_config, max_depth, max_pages
+    ):
+        knowledge, version = _knowledge_from_page(page_url, _crawled_page(result))
+        if not knowledge or version is None:
+            continue
+        versions[page_url] = version
+        for page in knowledge:
+            yield page
 
-    # first -> check if collection/knowledge_base exists
+
+async def _ensure_knowledge_base_exists(knowledge_base: str):
+    """
+    Raises an HTTPException if the knowledge base does not exist.
+    """
     vector_store = get_vector_store()
 
-    # vector_store.collection_name = knowledge_base
+    # get_vector_store(knowledge_base)
     """ 
     Using the above line will create a new collection if it does not exist, 
     which is not the desired behavior. We want to check for existence only. 
@@ -143,21 +218,279 @@ async def _save_to_vector_db(
 
         await session.aclose()
 
-    # second -> create langchain docs
+
+async def _split_knowledge(
+    knowledge: List[KnowledgeExtractionHelperOutput], knowledge_base: str
+) -> List[Document]:
+    """
+    Splits the extracted knowledge into chunks along its markdown structure,
+    sized with the chunking settings of the knowledge base (small child chunks
+    when it retrieves parent documents).
+    Large inputs are split in a worker thread to keep the event loop responsive.
+    """
+    collection_settings = await get_collection_settings(knowledge_base)
     docs = [Document(page_content=k.content, metadata=k.metadata) for k in knowledge]
 
-    # third -> split the documents into chunks
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=200,
-        add_start_index=True,
+    split = partial(split_markdown, docs, *collection_settings.indexed_chunking())
+    if sum(len(doc.page_content) for doc in docs) >= settings.CHUNK_THREAD_MIN_CHARS:
+        return await asyncio.to_thread(split)
+    return split()
+
+
+async def _embed_and_store(
+    split_docs: List[Document],
+    writer: ChunkWriter,
+    metrics: Optional[CaptureMetrics] = None,
+    batch_size: Optional[int] = None,
+):
+    """
+    Embeds the chunks and writes them as their embeddings arrive. Chunks
+    that are stored already are skipped. The others are embedded in batches
+    of `batch_size` (EMBEDDING_BATCH_SIZE by default), all requested up
+    front: the embedding cache sends them with at most EMBEDDING_CONCURRENCY
+    requests in flight across captures, and each batch is written in order
+    while the following ones are still being embedded.
+    """
+    metrics = metrics or CaptureMetrics()
+    new_docs = await writer.skip_stored(split_docs)
+
+    async def embed(batch: List[Document]) -> List[List[float]]:
+        # reuse cached vectors of identical chunks
+        metrics.embedding_started()
+        try:
+            vectors, hits = await embedding_cache.aembed_documents(
+                [doc.page_content for doc in batch]
+            )
+        except BaseException:
+            metrics.embedding_failed()
+            raise
+        metrics.embedding_finished(len(batch), hits)
+        return vectors
+
+    batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+    embedding = [
+        (batch, asyncio.create_task(embed(batch)))
+        for batch in (
+            new_docs[start : start + batch_size]
+            for start in range(0, len(new_docs), batch_size)
+        )
+    ]
+
+    try:
+        for batch, task in embedding:
+            await writer.write(batch, await task)
+    finally:
+        for _, task in embedding:
+            task.cancel()
+        await asyncio.gather(*(task for _, task in embedding), return_exceptions=True)
+
+
+def _log_capture(knowledge_base: str, writer: ChunkWriter, metrics: CaptureMetrics):
+    logger.info(f"{metrics.summary(knowledge_base)} Wrote {writer.summary()}.")
+
+
+async def _save_to_vector_db(
+    knowledge: List[KnowledgeExtractionHelperOutput], knowledge_base: str
+):
+    """
+    Saves the extracted knowledge to the specified vector knowledge base.
+    """
+
+    # first -> check if collection/knowledge_base exists
+    await _ensure_knowledge_base_exists(knowledge_base)
+
+    # second -> split the documents into chunks
+    split_docs = await _split_knowledge(knowledge, knowledge_base)
+
+    # third -> embed and store the chunks, replacing earlier captures of the source
+    metrics = CaptureMetrics()
+    async with open_chunk_writer(knowledge_base, metrics=metrics) as writer:
+        await _embed_and_store(split_docs, writer, metrics=metrics)
+    _log_capture(knowledge_base, writer, metrics)
+
+
+async def _ingest_knowledge_stream(
+    knowledge: AsyncIterator[KnowledgeExtractionHelperOutput],
+    knowledge_base: str,
+    on_progress: Optional[Callable[[Dict[str, int]], Awaitable[None]]] = None,
+) -> Dict[str, int]:
+    """
+    Chunks and embeds knowledge while it is still being extracted.
+    Pages are split as they arrive and their chunks are grouped into batches
+    of CAPTURE_BATCH_EMBED_SIZE, which are embedded by a background task.
+    At most INGEST_MAX_PENDING_BATCHES batches wait for it, so extraction
+    pauses while embedding is behind and memory stays bounded whatever the
+    size of the source. Chunks are written as their embeddings arrive, and
+    the chunks written so far are deleted again if any stage fails.
+
+    Returns:
+        Dict[str, int]: The number of pages, chunks and chunks embedded, and
+        the embedding and insertion throughput.
+    """
+    progress = {"pages": 0, "chunks": 0, "chunks_embedded": 0}
+    metrics = CaptureMetrics()
+    batches: asyncio.Queue[Optional[List[Document]]] = asyncio.Queue(
+        maxsize=settings.INGEST_MAX_PENDING_BATCHES
+    )
+
+    async with open_chunk_writer(knowledge_base, metrics=metrics) as writer:
+
+        async def store():
+            while (batch := await batches.get()) is not None:
+                await _embed_and_store(batch, writer, metrics=metrics)
+                progress["chunks_embedded"] += len(batch)
+                progress.update(metrics.rates())
+                if on_progress:
+                    await on_progress(dict(progress))
+
+        storer = asyncio.create_task(store())
+
+        async def put(batch: Optional[List[Document]]):
+            # wait for a free slot, unless the storer fails while we wait
+            put_task = asyncio.ensure_future(batches.put(batch))
+            await asyncio.wait({put_task, storer}, return_when=asyncio.FIRST_COMPLETED)
+            if not put_task.done():
+                put_task.cancel()
+                storer.result()
+
+        try:
+            pending: List[Document] = []
+            async for page in knowledge:
+                split_docs = await _split_knowledge([page], knowledge_base)
+                progress["pages"] += 1
+                progress["chunks"] += len(split_docs)
+                pending.extend(split_docs)
+
+                while len(pending) >= settings.CAPTURE_BATCH_EMBED_SIZE:
+                    await put(pending[: settings.CAPTURE_BATCH_EMBED_SIZE])
+                    pending = pending[settings.CAPTURE_BATCH_EMBED_SIZE :]
+
+            if pending:
+                await put(pending)
+            await put(None)
+            await storer
+        except BaseException:
+            # the chunks written so far are deleted by the writer
+            storer.cancel()
+            await asyncio.gather(storer, return_exceptions=True)
+            logger.warning(f"Dropping failed capture in '{knowledge_base}'.")
+            raise
+
+    _log_capture(knowledge_base, writer, metrics)
+    progress.update(metrics.rates())
+    if on_progress:
+        await on_progress(dict(progress))
+    return progress
+
+
+async def _ingest_pdf(
+    filepath: str,
+    filename: Optional[str],
+    knowledge_base: str,
+    on_progress: Optional[Callable[[Dict[str, int]], Awaitable[None]]] = None,
+):
+    """
+    Streams the pages of a PDF stored on disk into an existing knowledge base.
+    """
+    progress = await _ingest_knowledge_stream(
+        _iter_pdf_knowledge(filepath, filename), knowledge_base, on_progress
     )
-    split_docs = splitter.split_documents(docs)
+    if progress["chunks"] == 0:
+        raise HTTPException(
+            status_code=400, detail="No content extracted from the provided source."
+        )
+
 
-    # fourth -> store the chunks in the vector store
-    # set the collection name to the target knowledge base as we know it exists
-    vector_store.collection_name = knowledge_base
-    await vector_store.aadd_documents(documents=split_docs)
+def _site_crawl_limits(
+    max_depth: Optional[int], max_pages: Optional[int]
+) -> Tuple[int, int]:
+    """
+    Returns the depth and page budget of a site crawl, capped by the settings.
+    """
+    return (
+        min(
+            max_depth if max_depth is not None else settings.SITE_CRAWL_MAX_DEPTH,
+            settings.SITE_CRAWL_MAX_DEPTH,
+        ),
+        min(
+            max_pages if max_pages is not None else settings.SITE_CRAWL_MAX_PAGES,
+            settings.SITE_CRAWL_MAX_PAGES,
+        ),
+    )
+
+
+async def _ingest_site(
+    url: HttpUrl,
+    knowledge_base: str,
+    max_depth: int,
+    max_pages: int,
+    on_progress: Optional[Callable[[Dict[str, int]], Awaitable[None]]] = None,
+):
+    """
+    Crawls a site into an existing knowledge base. Pages are chunked, embedded
+    and stored while the following pages are still being crawled.
+    """
+    versions: Dict[str, UrlVersion] = {}
+    progress = await _ingest_knowledge_stream(
+        _iter_site_knowledge(url, max_depth, max_pages, versions),
+        knowledge_base,
+        on_progress,
+    )
+    if progress["chunks"] == 0:
+        raise HTTPException(
+            status_code=400, detail="No content extracted from the provided source."
+        )
+
+    for page_url, version in versions.items():
+        await _record_url_version(knowledge_base, page_url, version)
+
+
+async def _flush_selections(knowledge_base: str, split_docs: List[Document]):
+    """
+    Stores a batch of buffered selection chunks of one knowledge base, with
+    one embedding request for every SELECTION_BUFFER_MAX_CHUNKS chunks.
+    Selections only add chunks, other selections of the same page are kept.
+    """
+    await _ensure_knowledge_base_exists(knowledge_base)
+
+    metrics = CaptureMetrics()
+    async with open_chunk_writer(
+        knowledge_base, replace_sources=False, metrics=metrics
+    ) as writer:
+        await _embed_and_store(
+            split_docs,
+            writer,
+            metrics=metrics,
+            batch_size=settings.SELECTION_BUFFER_MAX_CHUNKS,
+        )
+    _log_capture(knowledge_base, writer, metrics)
+
+
+# coalesces selection captures into batched writes
+selection_buffer = SelectionBuffer(
+    flusher=_flush_selections,
+    window=settings.SELECTION_BUFFER_WINDOW,
+    max_chunks=settings.SELECTION_BUFFER_MAX_CHUNKS,
+)
+
+
+def _check_capture_input(
+    type: str,
+    url: Optional[HttpUrl],
+    selection: Optional[str],
+    pdf: Optional[UploadFile],
+):
+    """
+    Raises an HTTPException if the data required by the capture type is missing.
+    """
+    if not (
+        (type == "selection" and selection and url)
+        or (type in ("url", "site") and url)
+        or (type == "pdf" and pdf)
+    ):
+        raise HTTPException(
+            status_code=400, detail="Missing data for the specified capture type."
+        )
 
 
 async def handle_knowledge_capture(
@@ -166,29 +499,414 @@ async def handle_knowledge_capture(
     url: Optional[HttpUrl] = None,
     selection: Optional[str] = None,
     pdf: Optional[UploadFile] = None,
+    max_depth: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    bypass_cache: bool = False,
 ):
     """
     Main API function to handle knowledge capture from different sources.
     """
 
+    _check_capture_input(type, url, selection, pdf)
+
+    if type == "site" and url:
+        await _ensure_knowledge_base_exists(knowledge_base)
+        await _ingest_site(
+            url, knowledge_base, *_site_crawl_limits(max_depth, max_pages)
+        )
+        return None
+
+    if type == "pdf" and pdf:
+        await _ensure_knowledge_base_exists(knowledge_base)
+
+        # the upload is streamed to a temp file and deleted once it is ingested
+        tmp_filepath = await save_upload(pdf, os.path.join(os.getcwd(), "tmp"))
+        try:
+            await _ingest_pdf(tmp_filepath, pdf.filename, knowledge_base)
+        finally:
+            if os.path.exists(tmp_filepath):
+                os.remove(tmp_filepath)
+        return None
+
     knowledge: Optional[List[KnowledgeExtractionHelperOutput]] = None
+    version: Optional[UrlVersion] = None
 
     if type == "selection" and selection and url:
         knowledge = await _handle_selection_capture(selection, url)
     elif type == "url" and url:
-        knowledge = await _handle_url_capture(url)
-    elif type == "pdf" and pdf:
-        knowledge = await _handle_pdf_capture(pdf)
-    else:
-        raise HTTPException(
-            status_code=400, detail="Missing data for the specified capture type."
-        )
+        knowledge, version = await _handle_url_capture(url, bypass_cache)
 
     if not knowledge:
         raise HTTPException(
             status_code=400, detail="No content extracted from the provided source."
         )
 
+    if type == "selection":
+        # small selections are coalesced with concurrent ones into one batch
+        split_docs = await _split_knowledge(knowledge, knowledge_base)
+        await selection_buffer.add(knowledge_base, split_docs)
+        return None
+
     await _save_to_vector_db(knowledge, knowledge_base)
+    await _record_url_version(knowledge_base, str(url), version)
 
     return None
+
+
+async def handle_batch_url_capture(
+    knowledge_base: str, urls: List[HttpUrl], bypass_cache: bool = False
+) -> List[UrlCaptureResult]:
+    """
+    Captures many URLs into one knowledge base.
+    Pages are crawled concurrently (bounded by CAPTURE_BATCH_CONCURRENCY and the
+    crawler pool) while already extracted pages are chunked, embedded and
+    inserted in batches of CAPTURE_BATCH_EMBED_SIZE chunks.
+
+    Returns:
+        List[UrlCaptureResult]: The outcome of every URL, in request order.
+    """
+    if len(urls) > settings.CAPTURE_BATCH_MAX_URLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch capture accepts at most {settings.CAPTURE_BATCH_MAX_URLS} URLs.",
+        )
+
+    await _ensure_knowledge_base_exists(knowledge_base)
+
+    results = {str(url): UrlCaptureResult(url=str(url), success=False) for url in urls}
+    semaphore = asyncio.Semaphore(settings.CAPTURE_BATCH_CONCURRENCY)
+
+    versions: Dict[str, Optional[UrlVersion]] = {}
+
+    async def crawl(url: HttpUrl) -> Tuple[str, List[Document]]:
+        async with semaphore:
+            try:
+                knowledge, versions[str(url)] = await _handle_url_capture(
+                    url, bypass_cache
+                )
+            except Exception as e:
+                results[str(url)].error = str(e)
+                return str(url), []
+
+        if not knowledge:
+            results[str(url)].error = "No content extracted from the provided source."
+            return str(url), []
+        return str(url), await _split_knowledge(knowledge, knowledge_base)
+
+    pending_urls: List[str] = []
+    pending_docs: List[Document] = []
+    metrics = CaptureMetrics()
+
+    async def flush():
+        try:
+            # one transaction per flush, a failed flush leaves the others intact
+            async with open_chunk_writer(knowledge_base, metrics=metrics) as writer:
+                await _embed_and_store(pending_docs, writer, metrics=metrics)
+            logger.info(f"Batch capture wrote {writer.summary()}.")
+            for url in pending_urls:
+                results[url].success = True
+                await _record_url_version(knowledge_base, url, versions.get(url))
+        except Exception as e:
+            logger.error(f"Failed to store batch for '{knowledge_base}': {e}")
+            for url in pending_urls:
+                results[url].chunks = 0
+                results[url].error = str(e)
+        pending_urls.clear()
+        pending_docs.clear()
+
+    # store pages as they are crawled, the remaining crawls keep running meanwhile
+    for task in asyncio.as_completed([crawl(url) for url in urls]):
+        url, split_docs = await task
+        if not split_docs:
+            continue
+
+        results[url].chunks = len(split_docs)
+        pending_urls.append(url)
+        pending_docs.extend(split_docs)
+        if len(pending_docs) >= settings.CAPTURE_BATCH_EMBED_SIZE:
+            await flush()
+
+    if pending_docs:
+        await flush()
+
+    logger.info(metrics.summary(knowledge_base))
+    return [results[str(url)] for url in urls]
+
+
+async def handle_capture_job_submission(
+    type: str,
+    knowledge_base: str,
+    url: Optional[HttpUrl] = None,
+    selection: Optional[str] = None,
+    pdf: Optional[UploadFile] = None,
+    max_depth: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    bypass_cache: bool = False,
+) -> str:
+    """
+    Validates a capture request and schedules it as a background ingestion job.
+    Uploaded PDFs are kept on disk until the job has finished.
+
+    Returns:
+        str: The id of the created job.
+    """
+    _check_capture_input(type, url, selection, pdf)
+    await _ensure_knowledge_base_exists(knowledge_base)
+
+    payload: Dict[str, Any] = {
+        "url": str(url) if url else None,
+        "selection": selection,
+        "bypass_cache": bypass_cache,
+    }
+    if type == "pdf" and pdf:
+        pdf_path = await save_upload(
+            pdf, os.path.join(os.getcwd(), settings.INGESTION_UPLOAD_DIR)
+        )
+        payload.update({"pdf_path": pdf_path, "pdf_filename": pdf.filename})
+    if type == "site":
+        depth, pages = _site_crawl_limits(max_depth, max_pages)
+        payload.update({"max_depth": depth, "max_pages": pages})
+
+    job_id = await create_ingestion_job(type, knowledge_base, payload)
+    ingestion_workers.submit(job_id)
+
+    return job_id
+
+
+async def _extract_for_job(
+    type: str, payload: Dict[str, Any]
+) -> Tuple[List[KnowledgeExtractionHelperOutput] | None, Optional[UrlVersion]]:
+    """
+    Runs the extraction step of a selection or URL capture job.
+    """
+    if type == "selection":
+        knowledge = await _handle_selection_capture(
+            payload["selection"], payload["url"]
+        )
+        return knowledge, None
+    return await _handle_url_capture(payload["url"], payload.get("bypass_cache", False))
+
+
+async def _run_staged_capture_job(
+    job_id: str, type: str, payload: Dict[str, Any], knowledge_base: str
+):
+    """
+    Runs a selection or URL capture job one stage after the other.
+    """
+    await update_ingestion_job(job_id, status="running", stage="extracting")
+    knowledge, version = await _extract_for_job(type, payload)
+    if not knowledge:
+        raise ValueError("No content extracted from the provided source.")
+
+    await update_ingestion_job(
+        job_id, stage="chunking", progress={"pages": len(knowledge)}
+    )
+    await _ensure_knowledge_base_exists(knowledge_base)
+    split_docs = await _split_knowledge(knowledge, knowledge_base)
+
+    await update_ingestion_job(
+        job_id,
+        stage="embedding",
+        progress={"chunks": len(split_docs), "chunks_embedded": 0},
+    )
+    metrics = CaptureMetrics()
+    batch_size = settings.CAPTURE_BATCH_EMBED_SIZE
+    async with open_chunk_writer(
+        knowledge_base, replace_sources=type != "selection", metrics=metrics
+    ) as writer:
+        for start in range(0, len(split_docs), batch_size):
+            batch = split_docs[start : start + batch_size]
+            await _embed_and_store(batch, writer, metrics=metrics)
+            await update_ingestion_job(
+                job_id,
+                progress={"chunks_embedded": start + len(batch), **metrics.rates()},
+            )
+    _log_capture(knowledge_base, writer, metrics)
+    await update_ingestion_job(job_id, progress=metrics.rates())
+    await _record_url_version(knowledge_base, payload["url"], version)
+
+
+async def _run_pdf_capture_job(
+    job_id: str, payload: Dict[str, Any], knowledge_base: str
+):
+    """
+    Runs a PDF capture job as one stream, pages are extracted, chunked and
+    embedded while the following pages are still being parsed.
+    """
+    await _ensure_knowledge_base_exists(knowledge_base)
+    await update_ingestion_job(job_id, status="running", stage="ingesting")
+
+    async def report(progress: Dict[str, int]):
+        await update_ingestion_job(job_id, progress=progress)
+
+    await _ingest_pdf(
+        payload["pdf_path"], payload["pdf_filename"], knowledge_base, report
+    )
+
+
+async def _run_site_capture_job(
+    job_id: str, payload: Dict[str, Any], knowledge_base: str
+):
+    """
+    Runs a site capture job as one stream, pages are chunked and embedded
+    while the following pages are still being crawled.
+    """
+    await _ensure_knowledge_base_exists(knowledge_base)
+    await update_ingestion_job(job_id, status="running", stage="ingesting")
+
+    async def report(progress: Dict[str, int]):
+        await update_ingestion_job(job_id, progress=progress)
+
+    await _ingest_site(
+        payload["url"],
+        knowledge_base,
+        payload["max_depth"],
+        payload["max_pages"],
+        report,
+    )
+
+
+async def run_capture_job(job_id: str):
+    """
+    Runs a persisted capture job through extraction, chunking and embedding,
+    recording the stage and progress of the job as it goes.
+    """
+    job = await get_ingestion_job(job_id)
+    if job is None or job["status"] not in ("pending", "running"):
+        return
+
+    knowledge_base = job["knowledge_base"]
+    payload = job["payload"]
+
+    try:
+        if job["type"] == "pdf":
+            await _run_pdf_capture_job(job_id, payload, knowledge_base)
+        elif job["type"] == "site":
+            await _run_site_capture_job(job_id, payload, knowledge_base)
+        else:
+            await _run_staged_capture_job(job_id, job["type"], payload, knowledge_base)
+
+        await update_ingestion_job(job_id, status="succeeded", stage="done")
+    except Exception as e:
+        detail = e.detail if isinstance(e, HTTPException) else str(e)
+        logger.error(f"Capture job {job_id} failed: {detail}")
+        await update_ingestion_job(
+            job_id, status="failed", stage="failed", error=str(detail)
+        )
+
+    # only reached when the job finished, interrupted jobs keep their upload
+    pdf_path = payload.get("pdf_path")
+    if pdf_path and os.path.exists(pdf_path):
+        os.remove(pdf_path)
+
+
+async def start_capture_jobs():
+    """
+    Starts the ingestion workers and resumes the jobs that were pending or
+    interrupted when the server stopped.
+    """
+    await ensure_ingestion_jobs_table()
+    ingestion_workers.start(run_capture_job)
+
+    unfinished = await list_unfinished_ingestion_jobs()
+    for job_id in unfinished:
+        ingestion_workers.submit(job_id)
+    if unfinished:
+        logger.info(f"Resuming {len(unfinished)} unfinished capture jobs.")
+
+
+async def handle_capture_job_status(job_id: str) -> Dict[str, Any]:
+    """
+    Returns the state of a capture job.
+    """
+    job = await get_ingestion_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found.")
+    return job
+
+
+async def _is_not_modified(
+    client: httpx.AsyncClient, url: str, source: Dict[str, Any]
+) -> bool:
+    """
+    Asks the server with a conditional request whether a captured URL changed.
+    Servers without validators or errors count as modified.
+    """
+    headers = {}
+    if source.get("etag"):
+        headers["If-None-Match"] = source["etag"]
+    if source.get("last_modified"):
+        headers["If-Modified-Since"] = source["last_modified"]
+    if not headers:
+        return False
+
+    try:
+        # the body is not needed, the response is closed after the headers
+        async with client.stream("GET", url, headers=headers) as response:
+            return response.status_code == 304
+    except httpx.HTTPError as e:
+        logger.warning(f"Conditional request for {url} failed: {e}")
+        return False
+
+
+async def _refresh_url(
+    knowledge_base: str, url: str, client: httpx.AsyncClient
+) -> UrlRefreshResult:
+    """
+    Re-captures a URL unless it is unchanged since its last capture.
+    Unchanged pages skip the browser when the server confirms it with a 304,
+    and skip chunking and embedding when their extracted content is the same.
+    """
+    try:
+        source = await get_captured_source(knowledge_base, url)
+        if source and await _is_not_modified(client, url, source):
+            await mark_captured_source_checked(knowledge_base, url)
+            return UrlRefreshResult(url=url, status="unchanged")
+
+        # the 304 check was inconclusive, the page must be crawled again
+        knowledge, version = await _handle_url_capture(HttpUrl(url), bypass_cache=True)
+        if not knowledge or version is None:
+            return UrlRefreshResult(
+                url=url,
+                status="failed",
+                error="No content extracted from the provided source.",
+            )
+
+        status = "updated"
+        if source and source["content_hash"] == version.content_hash:
+            status = "unchanged"
+        else:
+            await _save_to_vector_db(knowledge, knowledge_base)
+        await _record_url_version(knowledge_base, url, version)
+        return UrlRefreshResult(url=url, status=status)
+    except Exception as e:
+        detail = e.detail if isinstance(e, HTTPException) else str(e)
+        logger.error(f"Failed to refresh {url} in '{knowledge_base}': {detail}")
+        return UrlRefreshResult(url=url, status="failed", error=str(detail))
+
+
+async def handle_collection_refresh(knowledge_base: str) -> List[UrlRefreshResult]:
+    """
+    Re-captures every URL of a knowledge base that changed since it was
+    captured, REFRESH_CONCURRENCY URLs at a time.
+
+    Returns:
+        List[UrlRefreshResult]: The outcome of every URL of the knowledge base.
+    """
+    await _ensure_knowledge_base_exists(knowledge_base)
+    urls = await list_captured_urls(knowledge_base)
+    semaphore = asyncio.Semaphore(settings.REFRESH_CONCURRENCY)
+
+    async with httpx.AsyncClient(
+        follow_redirects=True, timeout=settings.REFRESH_REQUEST_TIMEOUT
+    ) as client:
+
+        async def refresh(url: str) -> UrlRefreshResult:
+            async with semaphore:
+                return await _refresh_url(knowledge_base, url, client)
+
+        results = await asyncio.gather(*(refresh(url) for url in urls))
+
+    updated = sum(1 for res in results if res.status == "updated")
+    logger.info(f"Refreshed '{knowledge_base}': {updated}/{len(urls)} URLs updated.")
+    return list(results)
@@ -1,3 +1,6 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, Optional, Set
 from langchain.messages import HumanMessage
 from datetime import datetime, timezone
 from fastapi import HTTPException
@@ -7,6 +10,40 @@ from src.configs.settings import settings
 from src.schemas.langgraph import AgentState
 from src.utils.langgraph.agent import get_langgraph_agent
 from src.utils.langgraph.agent import get_checkpoint_saver
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Nodes whose LLM tokens are part of the user-facing answer
+STREAMED_NODES = ("respond_or_retrieve", "generate_using_context")
+
+# streamed chat turns still running, possibly after their client disconnected
+_chat_turns: Set[asyncio.Task] = set()
+
+
+def _build_human_message(collection_name: str, user_query: str) -> HumanMessage:
+    """Creates the human message of a chat turn."""
+    return HumanMessage(
+        content=user_query,
+        additional_kwargs={
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "collection_name": collection_name,
+        },
+    )
+
+
+def _build_turn_input(human_msg: HumanMessage, summary: str) -> AgentState:
+    """Creates the graph input for a single chat turn."""
+    return AgentState(
+        messages=[human_msg],
+        summary=summary,
+        history=[human_msg],
+    )
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Encodes a single server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
 
 async def handle_chat_history():
@@ -47,13 +84,7 @@ async def handle_chat_message(collection_name: str, user_query: str):
     """
     ctx.set(collection_name)
 
-    human_msg = HumanMessage(
-        content=user_query,
-        additional_kwargs={
-            "generated_at": datetime.now(timezone.utc).isoformat(),
-            "collection_name": collection_name,
-        },
-    )
+    human_msg = _build_human_message(collection_name, user_query)
 
     async with get_langgraph_agent(
         user_id=settings.DEFAULT_USER_ID,
@@ -65,11 +96,7 @@ async def handle_chat_message(collection_name: str, user_query: str):
         try:
             updated_messages_state = (
                 await graph.ainvoke(
-                    AgentState(
-                        messages=[human_msg],
-                        summary=state.values.get("summary", ""),
-                        history=[human_msg],
-                    ),
+                    _build_turn_input(human_msg, state.values.get("summary", "")),
                     config,
                     stream_mode="values",
                 )
@@ -79,6 +106,85 @@ async def handle_chat_message(collection_name: str, user_query: str):
             raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _run_chat_turn(
+    collection_name: str, user_query: str, events: asyncio.Queue[Optional[str]]
+):
+    """
+    Runs a chat turn through the agent and puts its server-sent events on
+    `events`, followed by None once the turn is over.
+    """
+    ctx.set(collection_name)
+
+    human_msg = _build_human_message(collection_name, user_query)
+
+    try:
+        async with get_langgraph_agent(
+            user_id=settings.DEFAULT_USER_ID,
+            thread_id=settings.DEFAULT_SESSION_ID,
+        ) as (graph, config):
+
+            state = await graph.aget_state(config=config)
+            final_content = ""
+
+            async for mode, chunk in graph.astream(
+                _build_turn_input(human_msg, state.values.get("summary", "")),
+                config,
+                stream_mode=["updates", "messages"],
+            ):
+                if mode == "messages":
+                    message_chunk, metadata = chunk
+                    if metadata.get("langgraph_node") not in STREAMED_NODES:
+                        continue
+                    content = message_chunk.text
+                    if content:
+                        events.put_nowait(_sse_event("token", {"content": content}))
+
+                elif mode == "updates":
+                    for node, update in chunk.items():
+                        events.put_nowait(_sse_event("node", {"node": node}))
+                        for msg in (update or {}).get("messages", []):
+                            if msg.type == "ai" and not msg.tool_calls:
+                                final_content = msg.text
+
+            events.put_nowait(_sse_event("done", {"messageContent": final_content}))
+    except Exception as e:
+        logger.error(f"Error while streaming chat message: {e}")
+        events.put_nowait(_sse_event("error", {"detail": str(e)}))
+    finally:
+        events.put_nowait(None)
+
+
+async def handle_chat_stream(
+    collection_name: str, user_query: str
+) -> AsyncIterator[str]:
+    """
+    Processes a user's chat message like `handle_chat_message`, but yields
+    server-sent events while the agent runs: a `node` event when a graph node
+    finishes, `token` events for the answer as the LLM produces it, and a final
+    `done` event with the complete message.
+
+    The turn runs in a task of its own and the response only relays its
+    events, so a client that disconnects does not cancel the turn: it still
+    completes and is checkpointed and saved to memory as in the non-streaming
+    path.
+
+    Args:
+        collection_name (str): The name of the collection to use for context.
+        user_query (str): The user's message.
+
+    Yields:
+        str: Encoded server-sent events.
+    """
+    events: asyncio.Queue[Optional[str]] = asyncio.Queue()
+    turn = asyncio.create_task(_run_chat_turn(collection_name, user_query, events))
+    # the event loop only keeps weak references to tasks
+    _chat_turns.add(turn)
+    turn.add_done_callback(_chat_turns.discard)
+
+    while (event := await events.get()) is not None:
+        yield event
+
+
 async def handle_clear_chat():
     """
     Clears the chat history for the current session.
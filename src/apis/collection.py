@@ -1,10 +1,17 @@
-from typing import Sequence
+from typing import Any, Dict, Optional, Sequence
+from pydantic import ValidationError
 from sqlalchemy import text
 from fastapi import HTTPException
 
 from src.configs.settings import settings
 from src.db.session import get_async_session
-from src.db.vectorstore import get_vector_store
+from src.db.vectorstore import get_vector_store, invalidate_vector_store
+from src.db.captured_sources import delete_captured_sources
+from src.db.collection_settings import (
+    invalidate_collection_settings,
+    update_collection_settings,
+)
+from src.schemas.collection import CollectionSettings
 
 
 async def handle_collection_listing() -> Sequence[str]:
@@ -19,10 +26,16 @@ async def handle_collection_listing() -> Sequence[str]:
     return collections
 
 
-async def handle_collection_creation(name: str):
+async def handle_collection_creation(
+    name: str, collection_settings: Optional[Dict[str, Any]] = None
+):
     """
     Handles the logic for creating a new collection (knowledge base).
+    Settings that are not given keep their defaults.
     """
+    if collection_settings:
+        _validate_collection_settings(collection_settings)
+
     async with get_async_session() as session:
         statement = f"SELECT uuid FROM {settings.COLLECTIONS_TABLE} WHERE name=:name"
         collection = (
@@ -34,15 +47,16 @@ async def handle_collection_creation(name: str):
             )
 
         # create a new collection
-        vector_store = get_vector_store()
-        vector_store.collection_name = (
-            name  # this will create a new collection if the name does not exist
-        )
+        # this will create a new collection if the name does not exist
+        vector_store = get_vector_store(name)
         await vector_store.acreate_collection()
 
         await session.commit()
         await session.aclose()
 
+    if collection_settings:
+        await update_collection_settings(name, collection_settings)
+
     return None
 
 
@@ -61,11 +75,42 @@ async def handle_collection_deletion(name: str):
             )
 
         # delete the collection
-        vector_store = get_vector_store()
-        vector_store.collection_name = name
+        vector_store = get_vector_store(name)
         await vector_store.adelete_collection()
+        invalidate_vector_store(name)
+        invalidate_collection_settings(name)
+        await delete_captured_sources(name)
 
         await session.commit()
         await session.aclose()
 
     return None
+
+
+def _validate_collection_settings(changes: Dict[str, Any]) -> CollectionSettings:
+    """
+    Raises an HTTPException if the settings are inconsistent.
+    """
+    try:
+        return CollectionSettings.model_validate(changes)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e.errors()[0]["msg"]))
+
+
+async def handle_collection_settings_update(
+    name: str, changes: Dict[str, Any]
+) -> CollectionSettings:
+    """
+    Handles the logic for updating the settings of a collection.
+    New chunk sizes apply to captures made after the update.
+    """
+    try:
+        collection_settings = await update_collection_settings(name, changes)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e.errors()[0]["msg"]))
+
+    if collection_settings is None:
+        raise HTTPException(
+            status_code=400, detail=f"Collection with name '{name}' does not exist."
+        )
+    return collection_settings
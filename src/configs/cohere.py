@@ -1,5 +1,5 @@
-from cohere import ClientV2
+from cohere import AsyncClientV2
 
 from src.configs.settings import settings
 
-cohere_ranker = ClientV2(api_key=settings.COHERE_API_KEY)
+cohere_ranker = AsyncClientV2(api_key=settings.COHERE_API_KEY)
@@ -1,3 +1,5 @@
+import asyncio
+from typing import Optional
 from mem0 import AsyncMemory
 from mem0.configs.base import (
     MemoryConfig,
@@ -9,6 +11,9 @@ from mem0.configs.base import (
 from contextlib import asynccontextmanager
 
 from src.configs.settings import settings
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
 
 
 config = MemoryConfig(
@@ -17,6 +22,8 @@ config = MemoryConfig(
         config={
             "connection_string": settings.PLAIN_DATABASE_URL,
             "embedding_model_dims": settings.GEMINI_EMBEDDING_DIMS,
+            "minconn": settings.MEMORY_DB_MIN_CONN,
+            "maxconn": settings.MEMORY_DB_MAX_CONN,
         },
     ),
     llm=LlmConfig(
@@ -47,11 +54,48 @@ config = MemoryConfig(
 )
 
 
+_memory: Optional[AsyncMemory] = None
+_memory_lock = asyncio.Lock()
+
+
+async def open_memory() -> AsyncMemory:
+    """
+    Creates the process-wide AsyncMemory instance.
+    Its vector store, embedder, LLM and reranker clients are shared by all callers.
+    """
+    global _memory
+
+    async with _memory_lock:
+        if _memory is None:
+            # the constructor connects to pgvector synchronously
+            memory = await asyncio.to_thread(AsyncMemory, config=config)
+            memory.collection_name = "default"
+            _memory = memory
+            logger.info("Mem0 memory client initialized.")
+        return _memory
+
+
+async def close_memory():
+    """Closes the connections held by the shared AsyncMemory instance."""
+    global _memory
+
+    async with _memory_lock:
+        if _memory is None:
+            return
+
+        pool = getattr(_memory.vector_store, "connection_pool", None)
+        close_pool = getattr(pool, "close", None) or getattr(pool, "closeall", None)
+        if close_pool is not None:
+            await asyncio.to_thread(close_pool)
+
+        history_db = getattr(_memory, "db", None)
+        if history_db is not None and hasattr(history_db, "close"):
+            history_db.close()
+
+        _memory = None
+
+
 @asynccontextmanager
 async def get_memory():
-    memory = AsyncMemory(config=config)
-    try:
-        memory.collection_name = "default"
-        yield memory
-    finally:
-        pass
+    memory = _memory if _memory is not None else await open_memory()
+    yield memory
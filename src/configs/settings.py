@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -18,15 +19,97 @@ class Settings(BaseSettings):
     ORM_DATABASE_URL: str = "<your-database-url>"
     PLAIN_DATABASE_URL: str = "<your-plain-database-url>"
 
+    # LangGraph checkpointer connection pool configuration
+    CHECKPOINT_POOL_MIN_SIZE: int = 1
+    CHECKPOINT_POOL_MAX_SIZE: int = 10
+    CHECKPOINT_POOL_TIMEOUT: float = 30.0
+
     # Ollama configuration
     OLLAMA_BASE_URL: str = "<your-ollama-base-url>"
     OLLAMA_EMBEDDING_MODEL: str = "<your-ollama-embedding-model>"
     OLLAMA_LLM_MODEL: str = "<your-ollama-llm-model>"
 
+    # Headless browser pool configuration for URL captures
+    CRAWLER_POOL_SIZE: int = 2
+    CRAWLER_MAX_PAGES_PER_BROWSER: int = 50
+
+    # Disk cache of extracted pages shared by URL captures
+    CRAWL_CACHE_PATH: str = "tmp/crawl_cache.db"
+    CRAWL_CACHE_TTL: float = 86400.0
+    CRAWL_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+
+    # Batch URL capture configuration
+    CAPTURE_BATCH_MAX_URLS: int = 500
+    CAPTURE_BATCH_CONCURRENCY: int = 4
+    CAPTURE_BATCH_EMBED_SIZE: int = 256
+
+    # Site crawl capture: link depth, page budget and parallel page crawls
+    SITE_CRAWL_MAX_DEPTH: int = 2
+    SITE_CRAWL_MAX_PAGES: int = 50
+    SITE_CRAWL_CONCURRENCY: int = 4
+    SITE_CRAWL_USER_AGENT: str = "PocketLM"
+
+    # Selection captures are coalesced for a short window into batched writes,
+    # embedded with one request of at most SELECTION_BUFFER_MAX_CHUNKS chunks
+    SELECTION_BUFFER_WINDOW: float = 0.05
+    SELECTION_BUFFER_MAX_CHUNKS: int = 256
+
+    # Streaming ingestion: batches of chunks waiting to be embedded and stored
+    INGEST_MAX_PENDING_BATCHES: int = 2
+
+    # Captured URL versions and collection refresh configuration
+    CAPTURED_SOURCES_TABLE: str = "captured_sources"
+    REFRESH_CONCURRENCY: int = 4
+    REFRESH_REQUEST_TIMEOUT: float = 15.0
+
+    # PDF extraction process pool configuration
+    PDF_WORKERS: int = 4
+    PDF_PAGES_PER_SHARD: int = 16
+
+    # Uploads are streamed to disk in chunks, PDFs above the limit are rejected
+    PDF_MAX_UPLOAD_SIZE: int = 200 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+
+    # Background ingestion job configuration
+    INGESTION_JOBS_TABLE: str = "ingestion_jobs"
+    INGESTION_WORKERS: int = 2
+    INGESTION_UPLOAD_DIR: str = "tmp/jobs"
+
     # PGVector tables names
     COLLECTIONS_TABLE: str = "<your-collections-table-name>"
     EMBEDDINGS_TABLE: str = "<your-embeddings-table-name>"
 
+    # Chunk inserts of at least this many rows use COPY instead of INSERT
+    COPY_INSERT_MIN_ROWS: int = 200
+
+    # Maximum number of per-collection vector stores kept open
+    VECTOR_STORE_CACHE_SIZE: int = 32
+
+    # Default chunking of captured content (token sizes can be set per collection)
+    CHUNK_SIZE_TOKENS: int = 512
+    CHUNK_OVERLAP_TOKENS: int = 64
+    CHUNK_TOKEN_ENCODING: str = "cl100k_base"
+    CHUNK_THREAD_MIN_CHARS: int = 20000
+    COLLECTION_SETTINGS_CACHE_TTL: float = 60.0
+
+    # Parent-document retrieval: indexed child chunk size and parents returned
+    CHILD_CHUNK_SIZE_TOKENS: int = 128
+    RETRIEVAL_PARENT_TOP_N: int = 5
+
+    # Chunk embedding cache configuration (an LRU entry of 1536 dims takes ~6KB)
+    EMBEDDING_CACHE_TABLE: str = "embedding_cache"
+    EMBEDDING_CACHE_LRU_SIZE: int = 10000
+
+    # Embedding requests for captured chunks: batch size, parallel requests, retries
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_CONCURRENCY: int = 4
+    EMBEDDING_MAX_RETRIES: int = 5
+    EMBEDDING_RETRY_BACKOFF: float = 1.0
+
+    # Query embedding cache configuration
+    QUERY_EMBEDDING_CACHE_SIZE: int = 1024
+    QUERY_EMBEDDING_CACHE_TTL: float = 3600.0
+
     # PocketLM default settings
     DEFAULT_COLLECTION_NAME: str = "<your-default-collection-name>"
     DEFAULT_USER_ID: str = "<your-default-user-id>"
@@ -41,10 +124,24 @@ class Settings(BaseSettings):
     # Mem0 configuration
     MEM0_API_KEY: str = "<your-mem0-api-key>"
 
+    MEMORY_DB_MIN_CONN: int = 1
+    MEMORY_DB_MAX_CONN: int = 5
+
+    # Mem0 write-behind queue configuration
+    MEMORY_QUEUE_MAX_SIZE: int = 1000
+    MEMORY_QUEUE_CONCURRENCY: int = 2
+    MEMORY_QUEUE_MAX_RETRIES: int = 3
+    MEMORY_QUEUE_RETRY_BACKOFF: float = 1.0
+    MEMORY_QUEUE_SHUTDOWN_TIMEOUT: float = 30.0
+
     # Cohere configuration
     COHERE_API_KEY: str = "<your-cohere-api-key>"
     COHERE_RERANKING_MODEL: str = "<your-cohere-embedding-model>"
 
+    # Reranker configuration ("cohere" or "local" for load tests)
+    RERANKER_PROVIDER: Literal["cohere", "local"] = "cohere"
+    RERANK_TIMEOUT: float = 5.0
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,92 @@
+import json
+from typing import Any, Dict, List, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.configs.settings import settings
+
+COLUMNS = ["id", "collection_id", "embedding", "document", "cmetadata"]
+
+# (id, collection_id, embedding, document, cmetadata)
+EmbeddingRow = Tuple[str, Any, List[float], str, Dict[str, Any]]
+
+
+async def insert_embedding_rows(conn: AsyncConnection, rows: List[EmbeddingRow]):
+    """
+    Inserts chunk rows into the embeddings table of PGVector, one statement
+    per row. Rows whose id is already stored are skipped.
+    """
+    statement = f"""
+        INSERT INTO {settings.EMBEDDINGS_TABLE} ({", ".join(COLUMNS)})
+        VALUES (
+            :id,
+            :collection_id,
+            CAST(:embedding AS vector),
+            :document,
+            CAST(:cmetadata AS JSONB)
+        )
+        ON CONFLICT (id) DO NOTHING
+    """
+    await conn.execute(
+        text(statement),
+        [
+            {
+                "id": id,
+                "collection_id": collection_id,
+                "embedding": str(embedding),
+                "document": document,
+                "cmetadata": json.dumps(metadata),
+            }
+            for id, collection_id, embedding, document, metadata in rows
+        ],
+    )
+
+
+async def copy_embedding_rows(conn: AsyncConnection, rows: List[EmbeddingRow]):
+    """
+    Inserts chunk rows into the embeddings table of PGVector with a binary
+    COPY, skipping the per-row statement overhead of regular inserts.
+    Rows are copied into a staging table first, so rows whose id is already
+    stored are skipped like with regular inserts.
+    """
+    # embeddings are staged as real[], which asyncpg encodes natively: the
+    # pooled connection is shared with PGVector, whose codecs must not change
+    await conn.execute(
+        text(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS embedding_rows_staging (
+                id VARCHAR NOT NULL,
+                collection_id UUID,
+                embedding REAL[] NOT NULL,
+                document VARCHAR,
+                cmetadata JSONB
+            ) ON COMMIT DROP
+            """
+        )
+    )
+
+    # COPY runs on the asyncpg connection, inside the same transaction
+    raw_connection = await conn.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+
+    # the jsonb codec installed by SQLAlchemy expects serialized JSON
+    await driver_connection.copy_records_to_table(
+        "embedding_rows_staging",
+        records=[
+            (id, collection_id, embedding, document, json.dumps(metadata))
+            for id, collection_id, embedding, document, metadata in rows
+        ],
+        columns=COLUMNS,
+    )
+
+    await conn.execute(
+        text(
+            f"""
+            INSERT INTO {settings.EMBEDDINGS_TABLE} ({", ".join(COLUMNS)})
+            SELECT id, collection_id, CAST(embedding AS vector), document, cmetadata
+            FROM embedding_rows_staging
+            ON CONFLICT (id) DO NOTHING
+            """
+        )
+    )
+    await conn.execute(text("TRUNCATE embedding_rows_staging"))
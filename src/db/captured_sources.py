@@ -0,0 +1,139 @@
+from typing import Any, Dict, List, Optional
+from sqlalchemy import text
+
+from src.configs.settings import settings
+from src.db.session import get_async_session
+
+TABLE = settings.CAPTURED_SOURCES_TABLE
+
+
+async def ensure_captured_sources_table():
+    """Creates the captured sources table if it does not exist."""
+    async with get_async_session() as session:
+        await session.execute(
+            text(
+                f"""
+                CREATE TABLE IF NOT EXISTS {TABLE} (
+                    knowledge_base TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_hash CHAR(64) NOT NULL,
+                    captured_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                    checked_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                    PRIMARY KEY (knowledge_base, url)
+                )
+                """
+            )
+        )
+        await session.commit()
+
+
+async def upsert_captured_source(
+    knowledge_base: str,
+    url: str,
+    etag: Optional[str],
+    last_modified: Optional[str],
+    content_hash: str,
+):
+    """Records the version of a URL that was captured into a knowledge base."""
+    async with get_async_session() as session:
+        await session.execute(
+            text(
+                f"""
+                INSERT INTO {TABLE} (knowledge_base, url, etag, last_modified, content_hash)
+                VALUES (:knowledge_base, :url, :etag, :last_modified, :content_hash)
+                ON CONFLICT (knowledge_base, url) DO UPDATE SET
+                    etag = EXCLUDED.etag,
+                    last_modified = EXCLUDED.last_modified,
+                    captured_at = CASE
+                        WHEN {TABLE}.content_hash = EXCLUDED.content_hash
+                        THEN {TABLE}.captured_at ELSE now()
+                    END,
+                    content_hash = EXCLUDED.content_hash,
+                    checked_at = now()
+                """
+            ),
+            {
+                "knowledge_base": knowledge_base,
+                "url": url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "content_hash": content_hash,
+            },
+        )
+        await session.commit()
+
+
+async def mark_captured_source_checked(knowledge_base: str, url: str):
+    """Records that a captured URL was found unchanged."""
+    async with get_async_session() as session:
+        await session.execute(
+            text(
+                f"""
+                UPDATE {TABLE} SET checked_at = now()
+                WHERE knowledge_base = :knowledge_base AND url = :url
+                """
+            ),
+            {"knowledge_base": knowledge_base, "url": url},
+        )
+        await session.commit()
+
+
+async def get_captured_source(
+    knowledge_base: str, url: str
+) -> Optional[Dict[str, Any]]:
+    """Returns the last captured version of a URL, or None if it is unknown."""
+    async with get_async_session() as session:
+        row = (
+            await session.execute(
+                text(
+                    f"""
+                    SELECT * FROM {TABLE}
+                    WHERE knowledge_base = :knowledge_base AND url = :url
+                    """
+                ),
+                {"knowledge_base": knowledge_base, "url": url},
+            )
+        ).first()
+    return dict(row._mapping) if row else None
+
+
+async def list_captured_urls(knowledge_base: str) -> List[str]:
+    """
+    Returns the URLs captured into a knowledge base, including the ones
+    captured before their versions were recorded. Selections are not included.
+    """
+    async with get_async_session() as session:
+        urls = (
+            (
+                await session.execute(
+                    text(
+                        f"""
+                        SELECT url FROM {TABLE} WHERE knowledge_base = :knowledge_base
+                        UNION
+                        SELECT DISTINCT e.cmetadata->>'source'
+                        FROM {settings.EMBEDDINGS_TABLE} e
+                        JOIN {settings.COLLECTIONS_TABLE} c ON c.uuid = e.collection_id
+                        WHERE c.name = :knowledge_base
+                          AND e.cmetadata->>'source' LIKE 'http%'
+                          AND NOT e.cmetadata @> '{{"type": "selection"}}'::jsonb
+                        """
+                    ),
+                    {"knowledge_base": knowledge_base},
+                )
+            )
+            .scalars()
+            .all()
+        )
+    return sorted(urls)
+
+
+async def delete_captured_sources(knowledge_base: str):
+    """Forgets the captured URLs of a knowledge base, e.g. after it is deleted."""
+    async with get_async_session() as session:
+        await session.execute(
+            text(f"DELETE FROM {TABLE} WHERE knowledge_base = :knowledge_base"),
+            {"knowledge_base": knowledge_base},
+        )
+        await session.commit()
@@ -0,0 +1,85 @@
+import asyncio
+from typing import Dict, Optional
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+
+from src.configs.settings import settings
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+_checkpoint_pool: Optional[AsyncConnectionPool] = None
+_checkpoint_saver: Optional[AsyncPostgresSaver] = None
+_init_lock = asyncio.Lock()
+
+
+async def open_checkpoint_saver() -> AsyncPostgresSaver:
+    """
+    Opens the shared connection pool and the checkpoint saver backed by it.
+    The checkpoint migrations are run only once, when the saver is created.
+    """
+    global _checkpoint_pool, _checkpoint_saver
+
+    async with _init_lock:
+        if _checkpoint_saver is not None:
+            return _checkpoint_saver
+
+        # same connection options as AsyncPostgresSaver.from_conn_string
+        pool = AsyncConnectionPool(
+            conninfo=settings.PLAIN_DATABASE_URL,
+            min_size=settings.CHECKPOINT_POOL_MIN_SIZE,
+            max_size=settings.CHECKPOINT_POOL_MAX_SIZE,
+            timeout=settings.CHECKPOINT_POOL_TIMEOUT,
+            kwargs={
+                "autocommit": True,
+                "prepare_threshold": 0,
+                "row_factory": dict_row,
+            },
+            open=False,
+        )
+        await pool.open(wait=True, timeout=settings.CHECKPOINT_POOL_TIMEOUT)
+
+        saver = AsyncPostgresSaver(conn=pool)  # type: ignore[arg-type]
+        await saver.setup()
+
+        _checkpoint_pool, _checkpoint_saver = pool, saver
+        logger.info(
+            f"Checkpoint saver ready (pool size {settings.CHECKPOINT_POOL_MIN_SIZE}-{settings.CHECKPOINT_POOL_MAX_SIZE})."
+        )
+        return saver
+
+
+async def close_checkpoint_saver():
+    """Closes the shared checkpoint connection pool."""
+    global _checkpoint_pool, _checkpoint_saver
+
+    async with _init_lock:
+        if _checkpoint_pool is not None:
+            await _checkpoint_pool.close()
+        _checkpoint_pool, _checkpoint_saver = None, None
+
+
+async def get_shared_checkpoint_saver() -> AsyncPostgresSaver:
+    """
+    Returns the process-wide checkpoint saver.
+    It is normally opened in the application lifespan, but standalone scripts
+    get it lazily on first use.
+    """
+    if _checkpoint_saver is not None:
+        return _checkpoint_saver
+    return await open_checkpoint_saver()
+
+
+def get_checkpoint_pool_stats() -> Dict[str, int]:
+    """Returns the connection usage of the checkpoint pool for monitoring."""
+    if _checkpoint_pool is None:
+        return {"in_use": 0, "waiting": 0, "total": 0}
+
+    stats = _checkpoint_pool.get_stats()
+    total = stats.get("pool_size", 0)
+    return {
+        "in_use": total - stats.get("pool_available", 0),
+        "waiting": stats.get("requests_waiting", 0),
+        "total": total,
+    }
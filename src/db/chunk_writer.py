@@ -0,0 +1,225 @@
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, List, Optional, Set
+from uuid import NAMESPACE_URL, uuid5
+from langchain_core.documents import Document
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.configs.settings import settings
+from src.db.bulk_insert import copy_embedding_rows, insert_embedding_rows
+from src.db.embedding_cache import content_hash
+from src.db.session import get_async_engine
+from src.utils.capture_metrics import CaptureMetrics
+
+TABLE = settings.EMBEDDINGS_TABLE
+
+
+def chunk_id(knowledge_base: str, doc: Document) -> str:
+    """
+    Derives the id of a chunk from its knowledge base, source, position and
+    content, so capturing the same source again yields the same ids.
+    The page number is part of the position, as start indexes restart per page.
+    """
+    key = "|".join(
+        str(part)
+        for part in (
+            knowledge_base,
+            doc.metadata.get("source"),
+            doc.metadata.get("page_number", ""),
+            doc.metadata.get("start_index"),
+            content_hash(doc.page_content),
+        )
+    )
+    return str(uuid5(NAMESPACE_URL, key))
+
+
+class ChunkWriter:
+    """
+    Writes the chunks of a capture into a knowledge base as they are embedded.
+
+    Chunks that are stored already are skipped before they are embedded.
+    Every embedded batch is inserted in a short transaction of its own, so no
+    connection is held while embedding and memory does not grow with the
+    capture. The inserted ids are recorded: `rollback` deletes them when the
+    capture fails, leaving the knowledge base as it was. With
+    `replace_sources`, `commit` deletes the chunks of the captured sources
+    that were not part of the capture, so re-capturing a source replaces its
+    previous version instead of duplicating it. Until then, searches may see
+    chunks of both versions.
+    """
+
+    def __init__(
+        self,
+        knowledge_base: str,
+        collection_id: Any,
+        replace_sources: bool,
+        metrics: Optional[CaptureMetrics] = None,
+    ):
+        self._knowledge_base = knowledge_base
+        self._collection_id = collection_id
+        self._replace_sources = replace_sources
+        self._metrics = metrics
+        self._captured_ids: Set[str] = set()
+        self._inserted_ids: List[str] = []
+        self._sources: Set[str] = set()
+        self.inserted = 0
+        self.unchanged = 0
+        self.deleted = 0
+
+    async def skip_stored(self, docs: List[Document]) -> List[Document]:
+        """
+        Assigns the deterministic ids to the chunks and returns the ones that
+        are neither stored already nor part of this capture yet.
+        """
+        for doc in docs:
+            doc.id = chunk_id(self._knowledge_base, doc)
+            if doc.metadata.get("source") is not None:
+                self._sources.add(str(doc.metadata["source"]))
+
+        ids = [doc.id for doc in docs if doc.id]
+        async with get_async_engine().connect() as conn:
+            stored = set(
+                (
+                    await conn.execute(
+                        text(
+                            f"""
+                            SELECT id FROM {TABLE}
+                            WHERE collection_id = :collection_id AND id = ANY(:ids)
+                            """
+                        ),
+                        {"collection_id": self._collection_id, "ids": ids},
+                    )
+                )
+                .scalars()
+                .all()
+            )
+
+        new_docs = []
+        for doc in docs:
+            if doc.id in stored or doc.id in self._captured_ids:
+                self.unchanged += 1
+            else:
+                new_docs.append(doc)
+            self._captured_ids.add(str(doc.id))
+        return new_docs
+
+    async def write(self, docs: List[Document], vectors: List[List[float]]):
+        """
+        Inserts embedded chunks in one transaction. From COPY_INSERT_MIN_ROWS
+        chunks on, rows are inserted with COPY.
+        """
+        if not docs:
+            return
+        insert = (
+            copy_embedding_rows
+            if len(docs) >= settings.COPY_INSERT_MIN_ROWS
+            else insert_embedding_rows
+        )
+        # recorded first, a cancelled insert may still have been committed
+        self._inserted_ids.extend(str(doc.id) for doc in docs)
+
+        started = time.perf_counter()
+        async with get_async_engine().begin() as conn:
+            await insert(
+                conn,
+                [
+                    (
+                        str(doc.id),
+                        self._collection_id,
+                        vector,
+                        doc.page_content,
+                        doc.metadata,
+                    )
+                    for doc, vector in zip(docs, vectors)
+                ],
+            )
+
+        if self._metrics is not None:
+            self._metrics.inserted(len(docs), time.perf_counter() - started)
+        self.inserted += len(docs)
+
+    async def commit(self):
+        """Deletes the stale chunks of the captured sources."""
+        async with get_async_engine().begin() as conn:
+            await self._delete_stale(conn)
+
+    async def rollback(self):
+        """Deletes the chunks inserted by the capture."""
+        if not self._inserted_ids:
+            return
+        async with get_async_engine().begin() as conn:
+            await conn.execute(
+                text(
+                    f"""
+                    DELETE FROM {TABLE}
+                    WHERE collection_id = :collection_id AND id = ANY(:ids)
+                    """
+                ),
+                {"collection_id": self._collection_id, "ids": self._inserted_ids},
+            )
+        self._inserted_ids = []
+        self.inserted = 0
+
+    async def _delete_stale(self, conn: AsyncConnection):
+        """
+        Deletes the chunks of the captured sources that were not captured again.
+        Selections of a captured page are kept, they are separate captures.
+        """
+        if not self._replace_sources:
+            return
+        for source in self._sources:
+            result = await conn.execute(
+                text(
+                    f"""
+                    DELETE FROM {TABLE}
+                    WHERE collection_id = :collection_id
+                      AND cmetadata @> CAST(:source_filter AS JSONB)
+                      AND NOT cmetadata @> '{{"type": "selection"}}'::jsonb
+                      AND NOT (id = ANY(:ids))
+                    """
+                ),
+                {
+                    "collection_id": self._collection_id,
+                    "source_filter": json.dumps({"source": source}),
+                    "ids": list(self._captured_ids),
+                },
+            )
+            self.deleted += result.rowcount
+
+    def summary(self) -> str:
+        return (
+            f"{self.inserted} new, {self.unchanged} unchanged and "
+            f"{self.deleted} stale chunks in '{self._knowledge_base}'"
+        )
+
+
+@asynccontextmanager
+async def open_chunk_writer(
+    knowledge_base: str,
+    replace_sources: bool = True,
+    metrics: Optional[CaptureMetrics] = None,
+) -> AsyncIterator[ChunkWriter]:
+    """
+    Opens a chunk writer on an existing knowledge base. The capture is
+    committed when the block exits, and the chunks written by the block are
+    deleted again if it raises.
+    """
+    async with get_async_engine().connect() as conn:
+        collection_id = (
+            await conn.execute(
+                text(f"SELECT uuid FROM {settings.COLLECTIONS_TABLE} WHERE name=:name"),
+                {"name": knowledge_base},
+            )
+        ).scalar_one()
+
+    writer = ChunkWriter(knowledge_base, collection_id, replace_sources, metrics)
+    try:
+        yield writer
+        await writer.commit()
+    except BaseException:
+        # shielded, so a cancelled capture is still rolled back
+        await asyncio.shield(writer.rollback())
+        raise
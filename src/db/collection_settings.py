@@ -0,0 +1,88 @@
+import json
+from typing import Any, Dict, Optional
+from sqlalchemy import text
+
+from src.configs.settings import settings
+from src.db.session import get_async_engine, get_async_session
+from src.schemas.collection import CollectionSettings
+from src.utils.cache import LRUCache
+
+TABLE = settings.COLLECTIONS_TABLE
+
+# Settings are read on every capture, they are kept for a short while
+_collection_settings: LRUCache[str, CollectionSettings] = LRUCache(
+    max_size=settings.VECTOR_STORE_CACHE_SIZE,
+    ttl=settings.COLLECTION_SETTINGS_CACHE_TTL,
+)
+
+
+def _as_dict(metadata: Any) -> Dict[str, Any]:
+    if isinstance(metadata, str):
+        metadata = json.loads(metadata)
+    return metadata if isinstance(metadata, dict) else {}
+
+
+async def get_collection_settings(name: str) -> CollectionSettings:
+    """
+    Returns the settings of a collection, stored in its metadata.
+    Settings that were never set fall back to the defaults.
+    """
+    collection_settings = _collection_settings.get(name)
+    if collection_settings is None:
+        async with get_async_session() as session:
+            metadata = (
+                await session.execute(
+                    text(f"SELECT cmetadata FROM {TABLE} WHERE name = :name"),
+                    {"name": name},
+                )
+            ).scalar()
+        collection_settings = CollectionSettings.model_validate(_as_dict(metadata))
+        _collection_settings.set(name, collection_settings)
+
+    return collection_settings
+
+
+async def update_collection_settings(
+    name: str, changes: Dict[str, Any]
+) -> Optional[CollectionSettings]:
+    """
+    Merges `changes` into the settings of a collection.
+
+    Returns:
+        Optional[CollectionSettings]: The new settings, or None if the
+        collection does not exist.
+    """
+    async with get_async_engine().begin() as conn:
+        row = (
+            await conn.execute(
+                text(f"SELECT cmetadata FROM {TABLE} WHERE name = :name FOR UPDATE"),
+                {"name": name},
+            )
+        ).first()
+        if row is None:
+            return None
+
+        metadata = _as_dict(row[0])
+        collection_settings = CollectionSettings.model_validate({**metadata, **changes})
+        await conn.execute(
+            text(
+                f"""
+                UPDATE {TABLE} SET cmetadata = CAST(:metadata AS JSON)
+                WHERE name = :name
+                """
+            ),
+            {
+                "name": name,
+                "metadata": json.dumps(
+                    {**metadata, **collection_settings.model_dump()}
+                ),
+            },
+        )
+
+    _collection_settings.pop(name)
+    return collection_settings
+
+
+def invalidate_collection_settings(name: str):
+    """Drops the cached settings of a collection, e.g. after it is deleted."""
+    _collection_settings.pop(name)
@@ -1,6 +1,7 @@
 import asyncio
 from sqlalchemy import text
 
+from src.configs.settings import settings
 from src.db.vectorstore import get_vector_store
 from src.db.session import get_async_session
 
@@ -11,14 +12,17 @@ async def main():
     async with get_async_session() as session:
         await session.execute(
             text(
-                """
+                f"""
                 DROP TABLE IF EXISTS
                     checkpoint_blobs,
                     checkpoint_migrations,
                     checkpoint_writes,
                     checkpoints,
                     mem0,
-                    mem0migrations
+                    mem0migrations,
+                    {settings.EMBEDDING_CACHE_TABLE},
+                    {settings.INGESTION_JOBS_TABLE},
+                    {settings.CAPTURED_SOURCES_TABLE}
                 CASCADE;
             """
             )
@@ -0,0 +1,227 @@
+import asyncio
+import hashlib
+from array import array
+from typing import Dict, List, Tuple
+from sqlalchemy import text
+from langchain_core.embeddings import Embeddings
+
+from src.configs.settings import settings
+from src.db.session import get_async_session
+from src.db.vectorstore import embeddings
+from src.utils.cache import LRUCache
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+_THROTTLING_MARKERS = ("429", "503", "resource_exhausted", "rate limit", "quota")
+
+
+def _is_throttling(error: Exception) -> bool:
+    """
+    Whether an embedding request failed because the provider is throttling.
+    The provider errors are wrapped by the client, so status and message are checked.
+    """
+    status = getattr(error, "code", None) or getattr(error, "status_code", None)
+    if status in (429, 503):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in _THROTTLING_MARKERS)
+
+
+def content_hash(content: str) -> str:
+    """Hashes a chunk after normalizing its whitespace."""
+    normalized = " ".join(content.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Embeds document chunks, reusing the vectors of chunks embedded before.
+
+    Vectors are persisted in Postgres keyed by (embedding model, dims, content
+    hash), with an in-process LRU in front of the table. The LRU holds float32
+    arrays, the precision of the REAL[] column, at an eighth of the memory of
+    float lists. Only cache misses are sent to the embedding model, in one
+    request per call asking for `dims` dimensions, so callers choose the batch
+    size. At most `concurrency` requests are in flight across all callers, and
+    throttled requests are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        embedder: Embeddings,
+        model: str,
+        dims: int,
+        table: str,
+        lru_size: int,
+        concurrency: int,
+        max_retries: int,
+        retry_backoff: float,
+    ):
+        self._embedder = embedder
+        self._requests = asyncio.Semaphore(concurrency)
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._retried = 0
+        self._model = model
+        self._dims = dims
+        self._table = table
+        self._lru: LRUCache[str, array] = LRUCache(max_size=lru_size)
+        self._table_ready = False
+        self._db_hits = 0
+        self._misses = 0
+
+    async def ensure_table(self):
+        """Creates the cache table if it does not exist."""
+        if self._table_ready:
+            return
+
+        async with get_async_session() as session:
+            await session.execute(
+                text(
+                    f"""
+                    CREATE TABLE IF NOT EXISTS {self._table} (
+                        model TEXT NOT NULL,
+                        dims INTEGER NOT NULL,
+                        content_hash CHAR(64) NOT NULL,
+                        embedding REAL[] NOT NULL,
+                        created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                        PRIMARY KEY (model, dims, content_hash)
+                    )
+                    """
+                )
+            )
+            await session.commit()
+
+        self._table_ready = True
+
+    async def aembed_documents(self, texts: List[str]) -> Tuple[List[List[float]], int]:
+        """
+        Embeds the given chunks through the cache.
+
+        Returns:
+            The vectors in input order and the number of chunks served from cache.
+        """
+        await self.ensure_table()
+
+        hashes = [content_hash(t) for t in texts]
+        vectors: Dict[str, List[float]] = {}
+
+        # first -> in-process LRU
+        for h in set(hashes):
+            cached = self._lru.get(h)
+            if cached is not None:
+                vectors[h] = cached.tolist()
+
+        # second -> persistent cache, in one query
+        missing = [h for h in set(hashes) if h not in vectors]
+        if missing:
+            for h, vector in (await self._load(missing)).items():
+                vectors[h] = vector
+                self._lru.set(h, array("f", vector))
+                self._db_hits += 1
+
+        hits = sum(1 for h in hashes if h in vectors)
+
+        # third -> embed the remaining chunks
+        to_embed: Dict[str, str] = {}
+        for h, t in zip(hashes, texts):
+            if h not in vectors:
+                to_embed.setdefault(h, t)
+
+        if to_embed:
+            embedded = await self._embed_with_retry(list(to_embed.values()))
+            fresh = dict(zip(to_embed.keys(), embedded))
+            self._misses += len(fresh)
+            await self._store(fresh)
+            for h, vector in fresh.items():
+                vectors[h] = vector
+                self._lru.set(h, array("f", vector))
+
+        return [vectors[h] for h in hashes], hits
+
+    async def _embed_with_retry(self, texts: List[str]) -> List[List[float]]:
+        attempt = 0
+        while True:
+            try:
+                async with self._requests:
+                    return await self._embedder.aembed_documents(
+                        texts, output_dimensionality=self._dims  # type: ignore
+                    )
+            except Exception as e:
+                if attempt == self._max_retries or not _is_throttling(e):
+                    raise
+                self._retried += 1
+                delay = self._retry_backoff * (2**attempt)
+                logger.warning(
+                    f"Embedding request throttled, retrying in {delay:.1f}s."
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _load(self, hashes: List[str]) -> Dict[str, List[float]]:
+        statement = f"""
+            SELECT content_hash, embedding FROM {self._table}
+            WHERE model = :model AND dims = :dims AND content_hash = ANY(:hashes)
+        """
+        async with get_async_session() as session:
+            rows = (
+                await session.execute(
+                    text(statement),
+                    {"model": self._model, "dims": self._dims, "hashes": hashes},
+                )
+            ).all()
+
+        return {row.content_hash: list(row.embedding) for row in rows}
+
+    async def _store(self, fresh: Dict[str, List[float]]):
+        # vectors of another size would be served for the configured dims
+        rows = [
+            {
+                "model": self._model,
+                "dims": self._dims,
+                "content_hash": h,
+                "embedding": vector,
+            }
+            for h, vector in fresh.items()
+            if len(vector) == self._dims
+        ]
+        if len(rows) < len(fresh):
+            logger.warning(
+                f"Not caching {len(fresh) - len(rows)} embeddings that do not "
+                f"have the configured {self._dims} dims."
+            )
+        if not rows:
+            return
+
+        statement = f"""
+            INSERT INTO {self._table} (model, dims, content_hash, embedding)
+            VALUES (:model, :dims, :content_hash, :embedding)
+            ON CONFLICT DO NOTHING
+        """
+        async with get_async_session() as session:
+            await session.execute(text(statement), rows)
+            await session.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns cache usage counters for monitoring."""
+        return {
+            "lru_size": len(self._lru),
+            "lru_hits": self._lru.hits,
+            "db_hits": self._db_hits,
+            "misses": self._misses,
+            "retried": self._retried,
+        }
+
+
+embedding_cache = EmbeddingCache(
+    embedder=embeddings,
+    model=settings.GEMINI_EMBEDDING_MODEL,
+    dims=settings.GEMINI_EMBEDDING_DIMS,
+    table=settings.EMBEDDING_CACHE_TABLE,
+    lru_size=settings.EMBEDDING_CACHE_LRU_SIZE,
+    concurrency=settings.EMBEDDING_CONCURRENCY,
+    max_retries=settings.EMBEDDING_MAX_RETRIES,
+    retry_backoff=settings.EMBEDDING_RETRY_BACKOFF,
+)
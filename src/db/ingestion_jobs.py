@@ -0,0 +1,129 @@
+import json
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+from sqlalchemy import text
+
+from src.configs.settings import settings
+from src.db.session import get_async_session
+
+TABLE = settings.INGESTION_JOBS_TABLE
+
+
+def _row_to_job(row: Any) -> Dict[str, Any]:
+    job = dict(row._mapping)
+    job["id"] = str(job["id"])
+    for key in ("payload", "progress"):
+        if isinstance(job[key], str):
+            job[key] = json.loads(job[key])
+    return job
+
+
+async def ensure_ingestion_jobs_table():
+    """Creates the ingestion jobs table if it does not exist."""
+    async with get_async_session() as session:
+        await session.execute(
+            text(
+                f"""
+                CREATE TABLE IF NOT EXISTS {TABLE} (
+                    id UUID PRIMARY KEY,
+                    type TEXT NOT NULL,
+                    knowledge_base TEXT NOT NULL,
+                    payload JSONB NOT NULL,
+                    status TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    progress JSONB NOT NULL DEFAULT '{{}}'::jsonb,
+                    error TEXT,
+                    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                )
+                """
+            )
+        )
+        await session.commit()
+
+
+async def create_ingestion_job(
+    type: str, knowledge_base: str, payload: Dict[str, Any]
+) -> str:
+    """Persists a new pending ingestion job and returns its id."""
+    job_id = str(uuid4())
+    async with get_async_session() as session:
+        await session.execute(
+            text(
+                f"""
+                INSERT INTO {TABLE} (id, type, knowledge_base, payload, status, stage)
+                VALUES (:id, :type, :knowledge_base, CAST(:payload AS JSONB), 'pending', 'queued')
+                """
+            ),
+            {
+                "id": job_id,
+                "type": type,
+                "knowledge_base": knowledge_base,
+                "payload": json.dumps(payload),
+            },
+        )
+        await session.commit()
+    return job_id
+
+
+async def update_ingestion_job(
+    job_id: str,
+    status: Optional[str] = None,
+    stage: Optional[str] = None,
+    progress: Optional[Dict[str, int]] = None,
+    error: Optional[str] = None,
+):
+    """Updates the given fields of a job; progress keys are merged."""
+    assignments = ["updated_at = now()"]
+    params: Dict[str, Any] = {"id": job_id}
+    if status is not None:
+        assignments.append("status = :status")
+        params["status"] = status
+    if stage is not None:
+        assignments.append("stage = :stage")
+        params["stage"] = stage
+    if progress is not None:
+        assignments.append("progress = progress || CAST(:progress AS JSONB)")
+        params["progress"] = json.dumps(progress)
+    if error is not None:
+        assignments.append("error = :error")
+        params["error"] = error
+
+    async with get_async_session() as session:
+        await session.execute(
+            text(f"UPDATE {TABLE} SET {', '.join(assignments)} WHERE id = :id"),
+            params,
+        )
+        await session.commit()
+
+
+async def get_ingestion_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Returns a job by id, or None if it does not exist."""
+    async with get_async_session() as session:
+        row = (
+            await session.execute(
+                text(f"SELECT * FROM {TABLE} WHERE id = :id"), {"id": job_id}
+            )
+        ).first()
+    return _row_to_job(row) if row else None
+
+
+async def list_unfinished_ingestion_jobs() -> List[str]:
+    """Returns the ids of pending and interrupted jobs, oldest first."""
+    async with get_async_session() as session:
+        ids = (
+            (
+                await session.execute(
+                    text(
+                        f"""
+                        SELECT id FROM {TABLE}
+                        WHERE status IN ('pending', 'running')
+                        ORDER BY created_at
+                        """
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+    return [str(job_id) for job_id in ids]
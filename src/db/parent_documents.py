@@ -0,0 +1,138 @@
+from typing import Any, Dict, List, Tuple
+from langchain_core.documents import Document
+from sqlalchemy import text
+
+from src.configs.settings import settings
+from src.db.session import get_async_session
+from src.utils.chunking import count_tokens
+
+# chunks sharing these metadata values were cut from the same parent:
+# a section of a page, a PDF page or a selection
+PARENT_KEYS = ("source", "page_number", "section", "selection_id")
+
+ParentKey = Tuple[str, ...]
+
+
+def parent_key(metadata: Dict[str, Any]) -> ParentKey:
+    return tuple(
+        "" if metadata.get(key) is None else str(metadata[key]) for key in PARENT_KEYS
+    )
+
+
+def _stitch(chunks: List[Tuple[int, str]]) -> str:
+    """
+    Joins chunks ordered by their offset in the source back into one text,
+    dropping the overlap between consecutive chunks.
+    """
+    parts: List[str] = []
+    end = 0
+    for start, content in chunks:
+        if not parts or start >= end:
+            if parts:
+                # the whitespace between chunks was stripped by the chunker
+                parts.append("\n\n" if start - end > 1 else " " * (start - end))
+            parts.append(content)
+        elif start + len(content) > end:
+            parts.append(content[end - start :])
+        end = max(end, start + len(content))
+    return "".join(parts)
+
+
+def _window(tokens: List[int], hit: int, max_tokens: int) -> Tuple[int, int]:
+    """
+    Returns the range of chunks around a matched chunk that fits in
+    `max_tokens`, growing on both sides alternately.
+    """
+    low = high = hit
+    total = tokens[hit]
+    grew = True
+    while grew:
+        grew = False
+        for idx in (high + 1, low - 1):
+            if 0 <= idx < len(tokens) and total + tokens[idx] <= max_tokens:
+                total += tokens[idx]
+                low, high = min(low, idx), max(high, idx)
+                grew = True
+    return low, high
+
+
+async def fetch_parent_documents(
+    collection_name: str, docs: List[Document], max_tokens: int
+) -> List[str]:
+    """
+    Replaces matched chunks with the parent they were cut from.
+
+    The chunks of every matched parent are fetched in one query and stitched
+    back together by `start_index`, keeping at most `max_tokens` around the
+    best matched chunk. Each parent is returned once, in the order of its
+    best matched chunk. A matched chunk that cannot be placed in its parent
+    is returned as is.
+    """
+    hits: Dict[ParentKey, Document] = {}
+    for doc in docs:
+        hits.setdefault(parent_key(doc.metadata), doc)
+    if not hits:
+        return []
+
+    columns = list(zip(*hits))
+    async with get_async_session() as session:
+        rows = (
+            await session.execute(
+                text(
+                    f"""
+                    SELECT
+                        e.id,
+                        e.document,
+                        (e.cmetadata->>'start_index')::int AS start_index,
+                        p.source, p.page_number, p.section, p.selection_id
+                    FROM {settings.EMBEDDINGS_TABLE} e
+                    JOIN {settings.COLLECTIONS_TABLE} c ON c.uuid = e.collection_id
+                    JOIN unnest(
+                        CAST(:sources AS TEXT[]),
+                        CAST(:page_numbers AS TEXT[]),
+                        CAST(:sections AS TEXT[]),
+                        CAST(:selection_ids AS TEXT[])
+                    ) AS p(source, page_number, section, selection_id)
+                      ON e.cmetadata->>'source' = p.source
+                     AND COALESCE(e.cmetadata->>'page_number', '') = p.page_number
+                     AND COALESCE(e.cmetadata->>'section', '') = p.section
+                     AND COALESCE(e.cmetadata->>'selection_id', '') = p.selection_id
+                    WHERE c.name = :name
+                    """
+                ),
+                {
+                    "name": collection_name,
+                    "sources": list(columns[0]),
+                    "page_numbers": list(columns[1]),
+                    "sections": list(columns[2]),
+                    "selection_ids": list(columns[3]),
+                },
+            )
+        ).all()
+
+    siblings: Dict[ParentKey, Dict[Tuple[int, str], str]] = {}
+    for chunk_id, document, start_index, *key in rows:
+        siblings.setdefault(tuple(key), {})[(start_index or 0, chunk_id)] = document
+
+    parents = []
+    for key, hit in hits.items():
+        stored = sorted(siblings.get(key, {}).items())
+        hit_start = hit.metadata.get("start_index", 0)
+        matches = [
+            idx
+            for idx, ((start, chunk_id), content) in enumerate(stored)
+            if chunk_id == hit.id
+            or (start == hit_start and content == hit.page_content)
+        ]
+        chunks = [(start, content) for (start, _), content in stored]
+        starts = {start for start, _ in chunks}
+        # several parents share the key when their chunks repeat an offset,
+        # e.g. selections of a page captured before they had a selection_id
+        if not matches or len(starts) < len(chunks):
+            parents.append(hit.page_content)
+            continue
+
+        tokens = [count_tokens(content) for _, content in chunks]
+        low, high = _window(tokens, matches[0], max_tokens)
+        parents.append(_stitch(chunks[low : high + 1]))
+    return parents
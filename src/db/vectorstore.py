@@ -1,24 +1,85 @@
+from typing import List, Optional, Tuple
 from langchain_postgres import PGVector
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from pydantic import SecretStr
 
 from src.configs import settings
+from src.utils.cache import LRUCache
 from src.utils.logging import get_logger
 from src.db.session import get_async_engine
 from src.configs.glob_ctx import ctx
 
 logger = get_logger(__name__)
 
+# One embeddings client shared by every vector store. The model returns 3072
+# dims unless every call asks for GEMINI_EMBEDDING_DIMS
+embeddings = GoogleGenerativeAIEmbeddings(
+    google_api_key=SecretStr(settings.GEMINI_API_KEY),
+    model=settings.GEMINI_EMBEDDING_MODEL,
+)
 
-def get_vector_store() -> PGVector:
-    return PGVector(
-        embeddings=GoogleGenerativeAIEmbeddings(
-            google_api_key=SecretStr(settings.GEMINI_API_KEY),
-            model=settings.GEMINI_EMBEDDING_MODEL,
-        ),
-        connection=get_async_engine(),
-        collection_name=ctx.get(),
-    )
+# Vector stores are bound to a single collection and never mutated by callers
+_vector_stores: LRUCache[str, PGVector] = LRUCache(
+    max_size=settings.VECTOR_STORE_CACHE_SIZE
+)
+
+
+# Query embeddings keyed by (embedding model, normalized query)
+_query_embeddings: LRUCache[Tuple[str, str], List[float]] = LRUCache(
+    max_size=settings.QUERY_EMBEDDING_CACHE_SIZE,
+    ttl=settings.QUERY_EMBEDDING_CACHE_TTL,
+)
+
+
+def get_vector_store(collection_name: Optional[str] = None) -> PGVector:
+    """
+    Returns the vector store of a collection.
+    Defaults to the collection of the current request context.
+    """
+    name = collection_name or ctx.get()
+
+    vector_store = _vector_stores.get(name)
+    if vector_store is None:
+        vector_store = PGVector(
+            embeddings=embeddings,
+            connection=get_async_engine(),
+            collection_name=name,
+        )
+        _vector_stores.set(name, vector_store)
+
+    return vector_store
+
+
+def invalidate_vector_store(collection_name: str):
+    """Drops the cached vector store of a collection, e.g. after it is deleted."""
+    _vector_stores.pop(collection_name)
+
+
+def get_vector_store_stats():
+    """Returns the usage of the vector store registry for monitoring."""
+    return _vector_stores.stats()
+
+
+async def aembed_query(query: str) -> List[float]:
+    """
+    Embeds a search query, reusing the vector of a recent identical query.
+    Queries are compared case- and whitespace-insensitively.
+    """
+    key = (settings.GEMINI_EMBEDDING_MODEL, " ".join(query.lower().split()))
+
+    vector = _query_embeddings.get(key)
+    if vector is None:
+        vector = await embeddings.aembed_query(
+            query, output_dimensionality=settings.GEMINI_EMBEDDING_DIMS
+        )
+        _query_embeddings.set(key, vector)
+
+    return vector
+
+
+def get_query_embedding_stats():
+    """Returns the hit/miss counters of the query embedding cache."""
+    return _query_embeddings.stats()
 
 
 async def ensure_vector_store_initialized():
@@ -26,7 +87,7 @@ async def ensure_vector_store_initialized():
     vector_store = get_vector_store()
     await vector_store.acreate_collection()
 
-    """    
+    """
     TODO: Fix this function to properly create tables if not exists. Currently, tables are not being created as expected.
 
     async with get_async_session() as session:
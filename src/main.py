@@ -4,6 +4,22 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from src.configs import settings
 from src.routers import entry_router
+from src.db.checkpointer import (
+    open_checkpoint_saver,
+    close_checkpoint_saver,
+    get_checkpoint_pool_stats,
+)
+from src.utils.langgraph.agent import init_langgraph_agent, reset_langgraph_agent
+from src.utils.memory_queue import memory_queue
+from src.configs.memzero import open_memory, close_memory
+from src.db.vectorstore import get_vector_store_stats, get_query_embedding_stats
+from src.db.embedding_cache import embedding_cache
+from src.db.captured_sources import ensure_captured_sources_table
+from src.utils.crawler_pool import crawler_pool
+from src.utils.crawl_cache import crawl_cache
+from src.utils.ingestion_worker import ingestion_workers
+from src.apis.capture import selection_buffer, start_capture_jobs
+from src.utils.pdf_extraction import start_pdf_workers, shutdown_pdf_workers
 from src.utils.logging import get_logger
 import src.configs.glob_ctx  # noqa: F401
 
@@ -15,8 +31,28 @@ logger = get_logger(__name__)
 async def lifespan(_: FastAPI):
     """Manages application startup and shutdown events."""
     logger.info("PocketLM Server is starting up...")
+    await open_checkpoint_saver()
+    await init_langgraph_agent()
+    await open_memory()
+    await embedding_cache.ensure_table()
+    await ensure_captured_sources_table()
+    await crawl_cache.start()
+    await crawler_pool.start()
+    start_pdf_workers()
+    await start_capture_jobs()
+    selection_buffer.start()
+    memory_queue.start()
     yield
     logger.info("PocketLM Server is shutting down...")
+    await selection_buffer.close()
+    await ingestion_workers.stop()
+    await memory_queue.flush(timeout=settings.MEMORY_QUEUE_SHUTDOWN_TIMEOUT)
+    await close_memory()
+    await crawler_pool.close()
+    await crawl_cache.close()
+    shutdown_pdf_workers()
+    reset_langgraph_agent()
+    await close_checkpoint_saver()
 
 
 def create_application() -> FastAPI:
@@ -55,6 +91,28 @@ async def health_check():
     }
 
 
+# Runtime statistics endpoint
+@app.get("/stats", summary="Runtime Statistics")
+async def runtime_stats():
+    """Exposes connection pool usage and other runtime statistics for monitoring."""
+    return {
+        "success": True,
+        "status": "success",
+        "message": "Runtime statistics retrieved",
+        "data": {
+            "checkpoint_pool": get_checkpoint_pool_stats(),
+            "memory_queue": memory_queue.stats(),
+            "vector_stores": get_vector_store_stats(),
+            "embedding_cache": embedding_cache.stats(),
+            "query_embeddings": get_query_embedding_stats(),
+            "crawler_pool": crawler_pool.stats(),
+            "crawl_cache": crawl_cache.stats(),
+            "ingestion_jobs": ingestion_workers.stats(),
+            "selection_buffer": selection_buffer.stats(),
+        },
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -1,8 +1,18 @@
 from typing import Annotated
-from fastapi import APIRouter, Form
+from uuid import UUID
+from fastapi import APIRouter, Body, Form, status
 
-from src.apis.capture import handle_knowledge_capture
-from src.schemas.capture import KnowledgeCaptureRequest
+from src.apis.capture import (
+    handle_knowledge_capture,
+    handle_batch_url_capture,
+    handle_capture_job_submission,
+    handle_capture_job_status,
+)
+from src.schemas.capture import (
+    KnowledgeCaptureRequest,
+    BatchUrlCaptureRequest,
+    CaptureJobResponse,
+)
 from src.utils.response_builder import ResponseBuilder
 
 capture_router = APIRouter()
@@ -13,15 +23,36 @@ async def capture_knowledge(
     body: Annotated[KnowledgeCaptureRequest, Form(...)],
 ):
     """
-    API endpoint to capture knowledge from a URL, text, or PDF.
+    API endpoint to capture knowledge from a URL, a site, text, or PDF.
+    With `background`, the capture is queued and a job id is returned.
     """
     try:
+        if body.background:
+            job_id = await handle_capture_job_submission(
+                type=body.type,
+                knowledge_base=body.knowledge_base,
+                url=body.url,
+                selection=body.selection,
+                pdf=body.pdf,
+                max_depth=body.max_depth,
+                max_pages=body.max_pages,
+                bypass_cache=body.bypass_cache,
+            )
+            return ResponseBuilder.success(
+                status_code=status.HTTP_202_ACCEPTED,
+                message=f"Capture of {body.type} queued for knowledge base: {body.knowledge_base}.",
+                data={"jobId": job_id},
+            )
+
         await handle_knowledge_capture(
             type=body.type,
             knowledge_base=body.knowledge_base,
             url=body.url,
             selection=body.selection,
             pdf=body.pdf,
+            max_depth=body.max_depth,
+            max_pages=body.max_pages,
+            bypass_cache=body.bypass_cache,
         )
         return ResponseBuilder.success(
             message=f"Content from {body.type} captured successfully for knowledge base: {body.knowledge_base}.",
@@ -29,3 +60,42 @@ async def capture_knowledge(
         )
     except Exception as e:
         raise e
+
+
+@capture_router.post("/batch")
+async def capture_knowledge_batch(
+    body: Annotated[BatchUrlCaptureRequest, Body(...)],
+):
+    """
+    API endpoint to capture knowledge from many URLs into one knowledge base.
+    """
+    try:
+        results = await handle_batch_url_capture(
+            knowledge_base=body.knowledge_base,
+            urls=body.urls,
+            bypass_cache=body.bypass_cache,
+        )
+        captured = sum(1 for res in results if res.success)
+        res_data = [res.model_dump(by_alias=True, exclude_none=True) for res in results]
+        message = f"Captured {captured}/{len(results)} URLs for knowledge base: {body.knowledge_base}."
+
+        if captured < len(results):
+            return ResponseBuilder.warning(message=message, data=res_data)
+        return ResponseBuilder.success(message=message, data=res_data)
+    except Exception as e:
+        raise e
+
+
+@capture_router.get("/jobs/{job_id}")
+async def capture_job_status(job_id: UUID):
+    """
+    API endpoint to get the stage, progress and errors of a capture job.
+    """
+    try:
+        job = await handle_capture_job_status(str(job_id))
+        return ResponseBuilder.success(
+            message="Capture job retrieved successfully.",
+            data=CaptureJobResponse(**job).model_dump(by_alias=True, mode="json"),
+        )
+    except Exception as e:
+        raise e
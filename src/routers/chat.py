@@ -1,6 +1,5 @@
 from fastapi import APIRouter, Body
-
-# from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse
 from typing import Annotated, Literal
 
 from src.schemas.custom_base_model import CamelCaseBaseModel
@@ -83,6 +82,26 @@ async def chat_message(
         raise e
 
 
+@chat_router.post("/stream")
+async def chat_stream(
+    body: Annotated[ChatMessageRequest, Body(...)],
+):
+    """
+    Processes a user's chat message and streams the AI's response as server-sent events.
+
+    Args:
+        body (ChatMessageRequest): The request body containing the user's query and collection name.
+
+    Returns:
+        StreamingResponse: A `text/event-stream` of node progress, token and completion events.
+    """
+    return StreamingResponse(
+        handle_chat_stream(body.collection_name, body.user_query),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @chat_router.delete("/clear")
 async def clear_chat():
     """
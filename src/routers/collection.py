@@ -2,8 +2,10 @@ from fastapi import APIRouter, Depends, Body
 from typing import Annotated
 
 from src.apis.collection import *
+from src.apis.capture import handle_collection_refresh
 from src.db.vectorstore import ensure_vector_store_initialized
 from src.utils.response_builder import ResponseBuilder
+from src.schemas.collection import CollectionSettingsRequest
 from src.schemas.custom_base_model import CamelCaseBaseModel
 
 collection_router = APIRouter(dependencies=[Depends(ensure_vector_store_initialized)])
@@ -30,13 +32,14 @@ async def list_collections():
 
 @collection_router.post("")
 async def create_collection(
-    body: Annotated[CollectionCreateRequest, Body(...)],
+    body: Annotated[CollectionSettingsRequest, Body(...)],
 ):
     """
-    API endpoint to create a new collection (knowledge base).
+    API endpoint to create a new collection (knowledge base), optionally
+    with its chunking settings.
     """
     try:
-        await handle_collection_creation(body.name)
+        await handle_collection_creation(body.name, body.changes())
         return ResponseBuilder.success(
             message=f"Collection '{body.name}' created successfully.",
             data=None,
@@ -58,3 +61,42 @@ async def delete_collection(body: Annotated[CollectionCreateRequest, Body(...)])
         )
     except Exception as e:
         raise e
+
+
+@collection_router.put("/settings")
+async def change_collection_settings(
+    body: Annotated[CollectionSettingsRequest, Body(...)],
+):
+    """
+    API endpoint to change the chunking settings of a collection.
+    """
+    try:
+        collection_settings = await handle_collection_settings_update(
+            body.name, body.changes()
+        )
+        return ResponseBuilder.success(
+            message=f"Settings of collection '{body.name}' updated successfully.",
+            data=collection_settings.model_dump(by_alias=True),
+        )
+    except Exception as e:
+        raise e
+
+
+@collection_router.post("/refresh")
+async def refresh_collection(body: Annotated[CollectionCreateRequest, Body(...)]):
+    """
+    API endpoint to re-capture the URLs of a collection that changed since
+    they were captured.
+    """
+    try:
+        results = await handle_collection_refresh(body.name)
+        failed = sum(1 for res in results if res.status == "failed")
+        updated = sum(1 for res in results if res.status == "updated")
+        res_data = [res.model_dump(by_alias=True, exclude_none=True) for res in results]
+        message = f"Refreshed collection '{body.name}': {updated}/{len(results)} URLs updated."
+
+        if failed:
+            return ResponseBuilder.warning(message=message, data=res_data)
+        return ResponseBuilder.success(message=message, data=res_data)
+    except Exception as e:
+        raise e
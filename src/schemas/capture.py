@@ -1,10 +1,11 @@
-from typing import Literal, Optional, Dict
+from datetime import datetime
+from typing import Literal, Optional, Dict, List
 from pydantic import HttpUrl, Field
 from fastapi import UploadFile
 
 from src.schemas.custom_base_model import CamelCaseBaseModel
 
-CaptureType = Literal["selection", "url", "pdf"]
+CaptureType = Literal["selection", "url", "pdf", "site"]
 
 
 class KnowledgeExtractionHelperOutput(CamelCaseBaseModel):
@@ -12,6 +13,14 @@ class KnowledgeExtractionHelperOutput(CamelCaseBaseModel):
     metadata: Dict = Field(..., description="Metadata related to the extracted content")
 
 
+class UrlVersion(CamelCaseBaseModel):
+    etag: Optional[str] = Field(None, description="ETag response header")
+    last_modified: Optional[str] = Field(
+        None, description="Last-Modified response header"
+    )
+    content_hash: str = Field(..., description="Hash of the extracted markdown")
+
+
 class KnowledgeCaptureRequest(CamelCaseBaseModel):
     type: CaptureType = Field(..., description="Type of knowledge capture")
     knowledge_base: str = Field(..., description="Target knowledge base name")
@@ -22,3 +31,56 @@ class KnowledgeCaptureRequest(CamelCaseBaseModel):
     pdf: Optional[UploadFile] = Field(
         None, description="PDF file to capture knowledge from"
     )
+    max_depth: Optional[int] = Field(
+        None, ge=0, description="Link depth of a site capture from the start URL"
+    )
+    max_pages: Optional[int] = Field(
+        None, ge=1, description="Maximum number of pages of a site capture"
+    )
+    background: bool = Field(
+        False, description="Run the capture as a background job and return its id"
+    )
+    bypass_cache: bool = Field(
+        False, description="Crawl the URL even if its extracted content is cached"
+    )
+
+
+class BatchUrlCaptureRequest(CamelCaseBaseModel):
+    knowledge_base: str = Field(..., description="Target knowledge base name")
+    urls: List[HttpUrl] = Field(
+        ..., min_length=1, description="URLs to capture knowledge from"
+    )
+    bypass_cache: bool = Field(
+        False, description="Crawl the URLs even if their extracted content is cached"
+    )
+
+
+class UrlCaptureResult(CamelCaseBaseModel):
+    url: str = Field(..., description="Captured URL")
+    success: bool = Field(..., description="Whether the URL was captured")
+    chunks: int = Field(0, description="Number of chunks stored for the URL")
+    error: Optional[str] = Field(None, description="Reason the capture failed")
+
+
+class CaptureJobResponse(CamelCaseBaseModel):
+    id: str = Field(..., description="Job id")
+    type: CaptureType = Field(..., description="Type of knowledge capture")
+    knowledge_base: str = Field(..., description="Target knowledge base name")
+    status: Literal["pending", "running", "succeeded", "failed"] = Field(
+        ..., description="Job status"
+    )
+    stage: str = Field(..., description="Current pipeline stage of the job")
+    progress: Dict[str, int] = Field(
+        ..., description="Extracted pages, chunks and chunks embedded so far"
+    )
+    error: Optional[str] = Field(None, description="Reason the job failed")
+    created_at: datetime
+    updated_at: datetime
+
+
+class UrlRefreshResult(CamelCaseBaseModel):
+    url: str = Field(..., description="Refreshed URL")
+    status: Literal["unchanged", "updated", "failed"] = Field(
+        ..., description="Whether the URL was unchanged, re-captured or failed"
+    )
+    error: Optional[str] = Field(None, description="Reason the refresh failed")
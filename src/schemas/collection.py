@@ -0,0 +1,75 @@
+from typing import Any, Dict, Literal, Optional, Tuple
+from pydantic import Field, model_validator
+
+from src.configs.settings import settings
+from src.schemas.custom_base_model import CamelCaseBaseModel
+
+
+RetrievalMode = Literal["chunks", "parents"]
+
+
+class CollectionSettings(CamelCaseBaseModel):
+    chunk_size: int = Field(
+        settings.CHUNK_SIZE_TOKENS,
+        ge=64,
+        le=8192,
+        description="Maximum size of a chunk, in tokens",
+    )
+    chunk_overlap: int = Field(
+        settings.CHUNK_OVERLAP_TOKENS,
+        ge=0,
+        description="Tokens shared by consecutive chunks of a long section",
+    )
+    retrieval_mode: RetrievalMode = Field(
+        "chunks",
+        description="Retrieve the matched chunks, or the sections and pages they belong to",
+    )
+    child_chunk_size: int = Field(
+        settings.CHILD_CHUNK_SIZE_TOKENS,
+        ge=32,
+        le=8192,
+        description="Size in tokens of the chunks indexed in parents mode",
+    )
+
+    @model_validator(mode="after")
+    def check_overlap(self) -> "CollectionSettings":
+        if self.chunk_overlap >= self.chunk_size:
+            raise ValueError("chunkOverlap must be smaller than chunkSize.")
+        if self.retrieval_mode == "parents" and self.child_chunk_size > self.chunk_size:
+            raise ValueError("childChunkSize must not be larger than chunkSize.")
+        return self
+
+    def indexed_chunking(self) -> Tuple[int, int]:
+        """
+        Returns the size and overlap, in tokens, of the chunks that are embedded.
+        In parents mode, chunkSize bounds the parents returned by retrieval.
+        """
+        if self.retrieval_mode == "parents":
+            return self.child_chunk_size, min(
+                self.chunk_overlap, self.child_chunk_size // 4
+            )
+        return self.chunk_size, self.chunk_overlap
+
+
+class CollectionSettingsRequest(CamelCaseBaseModel):
+    name: str = Field(..., description="Collection name")
+    chunk_size: Optional[int] = Field(
+        None, ge=64, le=8192, description="Maximum size of a chunk, in tokens"
+    )
+    chunk_overlap: Optional[int] = Field(
+        None, ge=0, description="Tokens shared by consecutive chunks of a long section"
+    )
+    retrieval_mode: Optional[RetrievalMode] = Field(
+        None,
+        description="Retrieve the matched chunks, or the sections and pages they belong to",
+    )
+    child_chunk_size: Optional[int] = Field(
+        None,
+        ge=32,
+        le=8192,
+        description="Size in tokens of the chunks indexed in parents mode",
+    )
+
+    def changes(self) -> Dict[str, Any]:
+        """Returns the settings given in the request, by field name."""
+        return self.model_dump(exclude={"name"}, exclude_none=True)
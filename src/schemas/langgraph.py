@@ -1,7 +1,10 @@
-from typing import Annotated, List
+from typing import Annotated, List, NotRequired
 from langgraph.graph.message import add_messages, MessagesState, AnyMessage
 
 
 class AgentState(MessagesState):
     summary: Annotated[str, "A brief summary of the conversation so far."]
     history: Annotated[List[AnyMessage], add_messages]
+    memory_watermark: NotRequired[
+        Annotated[str, "Id of the last human message already sent to Mem0."]
+    ]
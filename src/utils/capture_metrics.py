@@ -0,0 +1,67 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict
+
+
+@dataclass
+class CaptureMetrics:
+    """
+    Throughput of the embedding and insertion stages of one capture.
+    Embedding time counts the wall time during which at least one embedding
+    request was in flight, so overlapping requests are not counted twice.
+    """
+
+    chunks_embedded: int = 0
+    chunks_inserted: int = 0
+    cache_hits: int = 0
+    embed_seconds: float = 0.0
+    insert_seconds: float = 0.0
+    _embedding: int = field(default=0, repr=False)
+    _embedding_since: float = field(default=0.0, repr=False)
+
+    def embedding_started(self):
+        if self._embedding == 0:
+            self._embedding_since = time.perf_counter()
+        self._embedding += 1
+
+    def embedding_finished(self, chunks: int, cache_hits: int):
+        self._embedding_stopped()
+        self.chunks_embedded += chunks
+        self.cache_hits += cache_hits
+
+    def embedding_failed(self):
+        """Ends a failed or cancelled batch, its chunks do not count as embedded."""
+        self._embedding_stopped()
+
+    def _embedding_stopped(self):
+        self._embedding -= 1
+        if self._embedding == 0:
+            self.embed_seconds += time.perf_counter() - self._embedding_since
+
+    def inserted(self, chunks: int, seconds: float):
+        self.chunks_inserted += chunks
+        self.insert_seconds += seconds
+
+    def rates(self) -> Dict[str, int]:
+        """Returns the chunks per second of both stages."""
+        return {
+            "embed_chunks_per_sec": (
+                round(self.chunks_embedded / self.embed_seconds)
+                if self.embed_seconds
+                else 0
+            ),
+            "insert_chunks_per_sec": (
+                round(self.chunks_inserted / self.insert_seconds)
+                if self.insert_seconds
+                else 0
+            ),
+        }
+
+    def summary(self, knowledge_base: str) -> str:
+        rates = self.rates()
+        return (
+            f"Captured {self.chunks_inserted} chunks into '{knowledge_base}': "
+            f"embedding {rates['embed_chunks_per_sec']} chunks/s "
+            f"({self.cache_hits} cache hits), "
+            f"insertion {rates['insert_chunks_per_sec']} chunks/s."
+        )
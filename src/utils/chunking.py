@@ -0,0 +1,177 @@
+import re
+from functools import lru_cache
+from typing import List, Tuple
+import tiktoken
+from langchain_core.documents import Document
+from langchain_text_splitters import Language, RecursiveCharacterTextSplitter
+
+from src.configs.settings import settings
+
+# documents are cut into sections at headings of these levels (#, ## and ###)
+SECTION_HEADING_LEVELS = 3
+
+HEADING = re.compile(r"^(#{1,6})[ \t]+(.+?)[ \t#]*$", re.MULTILINE)
+LEADING_HEADINGS = re.compile(r"(?:#{1,6}[ \t]+[^\n]*(?:\n|$)|[ \t]*\n)+")
+CODE_FENCE = re.compile(r"^(```|~~~).*?^\1[ \t]*$", re.MULTILINE | re.DOTALL)
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> tiktoken.Encoding:
+    return tiktoken.get_encoding(settings.CHUNK_TOKEN_ENCODING)
+
+
+def count_tokens(text: str) -> int:
+    return len(_encoding().encode(text, disallowed_special=()))
+
+
+@lru_cache(maxsize=32)
+def _splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=count_tokens,
+        separators=RecursiveCharacterTextSplitter.get_separators_for_language(
+            Language.MARKDOWN
+        ),
+        is_separator_regex=True,
+    )
+
+
+def normalize_markdown(text: str) -> str:
+    """
+    Trims trailing whitespace and collapses runs of blank lines, keeping the
+    headings, tables and lists of the markdown intact.
+    """
+    text = re.sub(r"[ \t]+$", "", text, flags=re.MULTILINE)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def _sections(text: str) -> List[Tuple[int, List[str]]]:
+    """
+    Returns the start offset and the heading path of every section of a
+    markdown text. Headings inside code blocks are ignored.
+    """
+    fences = [(m.start(), m.end()) for m in CODE_FENCE.finditer(text)]
+    sections: List[Tuple[int, List[str]]] = [(0, [])]
+    path: List[Tuple[int, str]] = []
+
+    for match in HEADING.finditer(text):
+        level = len(match.group(1))
+        if level > SECTION_HEADING_LEVELS or any(
+            start <= match.start() < end for start, end in fences
+        ):
+            continue
+
+        path = [(lvl, title) for lvl, title in path if lvl < level]
+        path.append((level, match.group(2)))
+        headings = [title for _, title in path]
+        if match.start() == 0:
+            sections[0] = (0, headings)
+        else:
+            sections.append((match.start(), headings))
+    return sections
+
+
+def _is_heading_only(text: str) -> bool:
+    return bool(text.strip()) and HEADING.sub("", text).strip() == ""
+
+
+def _split_section(
+    section: str, chunk_size: int, chunk_overlap: int
+) -> List[Tuple[int, str]]:
+    """
+    Splits a section longer than a chunk into (offset, chunk) pairs.
+    Its headings stay attached to the first chunk instead of becoming a
+    chunk of their own.
+    """
+    heading = LEADING_HEADINGS.match(section) if section.startswith("#") else None
+    body_start = heading.end() if heading else 0
+    heading_tokens = count_tokens(section[:body_start])
+    splitter = _splitter(
+        max(chunk_size - heading_tokens, chunk_overlap + 1), chunk_overlap
+    )
+
+    pieces: List[Tuple[int, str]] = []
+    cursor = body_start
+    for piece in splitter.split_text(section[body_start:]):
+        # offsets are tracked here, the splitter counts lengths in tokens
+        offset = section.find(piece, cursor)
+        if offset < 0:
+            offset = section.find(piece, body_start)
+        pieces.append((offset, piece))
+        cursor = offset + 1
+
+    if heading and pieces:
+        first_offset, first_piece = pieces[0]
+        pieces[0] = (0, section[: first_offset + len(first_piece)])
+    return pieces
+
+
+def split_markdown(
+    docs: List[Document], chunk_size: int, chunk_overlap: int
+) -> List[Document]:
+    """
+    Splits markdown documents into chunks of at most `chunk_size` tokens.
+
+    Documents are cut at their headings first and adjacent sections are
+    merged while they fit in one chunk, so chunks end where sections end.
+    Only sections larger than a chunk are split further, on code blocks,
+    paragraphs, lines and then words, with `chunk_overlap` tokens of overlap,
+    keeping their headings in their first chunk.
+    Chunks keep the metadata of their document, with their heading path as
+    `section` and their character offset in the document as `start_index`.
+    """
+    chunks: List[Document] = []
+
+    for doc in docs:
+        text = doc.page_content
+        sections = _sections(text)
+        ends = [start for start, _ in sections[1:]] + [len(text)]
+
+        # (start, end, heading path, tokens) of the merged sections
+        merged: List[Tuple[int, int, List[str], int]] = []
+        heading_start = None
+        for (start, headings), end in zip(sections, ends):
+            if end < len(text) and _is_heading_only(text[start:end]):
+                # a heading directly followed by a subsection is part of it
+                heading_start = start if heading_start is None else heading_start
+                continue
+            if heading_start is not None:
+                start, heading_start = heading_start, None
+
+            tokens = count_tokens(text[start:end])
+            if merged and merged[-1][3] + tokens <= chunk_size:
+                first_start, _, first_headings, first_tokens = merged[-1]
+                merged[-1] = (first_start, end, first_headings, first_tokens + tokens)
+            else:
+                merged.append((start, end, headings, tokens))
+
+        for start, end, headings, tokens in merged:
+            section = text[start:end].strip()
+            if not section:
+                continue
+            offset = text.index(section, start)
+            metadata = dict(doc.metadata)
+            if headings:
+                metadata["section"] = " > ".join(headings)
+
+            if tokens <= chunk_size:
+                chunks.append(
+                    Document(
+                        page_content=section,
+                        metadata={**metadata, "start_index": offset},
+                    )
+                )
+                continue
+
+            for piece_offset, piece in _split_section(
+                section, chunk_size, chunk_overlap
+            ):
+                chunks.append(
+                    Document(
+                        page_content=piece,
+                        metadata={**metadata, "start_index": offset + piece_offset},
+                    )
+                )
+
+    return chunks
@@ -0,0 +1,222 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+import aiosqlite
+from crawl4ai import CrawlerRunConfig
+
+from src.configs.settings import settings
+from src.utils.logging import get_logger
+from src.utils.site_crawler import canonicalize_url
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CrawledPage:
+    """Extracted markdown and validators of a crawled page."""
+
+    markdown: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class CrawlCache:
+    """
+    Disk-backed cache of extracted pages, shared by every knowledge base.
+
+    Entries are keyed by the canonical URL and a fingerprint of the crawler
+    config, so changing the extraction settings never serves older output.
+    Entries expire `ttl` seconds after they were crawled, and the least
+    recently used ones are evicted once the cached markdown exceeds
+    `max_bytes`. Cache errors are logged and treated as misses.
+    """
+
+    def __init__(self, path: str, ttl: float, max_bytes: int):
+        self._path = path
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        self._db: Optional[aiosqlite.Connection] = None
+        self._lock = asyncio.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._saved_seconds = 0.0
+
+    async def start(self):
+        """Opens the cache database and drops expired entries."""
+        if self._db is not None:
+            return
+
+        os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+        self._db = await aiosqlite.connect(self._path)
+        await self._db.execute("PRAGMA journal_mode=WAL")
+        await self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_cache (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                markdown TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER NOT NULL,
+                crawl_seconds REAL NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        await self._db.execute(
+            "CREATE INDEX IF NOT EXISTS crawl_cache_accessed_at "
+            "ON crawl_cache (accessed_at)"
+        )
+        await self._db.execute(
+            "DELETE FROM crawl_cache WHERE created_at < ?", (time.time() - self._ttl,)
+        )
+        async with self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM crawl_cache"
+        ) as cursor:
+            row = await cursor.fetchone()
+            self._bytes = row[0] if row else 0
+        await self._db.commit()
+        logger.info(f"Crawl cache opened at {self._path} ({self._bytes} bytes).")
+
+    async def close(self):
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    @staticmethod
+    def _key(url: str, config: CrawlerRunConfig) -> str:
+        fingerprint = json.dumps(config.dump(), sort_keys=True, default=str)
+        return hashlib.sha256(
+            f"{canonicalize_url(url)}|{fingerprint}".encode()
+        ).hexdigest()
+
+    async def get(self, url: str, config: CrawlerRunConfig) -> Optional[CrawledPage]:
+        """Returns the cached page of a URL, or None if it is missing or expired."""
+        if self._db is None:
+            return None
+
+        try:
+            async with self._db.execute(
+                """
+                SELECT key, markdown, etag, last_modified, crawl_seconds
+                FROM crawl_cache WHERE key = ? AND created_at >= ?
+                """,
+                (self._key(url, config), time.time() - self._ttl),
+            ) as cursor:
+                row = await cursor.fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+
+            key, markdown, etag, last_modified, crawl_seconds = row
+            await self._db.execute(
+                "UPDATE crawl_cache SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            await self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Crawl cache lookup of {url} failed: {e}")
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        self._saved_seconds += crawl_seconds
+        return CrawledPage(markdown=markdown, etag=etag, last_modified=last_modified)
+
+    async def put(
+        self,
+        url: str,
+        config: CrawlerRunConfig,
+        page: CrawledPage,
+        crawl_seconds: float,
+    ):
+        """Caches the extracted page of a URL and evicts entries above the size limit."""
+        if self._db is None:
+            return
+
+        key = self._key(url, config)
+        size = len(page.markdown.encode())
+        if size > self._max_bytes:
+            return
+
+        now = time.time()
+        try:
+            async with self._lock:
+                async with self._db.execute(
+                    "SELECT size FROM crawl_cache WHERE key = ?", (key,)
+                ) as cursor:
+                    previous = await cursor.fetchone()
+                await self._db.execute(
+                    """
+                    INSERT OR REPLACE INTO crawl_cache
+                    (key, url, markdown, etag, last_modified, size,
+                     crawl_seconds, created_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        key,
+                        url,
+                        page.markdown,
+                        page.etag,
+                        page.last_modified,
+                        size,
+                        crawl_seconds,
+                        now,
+                        now,
+                    ),
+                )
+                self._bytes += size - (previous[0] if previous else 0)
+                await self._evict()
+                await self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to cache crawl of {url}: {e}")
+
+    async def _evict(self):
+        """Deletes expired entries first, then the least recently used ones."""
+        assert self._db is not None
+        if self._bytes <= self._max_bytes:
+            return
+
+        evicted = []
+        async with self._db.execute(
+            """
+            SELECT key, size FROM crawl_cache
+            ORDER BY created_at < ? DESC, accessed_at
+            """,
+            (time.time() - self._ttl,),
+        ) as cursor:
+            async for key, size in cursor:
+                if self._bytes <= self._max_bytes:
+                    break
+                evicted.append((key,))
+                self._bytes -= size
+
+        await self._db.executemany("DELETE FROM crawl_cache WHERE key = ?", evicted)
+        self._evictions += len(evicted)
+
+    def stats(self) -> Dict[str, float | int]:
+        """Returns cache usage counters for monitoring."""
+        lookups = self._hits + self._misses
+        return {
+            "bytes": self._bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / lookups, 3) if lookups else 0,
+            "evictions": self._evictions,
+            "saved_crawl_seconds": round(self._saved_seconds, 1),
+        }
+
+
+crawl_cache = CrawlCache(
+    path=settings.CRAWL_CACHE_PATH,
+    ttl=settings.CRAWL_CACHE_TTL,
+    max_bytes=settings.CRAWL_CACHE_MAX_BYTES,
+)
@@ -0,0 +1,159 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Dict, List, Optional, cast
+from uuid import uuid4
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CrawlResult
+from crawl4ai.models import CrawlResultContainer
+
+from src.configs.settings import settings
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class PooledCrawler:
+    """A warm browser with a dedicated page (crawl4ai session) reused across crawls."""
+
+    def __init__(self, crawler: Optional[AsyncWebCrawler]):
+        self.crawler = crawler
+        self.session_id = f"pool-{uuid4()}"
+        self.pages = 0
+
+    @property
+    def healthy(self) -> bool:
+        if self.crawler is None or not getattr(self.crawler, "ready", False):
+            return False
+        browser_manager = getattr(
+            self.crawler.crawler_strategy, "browser_manager", None
+        )
+        browser = getattr(browser_manager, "browser", None)
+        return browser is None or browser.is_connected()
+
+
+class CrawlerPool:
+    """
+    Pool of warm headless browsers shared by URL captures.
+
+    Each browser serves one crawl at a time and keeps reusing the same page.
+    Browsers that fail a health check or an arun call are replaced, and every
+    browser is recycled after `max_pages` crawls to bound its memory growth.
+    """
+
+    def __init__(self, size: int, max_pages: int, browser_config: BrowserConfig):
+        self._size = size
+        self._max_pages = max_pages
+        self._browser_config = browser_config
+        self._idle: Optional[asyncio.Queue[PooledCrawler]] = None
+        self._crawlers: List[PooledCrawler] = []
+        self._lock = asyncio.Lock()
+        self._pages_crawled = 0
+        self._recycled = 0
+
+    async def start(self):
+        """Launches the browsers of the pool. Safe to call more than once."""
+        async with self._lock:
+            if self._idle is not None:
+                return
+
+            idle: asyncio.Queue[PooledCrawler] = asyncio.Queue()
+            for pooled in await asyncio.gather(
+                *(self._try_launch() for _ in range(self._size))
+            ):
+                idle.put_nowait(pooled)
+            self._idle = idle
+            logger.info(f"Crawler pool started with {self._size} browsers.")
+
+    async def close(self):
+        """Closes every browser of the pool."""
+        async with self._lock:
+            await asyncio.gather(
+                *(self._shutdown(pooled) for pooled in list(self._crawlers)),
+                return_exceptions=True,
+            )
+            self._idle = None
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[PooledCrawler]:
+        """Checks out a healthy browser for the duration of the block."""
+        if self._idle is None:
+            await self.start()
+        assert self._idle is not None
+        idle = self._idle
+
+        pooled = await idle.get()
+        try:
+            if not pooled.healthy:
+                logger.warning("Replacing unhealthy browser in crawler pool.")
+                pooled = await self._recycle(pooled)
+                if not pooled.healthy:
+                    raise RuntimeError("No healthy browser available in crawler pool.")
+            yield pooled
+        except Exception:
+            pooled = await self._recycle(pooled)
+            raise
+        finally:
+            if pooled.pages >= self._max_pages:
+                pooled = await self._recycle(pooled)
+            idle.put_nowait(pooled)
+
+    async def crawl(
+        self, url: str, config: CrawlerRunConfig
+    ) -> CrawlResultContainer[CrawlResult]:
+        """Crawls a single URL with a pooled browser."""
+        async with self.acquire() as pooled:
+            assert pooled.crawler is not None
+            result = cast(
+                CrawlResultContainer[CrawlResult],
+                await pooled.crawler.arun(
+                    url, config=config.clone(session_id=pooled.session_id)
+                ),
+            )
+            pooled.pages += 1
+            self._pages_crawled += 1
+            return result
+
+    async def _launch(self) -> PooledCrawler:
+        crawler = AsyncWebCrawler(config=self._browser_config)
+        await crawler.start()
+        pooled = PooledCrawler(crawler)
+        self._crawlers.append(pooled)
+        return pooled
+
+    async def _shutdown(self, pooled: PooledCrawler):
+        if pooled in self._crawlers:
+            self._crawlers.remove(pooled)
+        if pooled.crawler is not None:
+            with suppress(Exception):
+                await pooled.crawler.close()
+
+    async def _try_launch(self) -> PooledCrawler:
+        """
+        Launches a browser. If the launch fails, an empty slot is returned so
+        the next checkout retries instead of shrinking the pool.
+        """
+        try:
+            return await self._launch()
+        except Exception as e:
+            logger.error(f"Failed to launch browser for crawler pool: {e}")
+            return PooledCrawler(None)
+
+    async def _recycle(self, pooled: PooledCrawler) -> PooledCrawler:
+        await self._shutdown(pooled)
+        self._recycled += 1
+        return await self._try_launch()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns pool usage counters for monitoring."""
+        return {
+            "size": self._size,
+            "idle": self._idle.qsize() if self._idle else 0,
+            "pages_crawled": self._pages_crawled,
+            "recycled": self._recycled,
+        }
+
+
+crawler_pool = CrawlerPool(
+    size=settings.CRAWLER_POOL_SIZE,
+    max_pages=settings.CRAWLER_MAX_PAGES_PER_BROWSER,
+    browser_config=BrowserConfig(headless=True, verbose=False),
+)
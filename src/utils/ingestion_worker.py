@@ -0,0 +1,77 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from src.configs.settings import settings
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+JobRunner = Callable[[str], Awaitable[None]]
+
+
+class IngestionWorkerPool:
+    """
+    Bounded pool of background workers running ingestion jobs by id.
+    Job state lives in Postgres; the pool only schedules the ids.
+    """
+
+    def __init__(self, concurrency: int):
+        self._concurrency = concurrency
+        self._queue: Optional[asyncio.Queue[str]] = None
+        self._workers: List[asyncio.Task] = []
+        self._runner: Optional[JobRunner] = None
+        self._active = 0
+
+    def start(self, runner: JobRunner):
+        """Starts the workers with the function that runs a single job."""
+        if self._workers:
+            return
+        self._runner = runner
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"ingestion-worker-{idx}")
+            for idx in range(self._concurrency)
+        ]
+        logger.info(f"Ingestion worker pool started with {self._concurrency} workers.")
+
+    def submit(self, job_id: str):
+        """Schedules a persisted job to be run."""
+        if self._queue is None:
+            raise RuntimeError("Ingestion worker pool is not running.")
+        self._queue.put_nowait(job_id)
+
+    async def stop(self):
+        """
+        Stops the workers. Running jobs are interrupted and stay `running`
+        in the database, so they are resumed on the next start.
+        """
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    async def _worker(self):
+        assert self._queue is not None and self._runner is not None
+        while True:
+            job_id = await self._queue.get()
+            self._active += 1
+            try:
+                await self._runner(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ingestion job {job_id} crashed: {e}")
+            finally:
+                self._active -= 1
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns queued and running job counts for monitoring."""
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "running": self._active,
+        }
+
+
+ingestion_workers = IngestionWorkerPool(concurrency=settings.INGESTION_WORKERS)
@@ -1,11 +1,13 @@
+from typing import Dict
 from contextlib import asynccontextmanager
 
 from langgraph.graph import StateGraph
+from langgraph.graph.state import CompiledStateGraph
 from langgraph.prebuilt import ToolNode, tools_condition
-from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from langgraph.types import Checkpointer
 from langchain_core.runnables import RunnableConfig
 
-from src.configs.settings import settings
+from src.db.checkpointer import get_shared_checkpoint_saver
 from src.schemas.langgraph import AgentState
 from src.utils.langgraph.tools import retrieve_docs, retrieve_memory
 from src.utils.langgraph.nodes import (
@@ -15,20 +17,80 @@ from src.utils.langgraph.nodes import (
     save_to_memory,
 )
 
+DEFAULT_AGENT = "pocketlm"
+
+# Compiled graphs are immutable and shared by every request of the process
+agent_registry: Dict[str, CompiledStateGraph] = {}
+
 
 @asynccontextmanager
 async def get_checkpoint_saver():
-    """Context manager for PostgreSQL checkpoint saver."""
-    async with AsyncPostgresSaver.from_conn_string(
-        settings.PLAIN_DATABASE_URL
-    ) as checkpoint_saver:
-        yield checkpoint_saver
+    """Context manager for the shared, pool-backed PostgreSQL checkpoint saver."""
+    yield await get_shared_checkpoint_saver()
+
+
+def build_langgraph_agent(checkpointer: Checkpointer) -> CompiledStateGraph:
+    """
+    Build and compile the LangGraph agent with all nodes and edges.
+
+    Args:
+        checkpointer: Checkpoint saver the compiled graph is bound to
+
+    Returns:
+        The compiled graph
+    """
+    # Build the state graph
+    builder = StateGraph(AgentState)
+
+    # Add nodes
+    builder.add_node("manage_context", manage_context)
+    builder.add_node("respond_or_retrieve", respond_or_retrieve)
+    builder.add_node("tools", ToolNode(tools=[retrieve_docs, retrieve_memory]))
+    builder.add_node("generate_using_context", generate_using_context)
+    builder.add_node("save_to_memory", save_to_memory)
+
+    # Define edges
+    builder.set_entry_point("manage_context")
+    builder.add_edge("manage_context", "respond_or_retrieve")
+    builder.add_conditional_edges(
+        "respond_or_retrieve",
+        tools_condition,
+        {"__end__": "save_to_memory", "tools": "tools"},
+    )
+    builder.add_edge("tools", "generate_using_context")
+    builder.add_edge("generate_using_context", "save_to_memory")
+    builder.set_finish_point("save_to_memory")
+
+    return builder.compile(checkpointer=checkpointer)
+
+
+async def init_langgraph_agent() -> CompiledStateGraph:
+    """Compiles the agent against the shared checkpointer and registers it."""
+    if DEFAULT_AGENT not in agent_registry:
+        checkpoint_saver = await get_shared_checkpoint_saver()
+        agent_registry[DEFAULT_AGENT] = build_langgraph_agent(checkpoint_saver)
+    return agent_registry[DEFAULT_AGENT]
+
+
+def reset_langgraph_agent():
+    """Drops the registered agents, e.g. when the checkpointer is closed."""
+    agent_registry.clear()
+
+
+def get_runnable_config(user_id: str, thread_id: str) -> RunnableConfig:
+    """Builds the per-request configuration for the shared agent."""
+    return RunnableConfig(
+        configurable={
+            "user_id": user_id,
+            "thread_id": thread_id,
+        }
+    )
 
 
 @asynccontextmanager
 async def get_langgraph_agent(user_id: str, thread_id: str):
     """
-    Create and configure the LangGraph agent with all nodes and edges.
+    Provide the compiled LangGraph agent with a configuration for the given thread.
 
     Args:
         user_id: Unique identifier for the user
@@ -37,38 +99,5 @@ async def get_langgraph_agent(user_id: str, thread_id: str):
     Yields:
         Tuple of (compiled_graph, runnable_config)
     """
-    async with get_checkpoint_saver() as checkpoint_saver:
-        await checkpoint_saver.setup()
-
-        # Build the state graph
-        builder = StateGraph(AgentState)
-
-        # Add nodes
-        builder.add_node("manage_context", manage_context)
-        builder.add_node("respond_or_retrieve", respond_or_retrieve)
-        builder.add_node("tools", ToolNode(tools=[retrieve_docs, retrieve_memory]))
-        builder.add_node("generate_using_context", generate_using_context)
-        builder.add_node("save_to_memory", save_to_memory)
-
-        # Define edges
-        builder.set_entry_point("manage_context")
-        builder.add_edge("manage_context", "respond_or_retrieve")
-        builder.add_conditional_edges(
-            "respond_or_retrieve",
-            tools_condition,
-            {"__end__": "save_to_memory", "tools": "tools"},
-        )
-        builder.add_edge("tools", "generate_using_context")
-        builder.add_edge("generate_using_context", "save_to_memory")
-        builder.set_finish_point("save_to_memory")
-
-        graph = builder.compile(checkpointer=checkpoint_saver)
-
-        config = RunnableConfig(
-            configurable={
-                "user_id": user_id,
-                "thread_id": thread_id,
-            }
-        )
-
-        yield graph, config
+    graph = agent_registry.get(DEFAULT_AGENT) or await init_langgraph_agent()
+    yield graph, get_runnable_config(user_id, thread_id)
@@ -17,7 +17,7 @@ from src.utils.langgraph.config import (
 )
 from src.utils.langgraph.tools import retrieve_docs, retrieve_memory
 from src.configs.settings import settings
-from src.configs.memzero import get_memory
+from src.utils.memory_queue import memory_queue
 
 
 async def manage_context(state: AgentState) -> AgentState:
@@ -127,18 +127,43 @@ async def generate_using_context(state: AgentState) -> AgentState:
 async def save_to_memory(state: AgentState) -> AgentState:
     """
     Save relevant conversation information to Mem0 memory for future retrieval.
-    Stores user messages and assistant responses (excluding tool calls).
+    Only the current turn is stored: the latest user message and the final
+    assistant response (excluding tool calls). Earlier turns were already sent,
+    which the per-thread `memory_watermark` records across restarts.
+    The write itself is done by the background memory queue, after the reply is sent.
     """
-    conversation_messages = [
-        {
-            "role": "user" if message.type == "human" else "assistant",
-            "content": message.content,
-        }
-        for message in state["messages"]
-        if message.type == "human" or (message.type == "ai" and not message.tool_calls)
-    ]
+    messages = state["messages"]
+
+    turn_start = next(
+        (
+            idx
+            for idx in reversed(range(len(messages)))
+            if messages[idx].type == "human"
+        ),
+        None,
+    )
+    if turn_start is None:
+        return {}  # type: ignore
+
+    human_msg = messages[turn_start]
+    if state.get("memory_watermark") == human_msg.id:
+        return {}  # type: ignore
+
+    final_reply = next(
+        (
+            message
+            for message in reversed(messages[turn_start + 1 :])
+            if message.type == "ai" and not message.tool_calls
+        ),
+        None,
+    )
+
+    conversation_messages = [{"role": "user", "content": human_msg.content}]
+    if final_reply is not None:
+        conversation_messages.append(
+            {"role": "assistant", "content": final_reply.content}
+        )
 
-    async with get_memory() as memory:
-        await memory.add(conversation_messages, user_id=settings.DEFAULT_USER_ID)
+    await memory_queue.enqueue(conversation_messages, user_id=settings.DEFAULT_USER_ID)
 
-    return state
+    return {"memory_watermark": str(human_msg.id)}  # type: ignore
@@ -1,9 +1,12 @@
 from langchain_core.tools import tool
 
-from src.db.vectorstore import get_vector_store
+from src.db.vectorstore import get_vector_store, aembed_query
+from src.db.collection_settings import get_collection_settings
+from src.db.parent_documents import fetch_parent_documents
+from src.configs.glob_ctx import ctx
 from src.configs.settings import settings
 from src.configs.memzero import get_memory
-from src.configs.cohere import cohere_ranker
+from src.utils.reranker import rerank
 
 
 @tool(response_format="content")
@@ -19,29 +22,27 @@ async def retrieve_docs(query: str) -> str:
         Serialized documents with metadata and content
     """
     vector_store = get_vector_store()
-    retriever = vector_store.as_retriever(
-        search_type="similarity", search_kwargs={"k": 50}
-    )
-    docs = await retriever.ainvoke(query)
-    unranked_content = [doc.page_content for doc in docs]
+    query_embedding = await aembed_query(query)
+    docs = await vector_store.asimilarity_search_by_vector(query_embedding, k=50)
+
+    # in parents mode, the small matched chunks are replaced by their section or page
+    collection_settings = await get_collection_settings(ctx.get())
+    if collection_settings.retrieval_mode == "parents":
+        unranked_content = await fetch_parent_documents(
+            ctx.get(), docs, collection_settings.chunk_size
+        )
+        top_n = settings.RETRIEVAL_PARENT_TOP_N
+    else:
+        unranked_content = [doc.page_content for doc in docs]
+        top_n = 10
 
     if not unranked_content:
         return "No relevant context from docs found."
 
-    # rerank the retrieved docs
-    reranked_results = cohere_ranker.rerank(
-        model=settings.COHERE_RERANKING_MODEL,
-        query=query,
-        documents=unranked_content,
-        top_n=10,
-    )
-
-    if not reranked_results.results:
-        return "\n\n".join(unranked_content)
+    # rerank the retrieved docs, falls back to the vector order on failure
+    ranked = await rerank(query, unranked_content, top_n=top_n)
 
-    return "\n\n".join(
-        [unranked_content[res.index] for res in reranked_results.results]
-    )
+    return "\n\n".join([unranked_content[idx] for idx in ranked])
 
 
 @tool(response_format="content")
@@ -0,0 +1,164 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional
+
+from src.configs.settings import settings
+from src.configs.memzero import get_memory
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class MemoryWrite:
+    """A conversation waiting to be persisted to Mem0."""
+
+    messages: List[Dict[str, str]]
+    user_id: str
+    enqueued_at: float
+
+
+class MemoryWriteQueue:
+    """
+    Write-behind queue for Mem0 memory persistence.
+
+    `memory.add` runs fact extraction, embeddings and pgvector writes, so it is
+    drained by background workers instead of on the chat response path.
+    Writes are retried with exponential backoff and flushed on shutdown.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        concurrency: int,
+        max_retries: int,
+        retry_backoff: float,
+        latency_window: int = 200,
+    ):
+        self._max_size = max_size
+        self._concurrency = concurrency
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._queue: Optional[asyncio.Queue[MemoryWrite]] = None
+        self._workers: List[asyncio.Task] = []
+        self._in_flight = 0
+        self._written = 0
+        self._failed = 0
+        self._retried = 0
+        self._write_latencies: Deque[float] = deque(maxlen=latency_window)
+        self._queue_waits: Deque[float] = deque(maxlen=latency_window)
+
+    @property
+    def running(self) -> bool:
+        return len(self._workers) > 0
+
+    def start(self):
+        """Starts the background workers. Safe to call more than once."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_size)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"memory-writer-{idx}")
+            for idx in range(self._concurrency)
+        ]
+        logger.info(f"Memory write queue started with {self._concurrency} workers.")
+
+    async def enqueue(self, messages: List[Dict[str, str]], user_id: str):
+        """
+        Schedules a conversation to be saved to memory.
+        Only waits when the queue is full, which applies backpressure to chat turns.
+        """
+        if not messages:
+            return
+        if not self.running:
+            self.start()
+
+        assert self._queue is not None
+        if self._queue.full():
+            logger.warning("Memory write queue is full, waiting for free capacity.")
+        await self._queue.put(MemoryWrite(messages, user_id, time.perf_counter()))
+
+    async def flush(self, timeout: float):
+        """Waits for pending writes to finish, then stops the workers."""
+        if not self.running:
+            return
+
+        assert self._queue is not None
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Memory write queue flush timed out, {self._queue.qsize()} writes dropped."
+            )
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _worker(self):
+        assert self._queue is not None
+        while True:
+            job = await self._queue.get()
+            self._in_flight += 1
+            try:
+                self._queue_waits.append(time.perf_counter() - job.enqueued_at)
+                await self._write(job)
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+
+    async def _write(self, job: MemoryWrite):
+        for attempt in range(self._max_retries + 1):
+            started = time.perf_counter()
+            try:
+                async with get_memory() as memory:
+                    await memory.add(job.messages, user_id=job.user_id)
+                self._write_latencies.append(time.perf_counter() - started)
+                self._written += 1
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if attempt == self._max_retries:
+                    self._failed += 1
+                    logger.error(
+                        f"Memory write failed after {attempt + 1} attempts: {e}"
+                    )
+                    return
+                self._retried += 1
+                delay = self._retry_backoff * (2**attempt)
+                logger.warning(f"Memory write failed ({e}), retrying in {delay:.1f}s.")
+                await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, float | int]:
+        """Returns queue depth and write latency metrics for monitoring."""
+        latencies = sorted(self._write_latencies)
+        p95_index = min(len(latencies) - 1, int(len(latencies) * 0.95))
+        waits = self._queue_waits
+        return {
+            "depth": self._queue.qsize() if self._queue else 0,
+            "in_flight": self._in_flight,
+            "written": self._written,
+            "retried": self._retried,
+            "failed": self._failed,
+            "write_latency_avg_ms": (
+                round(sum(latencies) / len(latencies) * 1000, 1) if latencies else 0
+            ),
+            "write_latency_p95_ms": (
+                round(latencies[p95_index] * 1000, 1) if latencies else 0
+            ),
+            "queue_wait_avg_ms": (
+                round(sum(waits) / len(waits) * 1000, 1) if waits else 0
+            ),
+        }
+
+
+memory_queue = MemoryWriteQueue(
+    max_size=settings.MEMORY_QUEUE_MAX_SIZE,
+    concurrency=settings.MEMORY_QUEUE_CONCURRENCY,
+    max_retries=settings.MEMORY_QUEUE_MAX_RETRIES,
+    retry_backoff=settings.MEMORY_QUEUE_RETRY_BACKOFF,
+)
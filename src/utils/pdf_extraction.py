@@ -0,0 +1,116 @@
+import asyncio
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+import pymupdf
+import pymupdf4llm
+
+from src.configs.settings import settings
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _extract_pages(filepath: str, pages: List[int]) -> List[Tuple[int, str]]:
+    """
+    Converts the given pages of a PDF to markdown.
+    Runs in a worker process, PyMuPDF table detection is CPU-bound.
+    """
+    # limitation: we do not extract images for now
+    chunks = pymupdf4llm.to_markdown(
+        filepath,
+        pages=pages,
+        page_chunks=True,
+        table_strategy="lines_strict",
+        write_images=False,
+        show_progress=False,
+    )
+    return [(page, chunk["text"]) for page, chunk in zip(pages, chunks)]
+
+
+def _read_document_info(filepath: str) -> Tuple[int, Dict[str, Any]]:
+    with pymupdf.open(filepath) as doc:
+        return doc.page_count, dict(doc.metadata or {})
+
+
+def start_pdf_workers():
+    """Starts the process pool used for PDF extraction."""
+    global _executor
+
+    if _executor is None:
+        # spawn, as forking a process running an event loop and threads is unsafe
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PDF_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info(f"PDF extraction pool started with {settings.PDF_WORKERS} workers.")
+
+
+def shutdown_pdf_workers():
+    """Stops the PDF extraction processes."""
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def read_pdf_info(filepath: str) -> Tuple[int, Dict[str, Any]]:
+    """Returns the page count and the document metadata, incl. `total_pages`."""
+    page_count, metadata = await asyncio.to_thread(_read_document_info, filepath)
+    metadata["total_pages"] = page_count
+    return page_count, metadata
+
+
+async def iter_pdf_pages(
+    filepath: str, page_count: int
+) -> AsyncIterator[Tuple[int, str]]:
+    """
+    Yields the (0-based page number, markdown) pairs of a PDF in page order,
+    as soon as the shard holding them has been converted.
+    Shards of PDF_PAGES_PER_SHARD pages are converted by the process pool, at
+    most PDF_WORKERS ahead of the consumer, so a slow consumer holds back
+    the extraction instead of buffering the whole document.
+    """
+    if _executor is None:
+        start_pdf_workers()
+
+    shard_size = settings.PDF_PAGES_PER_SHARD
+    shards = deque(
+        list(range(start, min(start + shard_size, page_count)))
+        for start in range(0, page_count, shard_size)
+    )
+
+    loop = asyncio.get_running_loop()
+    in_flight: Deque[asyncio.Future[List[Tuple[int, str]]]] = deque()
+    try:
+        while shards or in_flight:
+            while shards and len(in_flight) < settings.PDF_WORKERS:
+                in_flight.append(
+                    loop.run_in_executor(
+                        _executor, _extract_pages, filepath, shards.popleft()
+                    )
+                )
+            for page in await in_flight.popleft():
+                yield page
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+async def extract_pdf_pages(
+    filepath: str,
+) -> Tuple[List[Tuple[int, str]], Dict[str, Any]]:
+    """
+    Extracts the markdown of every page of a PDF off the event loop.
+
+    Returns:
+        The (0-based page number, markdown) pairs in page order, and the
+        document metadata including `total_pages`.
+    """
+    page_count, metadata = await read_pdf_info(filepath)
+    pages = [page async for page in iter_pdf_pages(filepath, page_count)]
+    return pages, metadata
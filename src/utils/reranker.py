@@ -0,0 +1,80 @@
+import asyncio
+import re
+from typing import List, Protocol
+
+from src.configs.settings import settings
+from src.configs.cohere import cohere_ranker
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class Reranker(Protocol):
+    """Orders candidate documents by relevance to a query."""
+
+    async def rerank(self, query: str, documents: List[str], top_n: int) -> List[int]:
+        """Returns the indices of the `top_n` most relevant documents, best first."""
+        ...
+
+
+class CohereReranker:
+    """Reranker backed by the Cohere rerank API, called with the async client."""
+
+    def __init__(self, model: str):
+        self._model = model
+
+    async def rerank(self, query: str, documents: List[str], top_n: int) -> List[int]:
+        response = await cohere_ranker.rerank(
+            model=self._model,
+            query=query,
+            documents=documents,
+            top_n=top_n,
+        )
+        return [res.index for res in response.results]
+
+
+class LocalReranker:
+    """
+    Network-free stand-in that scores documents by query term overlap.
+    Meant for load tests, where the remote reranker would dominate latency.
+    """
+
+    async def rerank(self, query: str, documents: List[str], top_n: int) -> List[int]:
+        terms = set(re.findall(r"\w+", query.lower()))
+        scores = [
+            len(terms.intersection(re.findall(r"\w+", doc.lower())))
+            for doc in documents
+        ]
+        ranked = sorted(range(len(documents)), key=lambda idx: -scores[idx])
+        return ranked[:top_n]
+
+
+def get_reranker() -> Reranker:
+    """Returns the reranker selected by the RERANKER_PROVIDER setting."""
+    if settings.RERANKER_PROVIDER == "local":
+        return LocalReranker()
+    return CohereReranker(model=settings.COHERE_RERANKING_MODEL)
+
+
+reranker = get_reranker()
+
+
+async def rerank(query: str, documents: List[str], top_n: int) -> List[int]:
+    """
+    Reranks the documents within RERANK_TIMEOUT seconds.
+    Falls back to the original (vector similarity) order when the reranker
+    fails, times out or returns nothing.
+    """
+    try:
+        ranked = await asyncio.wait_for(
+            reranker.rerank(query, documents, top_n),
+            timeout=settings.RERANK_TIMEOUT,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(f"Reranking timed out after {settings.RERANK_TIMEOUT}s.")
+        ranked = []
+    except Exception as e:
+        logger.warning(f"Reranking failed: {e}")
+        ranked = []
+
+    return ranked if ranked else list(range(len(documents)))
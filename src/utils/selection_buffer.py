@@ -0,0 +1,136 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+from langchain_core.documents import Document
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+SelectionFlusher = Callable[[str, List[Document]], Awaitable[None]]
+
+
+@dataclass
+class PendingSelections:
+    """Chunks of one knowledge base waiting for the next flush."""
+
+    docs: List[Document] = field(default_factory=list)
+    waiters: List[asyncio.Future] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class SelectionBuffer:
+    """
+    Write-behind buffer coalescing small selection captures.
+
+    Chunks are collected per knowledge base for up to `window` seconds, or
+    until `max_chunks` are pending, and then stored with a single flush
+    (one existence check and one embedding call for the whole batch).
+    Callers wait until their batch is stored, so a capture is durable when
+    the request returns and flush errors reach every request of the batch.
+    """
+
+    def __init__(self, flusher: SelectionFlusher, window: float, max_chunks: int):
+        self._flusher = flusher
+        self._window = window
+        self._max_chunks = max_chunks
+        self._running = False
+        self._pending: Dict[str, PendingSelections] = {}
+        self._flushing: Set[asyncio.Task] = set()
+        self._selections = 0
+        self._flushes = 0
+        self._flushed_chunks = 0
+        self._failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        """Starts buffering selections. Safe to call more than once."""
+        if self.running:
+            return
+        self._running = True
+        logger.info(
+            f"Selection buffer started ({self._window * 1000:.0f}ms window, "
+            f"{self._max_chunks} chunks max)."
+        )
+
+    async def add(self, knowledge_base: str, docs: List[Document]):
+        """Buffers the chunks of a selection and waits until they are stored."""
+        if not self.running:
+            self.start()
+
+        pending = self._pending.setdefault(knowledge_base, PendingSelections())
+        waiter = asyncio.get_running_loop().create_future()
+        pending.docs.extend(docs)
+        pending.waiters.append(waiter)
+        self._selections += 1
+
+        if len(pending.docs) >= self._max_chunks:
+            self._flush(knowledge_base)
+        elif pending.timer is None:
+            pending.timer = asyncio.get_running_loop().call_later(
+                self._window, self._flush, knowledge_base
+            )
+
+        # a disconnected client must not cancel the batch of other requests
+        await asyncio.shield(waiter)
+
+    async def close(self):
+        """Flushes every pending batch and waits for the flushes to finish."""
+        for knowledge_base in list(self._pending):
+            self._flush(knowledge_base)
+        await asyncio.gather(*self._flushing, return_exceptions=True)
+        self._running = False
+
+    def _flush(self, knowledge_base: str):
+        pending = self._pending.pop(knowledge_base, None)
+        if pending is None:
+            return
+        if pending.timer is not None:
+            pending.timer.cancel()
+
+        task = asyncio.create_task(self._store(knowledge_base, pending))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def _store(self, knowledge_base: str, pending: PendingSelections):
+        try:
+            await self._flusher(knowledge_base, pending.docs)
+            self._flushes += 1
+            self._flushed_chunks += len(pending.docs)
+            for waiter in pending.waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+        except Exception as e:
+            self._failed += len(pending.waiters)
+            logger.error(
+                f"Failed to store {len(pending.waiters)} selections in "
+                f"'{knowledge_base}': {e}"
+            )
+            for waiter in pending.waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+        finally:
+            # a cancelled flush must not leave its requests waiting forever
+            for waiter in pending.waiters:
+                if not waiter.done():
+                    self._failed += 1
+                    waiter.set_exception(
+                        RuntimeError(
+                            "Selection batch was cancelled before it was stored."
+                        )
+                    )
+
+    def stats(self) -> Dict[str, float | int]:
+        """Returns buffering and batching counters for monitoring."""
+        return {
+            "pending": sum(len(p.waiters) for p in self._pending.values()),
+            "selections": self._selections,
+            "flushes": self._flushes,
+            "failed": self._failed,
+            "avg_chunks_per_flush": (
+                round(self._flushed_chunks / self._flushes, 1) if self._flushes else 0
+            ),
+        }
@@ -0,0 +1,160 @@
+import asyncio
+from typing import AsyncIterator, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+import httpx
+from bs4 import BeautifulSoup
+from crawl4ai import CrawlerRunConfig, CrawlResult
+
+from src.configs.settings import settings
+from src.utils.crawler_pool import crawler_pool
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalizes a URL so different spellings of a page compare equal:
+    lowercase scheme and host, no default port, no fragment, no trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, parts.query, ""))
+
+
+def _same_site(url: str, root: str) -> bool:
+    return urlsplit(url).netloc.lower() == urlsplit(root).netloc.lower()
+
+
+def _parse_links(result: CrawlResult, page_url: str) -> Tuple[Optional[str], List[str]]:
+    """
+    Returns the canonical URL declared by a page and the URLs it links to.
+    Links are read from the raw HTML, as the capture config drops them from
+    the extracted content.
+    """
+    soup = BeautifulSoup(result.html or "", "lxml")
+
+    canonical = None
+    canonical_tag = soup.find("link", rel="canonical", href=True)
+    if canonical_tag is not None:
+        canonical = urljoin(page_url, str(canonical_tag["href"]))
+
+    links = []
+    for anchor in soup.find_all("a", href=True):
+        href = urljoin(page_url, str(anchor["href"]))
+        if urlsplit(href).scheme in ("http", "https"):
+            links.append(href)
+    return canonical, links
+
+
+async def _load_robots(client: httpx.AsyncClient, root: str) -> RobotFileParser:
+    """
+    Fetches the robots.txt of a site. A missing file allows everything, a
+    forbidden one disallows everything, as in urllib.robotparser.
+    """
+    parts = urlsplit(root)
+    robots = RobotFileParser(f"{parts.scheme}://{parts.netloc}/robots.txt")
+    try:
+        response = await client.get(robots.url)
+    except httpx.HTTPError as e:
+        logger.warning(f"Failed to fetch {robots.url}, crawling without it: {e}")
+        robots.allow_all = True
+        return robots
+
+    if response.status_code in (401, 403):
+        robots.disallow_all = True
+    elif response.status_code >= 400:
+        robots.allow_all = True
+    else:
+        robots.parse(response.text.splitlines())
+    return robots
+
+
+async def crawl_site(
+    start_url: str,
+    config: CrawlerRunConfig,
+    max_depth: int,
+    max_pages: int,
+) -> AsyncIterator[Tuple[str, CrawlResult]]:
+    """
+    Crawls a site breadth-first from `start_url`, following links on the
+    same host up to `max_depth` links away and at most `max_pages` pages.
+    Pages disallowed by robots.txt are skipped and pages are deduplicated by
+    canonical URL. Each level is crawled SITE_CRAWL_CONCURRENCY pages at a time
+    with the crawler pool, and pages are yielded as soon as they are fetched.
+
+    Yields:
+        The canonical URL and crawl result of every page fetched successfully.
+    """
+    root = canonicalize_url(start_url)
+    seen: Set[str] = {root}
+    captured: Set[str] = set()
+    level = [root]
+    crawled = 0
+    semaphore = asyncio.Semaphore(settings.SITE_CRAWL_CONCURRENCY)
+
+    async with httpx.AsyncClient(
+        follow_redirects=True, timeout=settings.REFRESH_REQUEST_TIMEOUT
+    ) as client:
+        robots = await _load_robots(client, root)
+
+        async def fetch(url: str) -> Tuple[str, Optional[CrawlResult]]:
+            async with semaphore:
+                try:
+                    return url, await crawler_pool.crawl(url, config)
+                except Exception as e:
+                    logger.warning(f"Site crawl failed to fetch {url}: {e}")
+                    return url, None
+
+        for depth in range(max_depth + 1):
+            allowed = [
+                url
+                for url in level
+                if robots.can_fetch(settings.SITE_CRAWL_USER_AGENT, url)
+            ][: max_pages - crawled]
+            crawled += len(allowed)
+
+            next_level: List[str] = []
+            tasks = [asyncio.create_task(fetch(url)) for url in allowed]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    url, result = await task
+                    if result is None or not result.success:
+                        continue
+
+                    canonical, links = _parse_links(
+                        result, result.redirected_url or url
+                    )
+                    if canonical and _same_site(canonical, root):
+                        url = canonicalize_url(canonical)
+                    if url in captured:
+                        # an alias of a page that was crawled already
+                        continue
+                    captured.add(url)
+                    seen.add(url)
+
+                    yield url, result
+
+                    if depth < max_depth:
+                        for link in links:
+                            link = canonicalize_url(link)
+                            if _same_site(link, root) and link not in seen:
+                                seen.add(link)
+                                next_level.append(link)
+            finally:
+                # the consumer may stop early, pages still loading are dropped
+                for task in tasks:
+                    task.cancel()
+
+            level = next_level
+            if not level or crawled >= max_pages:
+                break
+
+    logger.info(f"Site crawl of {root} fetched {crawled} pages.")
@@ -0,0 +1,52 @@
+import os
+from uuid import uuid4
+import aiofiles
+from fastapi import HTTPException, UploadFile, status
+
+from src.configs.settings import settings
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def _too_large(max_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Uploaded file exceeds the maximum size of {max_size} bytes.",
+    )
+
+
+async def save_upload(
+    upload: UploadFile, directory: str, max_size: int = settings.PDF_MAX_UPLOAD_SIZE
+) -> str:
+    """
+    Streams an uploaded file to a new file in `directory`, chunk by chunk, so
+    only UPLOAD_CHUNK_SIZE bytes of it are held in memory at a time.
+    The size limit is enforced while streaming and partial files are removed.
+
+    Returns:
+        str: The path of the written file.
+    """
+    if upload.size is not None and upload.size > max_size:
+        raise _too_large(max_size)
+
+    os.makedirs(directory, exist_ok=True)
+    filename = os.path.basename(upload.filename or "upload")
+    filepath = os.path.join(directory, f"{uuid4()}_{filename}")
+
+    written = 0
+    try:
+        async with aiofiles.open(filepath, "wb") as f:
+            while chunk := await upload.read(settings.UPLOAD_CHUNK_SIZE):
+                written += len(chunk)
+                # the declared size is not trusted, the body is counted as it streams
+                if written > max_size:
+                    raise _too_large(max_size)
+                await f.write(chunk)
+    except BaseException:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+        raise
+
+    logger.debug(f"Saved upload '{filename}' ({written} bytes) to {filepath}.")
+    return filepath
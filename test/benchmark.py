@@ -0,0 +1,709 @@
+import asyncio
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Tuple
+from unittest import mock
+from uuid import uuid4
+import httpx
+import pymupdf
+from pydantic import HttpUrl
+from crawl4ai import AsyncWebCrawler
+from langchain_pymupdf4llm import PyMuPDF4LLMLoader
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from mem0 import AsyncMemory
+
+import src.apis.capture as capture_module
+import src.db.parent_documents as parent_documents_module
+import src.utils.memory_queue as memory_queue_module
+from src.configs import crawler_config
+from src.configs.settings import settings
+from src.configs.memzero import config as memory_config, get_memory, close_memory
+from src.db.chunk_writer import open_chunk_writer
+from src.db.parent_documents import parent_key
+from src.schemas.collection import CollectionSettings
+from src.utils.logging import get_logger
+from src.utils.langgraph.agent import build_langgraph_agent, get_runnable_config
+from src.utils.langgraph.config import MESSAGE_LIMIT, MESSAGES_TO_KEEP
+from src.utils.langgraph.nodes import save_to_memory
+from src.utils.memory_queue import memory_queue
+from src.utils.chunking import count_tokens, split_markdown
+from src.utils.capture_metrics import CaptureMetrics
+from src.utils.crawler_pool import crawler_pool
+from src.utils.crawl_cache import CrawlCache
+from src.utils.pdf_extraction import (
+    extract_pdf_pages,
+    start_pdf_workers,
+    shutdown_pdf_workers,
+)
+from src.utils.site_crawler import crawl_site
+from test.fixtures import (
+    StubChunkStore,
+    StubMemory,
+    article_html,
+    count_chunks,
+    peak_rss_of_upload,
+    random_vectors,
+    serve_static,
+    site_pages,
+    stub_capture_pipeline,
+    temporary_collection,
+)
+
+"""
+  Micro-benchmarks for the hot paths of the server.
+  They run against local stand-ins only (in-memory savers, fake backends,
+  local HTTP servers) so the numbers are comparable between runs.
+"""
+
+logger = get_logger(__name__)
+
+
+def _time_per_call(fn: Callable[[], object], iterations: int) -> float:
+    """Returns the mean wall time of `fn` in microseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def bench_agent_setup(iterations: int = 200):
+    """
+    Per-request agent setup cost: rebuilding and compiling the graph on
+    every request (before) vs. reusing the compiled graph (after).
+    """
+    checkpointer = InMemorySaver()
+
+    def per_request_compile():
+        build_langgraph_agent(checkpointer)
+        get_runnable_config(settings.DEFAULT_USER_ID, settings.DEFAULT_SESSION_ID)
+
+    def per_request_config():
+        get_runnable_config(settings.DEFAULT_USER_ID, settings.DEFAULT_SESSION_ID)
+
+    before = _time_per_call(per_request_compile, iterations)
+    after = _time_per_call(per_request_config, iterations)
+
+    logger.info(
+        f"Agent setup per request: compile={before:.1f}us, reuse={after:.1f}us "
+        f"({before / max(after, 1e-9):.0f}x faster)"
+    )
+
+
+async def bench_memory_delta(turns: int = 30):
+    """
+    Messages submitted to Mem0 over a conversation: the whole message window
+    per turn (before) vs. only the new turn (after).
+    """
+    stub = StubMemory()
+
+    @asynccontextmanager
+    async def get_stub_memory():
+        yield stub
+
+    state: dict = {"messages": [], "summary": "", "history": []}
+    window_messages = 0
+    with mock.patch.object(memory_queue_module, "get_memory", get_stub_memory):
+        for turn in range(turns):
+            state["messages"] += [
+                HumanMessage(content=f"question {turn}", id=str(uuid4())),
+                AIMessage(content=f"answer {turn}", id=str(uuid4())),
+            ]
+            window_messages += len(state["messages"])
+
+            state.update(await save_to_memory(state))  # type: ignore
+
+            # mimic manage_context trimming the window
+            if len(state["messages"]) >= MESSAGE_LIMIT:
+                state["messages"] = state["messages"][-MESSAGES_TO_KEEP:]
+
+        await memory_queue.flush(timeout=10)
+
+    logger.info(
+        f"Messages sent to Mem0 over {turns} turns: "
+        f"window={window_messages}, delta={stub.messages}"
+    )
+
+
+async def bench_memory_client(iterations: int = 10):
+    """
+    Mem0 client acquisition: constructing an AsyncMemory per call (cold) vs.
+    the shared instance (warm). Needs PLAIN_DATABASE_URL to point to a local
+    Postgres with pgvector.
+    """
+    cold_total = 0.0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        memory = await asyncio.to_thread(AsyncMemory, config=memory_config)
+        cold_total += time.perf_counter() - start
+        pool = getattr(memory.vector_store, "connection_pool", None)
+        close_pool = getattr(pool, "close", None) or getattr(pool, "closeall", None)
+        if close_pool is not None:
+            close_pool()
+
+    # the first call opens the shared instance
+    async with get_memory():
+        pass
+
+    warm_total = 0.0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        async with get_memory():
+            pass
+        warm_total += time.perf_counter() - start
+
+    await close_memory()
+
+    logger.info(
+        f"Mem0 client per call: cold={cold_total / iterations * 1000:.1f}ms, "
+        f"warm={warm_total / iterations * 1000:.3f}ms"
+    )
+
+
+async def bench_url_capture(iterations: int = 5):
+    """
+    URL crawl latency against a local static server: a new browser per
+    capture (cold) vs. the warm crawler pool (pooled).
+    """
+    with serve_static({"article.html": article_html("Benchmark")}) as base_url:
+        url = f"{base_url}/article.html"
+
+        cold_total = 0.0
+        for _ in range(iterations):
+            start = time.perf_counter()
+            async with AsyncWebCrawler() as crawler:
+                await crawler.arun(url, config=crawler_config)
+            cold_total += time.perf_counter() - start
+
+        await crawler_pool.start()
+        pooled_total = 0.0
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await crawler_pool.crawl(url, crawler_config)
+            pooled_total += time.perf_counter() - start
+        await crawler_pool.close()
+
+    logger.info(
+        f"URL capture crawl: cold={cold_total / iterations * 1000:.0f}ms, "
+        f"pooled={pooled_total / iterations * 1000:.0f}ms"
+    )
+
+
+def write_synthetic_pdf(filepath: str, pages: int):
+    """Writes a PDF with a heading, text paragraphs and a ruled table per page."""
+    doc = pymupdf.open()
+    for page_idx in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Chapter {page_idx + 1}", fontsize=18)
+        paragraph = " ".join(
+            f"Sentence {i} of page {page_idx} about synthetic benchmarks."
+            for i in range(6)
+        )
+        page.insert_textbox(pymupdf.Rect(72, 90, 540, 300), paragraph, fontsize=10)
+
+        # 4x3 table drawn with lines, so lines_strict detects it
+        top, row_height, col_width = 320, 20, 150
+        for row in range(5):
+            y = top + row * row_height
+            page.draw_line((72, y), (72 + 3 * col_width, y))
+        for col in range(4):
+            x = 72 + col * col_width
+            page.draw_line((x, top), (x, top + 4 * row_height))
+        for row in range(4):
+            for col in range(3):
+                page.insert_text(
+                    (76 + col * col_width, top + row * row_height + 14),
+                    f"cell {row}-{col}",
+                    fontsize=9,
+                )
+    doc.save(filepath)
+    doc.close()
+
+
+async def bench_pdf_extraction(pages: int = 300):
+    """
+    Extraction time of a synthetic multi-hundred-page PDF: the single-process
+    loader on the event loop (before) vs. the sharded process pool (after).
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "synthetic.pdf")
+        write_synthetic_pdf(filepath, pages)
+
+        start = time.perf_counter()
+        loader = PyMuPDF4LLMLoader(
+            file_path=filepath,
+            mode="page",
+            extract_images=False,
+            table_strategy="lines_strict",
+        )
+        docs = await loader.aload()
+        before = time.perf_counter() - start
+
+        start_pdf_workers()
+        start = time.perf_counter()
+        extracted, _ = await extract_pdf_pages(filepath)
+        after = time.perf_counter() - start
+        shutdown_pdf_workers()
+
+    assert len(extracted) == pages, f"expected {pages} pages, got {len(extracted)}"
+    logger.info(
+        f"PDF extraction of {pages} pages: loader={before:.1f}s ({len(docs)} docs), "
+        f"process pool={after:.1f}s with {settings.PDF_WORKERS} workers"
+    )
+
+
+async def bench_pdf_upload(size_mb: int = 100):
+    """
+    Peak RSS growth while saving a large upload: reading the whole file
+    into memory (before) vs. streaming it in UPLOAD_CHUNK_SIZE chunks (after).
+    """
+    loop = asyncio.get_running_loop()
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "large.pdf")
+        with open(filepath, "wb") as f:
+            for _ in range(size_mb):
+                f.write(os.urandom(1024 * 1024))
+
+        peaks = {}
+        for streamed in (False, True):
+            # a fresh process per run, as the peak RSS never goes down
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                peaks[streamed] = await loop.run_in_executor(
+                    executor, peak_rss_of_upload, filepath, streamed
+                )
+
+    logger.info(
+        f"Peak RSS growth for a {size_mb}MB upload: "
+        f"buffered={peaks[False]}MB, streamed={peaks[True]}MB"
+    )
+
+
+async def bench_pdf_pipeline(pages: int = 300):
+    """
+    PDF ingestion with a stub embedder: extract everything, then chunk and
+    embed (before) vs. the page-by-page streaming pipeline (after).
+    Also checks that a failure mid-document rolls back the stored chunks.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "synthetic.pdf")
+        write_synthetic_pdf(filepath, pages)
+        start_pdf_workers()
+
+        before_store = StubChunkStore()
+        start = time.perf_counter()
+        with stub_capture_pipeline(before_store):
+            knowledge = [
+                page
+                async for page in capture_module._iter_pdf_knowledge(
+                    filepath, "synthetic.pdf"
+                )
+            ]
+            split_docs = await capture_module._split_knowledge(knowledge, "benchmark")
+        batch_size = settings.CAPTURE_BATCH_EMBED_SIZE
+        async with before_store.open_writer("benchmark") as writer:
+            for idx in range(0, len(split_docs), batch_size):
+                batch = split_docs[idx : idx + batch_size]
+                await before_store.embed_and_store(batch, writer)
+        before = time.perf_counter() - start
+        before_first = before_store.first_stored_at - start
+
+        after_store = StubChunkStore()
+        start = time.perf_counter()
+        with stub_capture_pipeline(after_store):
+            await capture_module._ingest_pdf(filepath, "synthetic.pdf", "benchmark")
+        after = time.perf_counter() - start
+        after_first = after_store.first_stored_at - start
+
+        failing_store = StubChunkStore(fail_on_batch=3)
+        try:
+            with stub_capture_pipeline(failing_store):
+                await capture_module._ingest_pdf(filepath, "synthetic.pdf", "benchmark")
+        except RuntimeError:
+            pass
+        shutdown_pdf_workers()
+
+    assert len(after_store.stored) == len(before_store.stored)
+    assert failing_store.batches == 3 and not failing_store.stored, "not rolled back"
+    logger.info(
+        f"PDF ingestion of {pages} pages: "
+        f"sequential={before:.1f}s (first batch stored after {before_first:.1f}s), "
+        f"pipelined={after:.1f}s (first batch stored after {after_first:.1f}s)"
+    )
+
+
+async def bench_selection_burst(selections: int = 1000):
+    """
+    Throughput of a burst of selection captures with a fake embedder:
+    one embedding request per selection (before) vs. the coalescing
+    selection buffer (after).
+    """
+
+    async def knowledge_base_exists(knowledge_base):
+        return None
+
+    url = "https://example.com/article"
+
+    async def save_selection(idx: int):
+        knowledge = await capture_module._handle_selection_capture(
+            f"selection {idx}", url  # type: ignore
+        )
+        await capture_module._save_to_vector_db(knowledge or [], "benchmark")
+
+    before_store = StubChunkStore(latency=0.02, seconds_per_chunk=0, concurrency=8)
+    start = time.perf_counter()
+    with stub_capture_pipeline(
+        before_store, _ensure_knowledge_base_exists=knowledge_base_exists
+    ):
+        await asyncio.gather(*(save_selection(idx) for idx in range(selections)))
+    before = time.perf_counter() - start
+
+    after_store = StubChunkStore(latency=0.02, seconds_per_chunk=0, concurrency=8)
+    start = time.perf_counter()
+    with stub_capture_pipeline(
+        after_store, _ensure_knowledge_base_exists=knowledge_base_exists
+    ):
+        await asyncio.gather(
+            *(
+                capture_module.handle_knowledge_capture(
+                    type="selection",
+                    knowledge_base="benchmark",
+                    url=url,  # type: ignore
+                    selection=f"selection {idx}",
+                )
+                for idx in range(selections)
+            )
+        )
+        after = time.perf_counter() - start
+        await capture_module.selection_buffer.close()
+
+    assert len(after_store.stored) == selections, f"stored {len(after_store.stored)}"
+    logger.info(
+        f"Burst of {selections} selections: "
+        f"unbatched={selections / before:.0f}/s ({before_store.batches} requests), "
+        f"buffered={selections / after:.0f}/s ({after_store.batches} requests)"
+    )
+
+
+async def bench_bulk_insert(rows: int = 5000):
+    """
+    Insert throughput of chunk rows with precomputed embeddings: regular
+    inserts vs. binary COPY. Needs ORM_DATABASE_URL to point to a local
+    Postgres with pgvector, e.g. `docker run -p 5432:5432 pgvector/pgvector:pg17`.
+    """
+    docs = [
+        Document(
+            page_content=f"benchmark chunk {idx} " * 40,
+            metadata={"source": "benchmark", "start_index": idx},
+        )
+        for idx in range(rows)
+    ]
+    vectors = random_vectors(rows)
+
+    rates = {}
+    for bulk in (False, True):
+        async with temporary_collection() as collection:
+            # the writer picks COPY from COPY_INSERT_MIN_ROWS rows on
+            with mock.patch.object(
+                settings, "COPY_INSERT_MIN_ROWS", 0 if bulk else rows + 1
+            ):
+                metrics = CaptureMetrics()
+                async with open_chunk_writer(collection, metrics=metrics) as writer:
+                    await writer.write(await writer.skip_stored(docs), vectors)
+            rates[bulk] = metrics.rates()["insert_chunks_per_sec"]
+            assert await count_chunks(collection) == rows
+
+    logger.info(
+        f"Bulk insert of {rows} rows with {settings.GEMINI_EMBEDDING_DIMS}-dim vectors: "
+        f"insert={rates[False]} rows/s, copy={rates[True]} rows/s"
+    )
+
+
+async def bench_conditional_refresh(iterations: int = 20):
+    """
+    Time to check an unchanged URL during a collection refresh: a full browser
+    crawl vs. a conditional request answered with 304 by a local static server.
+    """
+    with serve_static({"article.html": article_html("Refresh")}) as base_url:
+        url = f"{base_url}/article.html"
+
+        await crawler_pool.start()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await crawler_pool.crawl(url, crawler_config)
+        crawled = (time.perf_counter() - start) / iterations
+        await crawler_pool.close()
+
+        async with httpx.AsyncClient() as client:
+            last_modified = (await client.get(url)).headers["last-modified"]
+            source = {"etag": None, "last_modified": last_modified}
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                assert await capture_module._is_not_modified(client, url, source)
+            conditional = (time.perf_counter() - start) / iterations
+
+            stale = {"etag": None, "last_modified": "Mon, 01 Jan 2001 00:00:00 GMT"}
+            assert not await capture_module._is_not_modified(client, url, stale)
+
+    logger.info(
+        f"Unchanged URL check: crawl={crawled * 1000:.0f}ms, "
+        f"conditional request={conditional * 1000:.1f}ms"
+    )
+
+
+async def bench_site_crawl(articles: int = 40):
+    """
+    Site capture of a local static site with a stub chunk store: crawling
+    every page before ingesting (before) vs. streaming pages into the
+    pipeline while the crawl goes on (after). The crawl rules are covered
+    by test/test_site_crawler.py.
+    """
+    pages = site_pages(articles)
+    captured: List[str] = []
+
+    async def record_url_version(knowledge_base, url, version):
+        captured.append(url)
+
+    with serve_static(pages) as base_url:
+        start_url = f"{base_url}/index.html"
+        await crawler_pool.start()
+
+        before_store = StubChunkStore()
+        start = time.perf_counter()
+        with stub_capture_pipeline(
+            before_store, _record_url_version=record_url_version
+        ):
+            knowledge = []
+            async for url, result in crawl_site(start_url, crawler_config, 2, 100):
+                knowledge.extend(
+                    capture_module._knowledge_from_page(
+                        url, capture_module._crawled_page(result)
+                    )[0]
+                    or []
+                )
+
+            async def crawled_pages():
+                for page in knowledge:
+                    yield page
+
+            await capture_module._ingest_knowledge_stream(crawled_pages(), "benchmark")
+        before = time.perf_counter() - start
+        before_first = before_store.first_stored_at - start
+
+        after_store = StubChunkStore()
+        start = time.perf_counter()
+        with stub_capture_pipeline(after_store, _record_url_version=record_url_version):
+            await capture_module._ingest_site(start_url, "benchmark", 2, 100)
+        after = time.perf_counter() - start
+        after_first = after_store.first_stored_at - start
+
+        await crawler_pool.close()
+
+    logger.info(
+        f"Site capture of {len(captured)} pages: "
+        f"crawl then ingest={before:.1f}s (first batch stored after {before_first:.1f}s), "
+        f"streamed={after:.1f}s (first batch stored after {after_first:.1f}s)"
+    )
+
+
+async def bench_crawl_cache(iterations: int = 10):
+    """
+    Repeated captures of one URL: crawling the page every time (bypassCache)
+    vs. serving its extracted content from the disk crawl cache. The cache
+    behavior is covered by test/test_crawl_cache.py.
+    """
+    with tempfile.TemporaryDirectory() as directory, serve_static(
+        {"article.html": article_html("Cached")}
+    ) as base_url:
+        url = HttpUrl(f"{base_url}/article.html")
+        cache = CrawlCache(
+            os.path.join(directory, "crawl_cache.db"), ttl=3600, max_bytes=1 << 20
+        )
+        await cache.start()
+        await crawler_pool.start()
+
+        with mock.patch.object(capture_module, "crawl_cache", cache):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                await capture_module._handle_url_capture(url, bypass_cache=True)
+            crawled = (time.perf_counter() - start) / iterations
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                await capture_module._handle_url_capture(url)
+            cached = (time.perf_counter() - start) / iterations
+        await crawler_pool.close()
+
+        stats = cache.stats()
+        await cache.close()
+
+    logger.info(
+        f"Repeated URL capture: crawled={crawled * 1000:.0f}ms, "
+        f"cached={cached * 1000:.1f}ms "
+        f"(hit ratio {stats['hit_ratio']}, {stats['saved_crawl_seconds']}s saved)"
+    )
+
+
+def _sample_markdown(title: str, sections: int = 40) -> str:
+    """A documentation page with nested headings, lists, tables and code."""
+    parts = [f"# {title}\n"]
+    for idx in range(sections):
+        parts.append(f"## Section {idx}\n")
+        parts.append(
+            " ".join(
+                f"Sentence {i} of section {idx} explains how the {title} feature works."
+                for i in range(random.randint(3, 25))
+            )
+            + "\n"
+        )
+        if idx % 3 == 0:
+            parts.append(f"### Options of section {idx}\n")
+            parts.append("\n".join(f"- option_{i}: enables mode {i}" for i in range(6)))
+        if idx % 4 == 0:
+            parts.append("| Name | Type | Default |\n| --- | --- | --- |")
+            parts.append("\n".join(f"| field_{i} | int | {i} |" for i in range(8)))
+        if idx % 5 == 0:
+            parts.append(
+                "```python\n# not a heading\nconfig = load()\nrun(config)\n```"
+            )
+    return "\n\n".join(parts)
+
+
+async def bench_chunking(documents: int = 50):
+    """
+    Chunking of sample markdown documents: flattened whitespace and a fixed
+    1000/200 character splitter (before) vs. the structure-aware token
+    splitter (after). Reports the chunks produced, the tokens that would be
+    embedded and the throughput. The chunk invariants are covered by
+    test/test_chunking.py.
+    """
+    random.seed(0)
+    docs = [
+        Document(
+            page_content=_sample_markdown(f"Topic {idx}"), metadata={"source": idx}
+        )
+        for idx in range(documents)
+    ]
+    size = sum(len(doc.page_content) for doc in docs) / 1e6
+    chunk_settings = CollectionSettings()
+
+    start = time.perf_counter()
+    flattened = [
+        Document(page_content=" ".join(doc.page_content.split()), metadata=doc.metadata)
+        for doc in docs
+    ]
+    before_chunks = RecursiveCharacterTextSplitter(
+        chunk_size=1000, chunk_overlap=200, add_start_index=True
+    ).split_documents(flattened)
+    before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    after_chunks = split_markdown(
+        docs, chunk_settings.chunk_size, chunk_settings.chunk_overlap
+    )
+    after = time.perf_counter() - start
+
+    before_tokens = sum(count_tokens(chunk.page_content) for chunk in before_chunks)
+    after_tokens = sum(count_tokens(chunk.page_content) for chunk in after_chunks)
+
+    logger.info(
+        f"Chunking {documents} documents ({size:.1f}MB): "
+        f"characters={len(before_chunks)} chunks, {before_tokens} tokens, "
+        f"{size / before:.1f}MB/s; "
+        f"structure-aware={len(after_chunks)} chunks, {after_tokens} tokens, "
+        f"{size / after:.1f}MB/s"
+    )
+
+
+async def bench_parent_stitching(documents: int = 20):
+    """
+    Parent-document retrieval without a database: sample documents are split
+    into child chunks, and the children of every parent are stitched back
+    together. Checks that whole parents are rebuilt exactly and that windows
+    around a matched child stay within the parent budget.
+    """
+    random.seed(0)
+    chunk_settings = CollectionSettings(retrieval_mode="parents")
+    docs = [
+        Document(
+            page_content=_sample_markdown(f"Topic {idx}"), metadata={"source": idx}
+        )
+        for idx in range(documents)
+    ]
+    children = split_markdown(docs, *chunk_settings.indexed_chunking())
+
+    parents: Dict[Tuple[str, ...], List[Tuple[int, str]]] = {}
+    for child in children:
+        parents.setdefault(parent_key(child.metadata), []).append(
+            (child.metadata["start_index"], child.page_content)
+        )
+
+    start = time.perf_counter()
+    for key, chunks in parents.items():
+        chunks.sort()
+        text = docs[int(key[0])].page_content
+        first, (last_start, last) = chunks[0][0], chunks[-1]
+        stitched = parent_documents_module._stitch(chunks)
+        assert stitched.split() == text[first : last_start + len(last)].split(), key
+
+        tokens = [count_tokens(content) for _, content in chunks]
+        hit = random.randrange(len(chunks))
+        low, high = parent_documents_module._window(
+            tokens, hit, chunk_settings.chunk_size
+        )
+        assert low <= hit <= high
+        assert sum(tokens[low : high + 1]) <= max(
+            chunk_settings.chunk_size, tokens[hit]
+        )
+    elapsed = time.perf_counter() - start
+
+    child_tokens = sum(count_tokens(c.page_content) for c in children) / len(children)
+    logger.info(
+        f"Stitched {len(parents)} parents from {len(children)} child chunks "
+        f"(~{child_tokens:.0f} tokens each) in {elapsed * 1000:.0f}ms"
+    )
+
+
+async def main():
+    await bench_agent_setup()
+
+    await bench_memory_delta()
+
+    # await bench_memory_client()
+
+    await bench_url_capture()
+
+    await bench_pdf_extraction()
+
+    await bench_pdf_upload()
+
+    await bench_pdf_pipeline()
+
+    await bench_selection_burst()
+
+    await bench_conditional_refresh()
+
+    await bench_site_crawl()
+
+    await bench_crawl_cache()
+
+    await bench_chunking()
+
+    await bench_parent_stitching()
+
+    # await bench_bulk_insert()
+
+    return
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
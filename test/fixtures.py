@@ -0,0 +1,272 @@
+import asyncio
+import os
+import random
+import resource
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import asynccontextmanager, contextmanager
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+from unittest import mock
+from uuid import uuid4
+from fastapi import UploadFile
+from sqlalchemy import text
+
+from src.configs.settings import settings
+from src.db.session import get_async_engine, get_async_session
+from src.db.vectorstore import get_vector_store, invalidate_vector_store
+from src.schemas.collection import CollectionSettings
+from src.utils.uploads import save_upload
+
+"""
+  Stand-ins and helpers shared by the tests and the benchmarks, so both run
+  without the external services (Mem0, the embedding provider) of the server.
+  The database helpers need ORM_DATABASE_URL to point to a Postgres with
+  pgvector, e.g. `docker run -p 5432:5432 pgvector/pgvector:pg17`.
+"""
+
+
+class StubMemory:
+    """Mem0 stand-in that only counts the messages submitted to it."""
+
+    def __init__(self):
+        self.calls = 0
+        self.messages = 0
+
+    async def add(self, messages, user_id):
+        self.calls += 1
+        self.messages += len(messages)
+
+
+class StubChunkWriter:
+    """Chunk writer stand-in that keeps the chunks of one capture."""
+
+    def __init__(self):
+        self.staged: Dict[str, str] = {}
+
+    def summary(self):
+        return f"{len(self.staged)} stub chunks"
+
+
+class StubChunkStore:
+    """
+    Stand-in for the embedding and storage stages of the capture pipeline.
+    A batch takes `latency` plus `seconds_per_chunk` per chunk to embed, with
+    at most `concurrency` batches at once like a rate-limited API. The chunks
+    of a capture are stored when its writer commits, and the store can fail
+    on a given batch.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        seconds_per_chunk: float = 0.0002,
+        concurrency: Optional[int] = None,
+        fail_on_batch: int = 0,
+    ):
+        self.latency = latency
+        self.seconds_per_chunk = seconds_per_chunk
+        self.semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+        self.fail_on_batch = fail_on_batch
+        self.batches = 0
+        self.stored: Dict[str, str] = {}
+        self.first_stored_at = 0.0
+
+    @asynccontextmanager
+    async def open_writer(self, knowledge_base, replace_sources=True, metrics=None):
+        writer = StubChunkWriter()
+        yield writer
+        self.stored.update(writer.staged)
+
+    async def embed_and_store(self, split_docs, writer, metrics=None, batch_size=None):
+        self.batches += 1
+        if self.batches == self.fail_on_batch:
+            raise RuntimeError("embedding provider unavailable")
+        delay = self.latency + self.seconds_per_chunk * len(split_docs)
+        if self.semaphore:
+            async with self.semaphore:
+                await asyncio.sleep(delay)
+        else:
+            await asyncio.sleep(delay)
+        writer.staged.update({str(uuid4()): doc.page_content for doc in split_docs})
+        self.first_stored_at = self.first_stored_at or time.perf_counter()
+
+
+async def default_collection_settings(name: str) -> CollectionSettings:
+    return CollectionSettings()
+
+
+@contextmanager
+def stub_capture_pipeline(store: StubChunkStore, **patches) -> Iterator[None]:
+    """
+    Routes the embedding and storage of the capture pipeline to `store` and
+    gives every collection the default settings, restoring the originals
+    afterwards. Other attributes of the capture module can be replaced with
+    keyword arguments.
+    """
+    patches = {
+        "_embed_and_store": store.embed_and_store,
+        "open_chunk_writer": store.open_writer,
+        "get_collection_settings": default_collection_settings,
+        **patches,
+    }
+    with mock.patch.multiple("src.apis.capture", **patches):
+        yield
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def serve_static(pages: Dict[str, str]) -> Iterator[str]:
+    """Serves the given {path: html} pages from a local HTTP server."""
+    with tempfile.TemporaryDirectory() as directory:
+        for path, html in pages.items():
+            filepath = os.path.join(directory, path)
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(filepath, "w") as f:
+                f.write(html)
+
+        server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), partial(_QuietHandler, directory=directory)
+        )
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://127.0.0.1:{server.server_port}"
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def article_html(title: str, paragraphs: int = 30) -> str:
+    body = "".join(
+        f"<p>{title} paragraph {idx}: the quick brown fox jumps over the lazy dog.</p>"
+        for idx in range(paragraphs)
+    )
+    return f"<html><head><title>{title}</title></head><body><article><h1>{title}</h1>{body}</article></body></html>"
+
+
+def _site_page_html(title: str, links: List[str], canonical: str = "") -> str:
+    head = f'<link rel="canonical" href="{canonical}">' if canonical else ""
+    nav = "".join(f'<a href="{link}">{link}</a>' for link in links)
+    return article_html(title, paragraphs=200).replace(
+        "</head><body>", f"{head}</head><body><nav>{nav}</nav>"
+    )
+
+
+def site_pages(articles: int) -> Dict[str, str]:
+    """
+    A small site to crawl from index.html: a page disallowed by robots.txt,
+    an alias whose canonical URL is b.html, an off-site link, pages two and
+    three links deep and `articles` more pages linked from the index.
+    """
+    article_pages = [f"article-{idx}.html" for idx in range(articles)]
+    return {
+        "robots.txt": "User-agent: *\nDisallow: /private.html\n",
+        "index.html": _site_page_html(
+            "Index",
+            [
+                "a.html",
+                "a.html#intro",
+                "/b.html",
+                "alias.html",
+                "private.html",
+                "https://example.com/",
+                *article_pages,
+            ],
+        ),
+        "a.html": _site_page_html("A", ["deep.html", "index.html"]),
+        "b.html": _site_page_html("B", []),
+        "alias.html": _site_page_html("B", [], canonical="/b.html"),
+        "deep.html": _site_page_html("Deep", ["deeper.html"]),
+        "deeper.html": _site_page_html("Deeper", []),
+        "private.html": _site_page_html("Private", []),
+        **{page: _site_page_html(page, ["index.html"]) for page in article_pages},
+    }
+
+
+def peak_rss_of_upload(filepath: str, streamed: bool) -> int:
+    """
+    Saves `filepath` as an upload and returns how much the peak RSS of the
+    process grew, in MB. Meant to run in a fresh process, as the peak RSS
+    never goes down.
+    """
+
+    async def save(directory: str):
+        with open(filepath, "rb") as f:
+            upload = UploadFile(file=f, filename="large.pdf")
+            if streamed:
+                await save_upload(upload, directory, max_size=1 << 40)
+            else:
+                with open(os.path.join(directory, "large.pdf"), "wb") as out:
+                    out.write(await upload.read())
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(save(directory))
+    # ru_maxrss is in KB on Linux
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline) // 1024
+
+
+async def postgres_unavailable() -> str:
+    """
+    Returns why the database of ORM_DATABASE_URL cannot be reached, or an
+    empty string when it can.
+    """
+    try:
+        async with get_async_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as e:
+        return f"Postgres is not reachable: {e}"
+    return ""
+
+
+class PgvectorTestCase(unittest.IsolatedAsyncioTestCase):
+    """Runs against the Postgres of ORM_DATABASE_URL, skipped without it."""
+
+    async def asyncSetUp(self):
+        reason = await postgres_unavailable()
+        if reason:
+            self.skipTest(reason)
+
+    async def asyncTearDown(self):
+        # pooled connections are bound to the event loop of each test
+        await get_async_engine().dispose()
+
+
+def random_vectors(count: int) -> List[List[float]]:
+    return [
+        [random.random() for _ in range(settings.GEMINI_EMBEDDING_DIMS)]
+        for _ in range(count)
+    ]
+
+
+@asynccontextmanager
+async def temporary_collection() -> AsyncIterator[str]:
+    """Creates a throwaway collection and deletes it afterwards."""
+    collection = f"benchmark_{uuid4().hex[:8]}"
+    vector_store = get_vector_store(collection)
+    await vector_store.acreate_collection()
+    try:
+        yield collection
+    finally:
+        await vector_store.adelete_collection()
+        invalidate_vector_store(collection)
+
+
+async def count_chunks(collection: str) -> int:
+    async with get_async_session() as session:
+        statement = f"""
+            SELECT count(*) FROM {settings.EMBEDDINGS_TABLE} e
+            JOIN {settings.COLLECTIONS_TABLE} c ON c.uuid = e.collection_id
+            WHERE c.name = :name
+        """
+        return (
+            await session.execute(text(statement), {"name": collection})
+        ).scalar_one()
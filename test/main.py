@@ -80,7 +80,19 @@ async def embed_retrieved_contexts():
     return True
 
 
-async def generate_single_turn_dts():
+async def set_retrieval_mode(mode: str):
+    # "parents" indexes small child chunks and retrieves the whole selection they belong to
+    async with AsyncClient(base_url="http://localhost:8000/api/v1") as client:
+        response = await client.put(
+            url="/collection/settings",
+            json={"name": "default", "retrievalMode": mode},
+        )
+
+    logger.info(f"Retrieval mode of the default collection: {response.json()}")
+    return response.is_success
+
+
+async def generate_single_turn_dts(name: str = ""):
     hf_dataset = load_dataset("explodinggradients/amnesty_qa", "english_v3")
     generated_dataset: dict = {
         "user_input": [],
@@ -139,13 +151,15 @@ async def generate_single_turn_dts():
                 )
                 return False
 
-    with open("test/data/single_turn_dts.json", "w") as f:
+    with open(
+        f"test/data/{name + "_" if len(name) > 0 else ""}single_turn_dts.json", "w"
+    ) as f:
         json.dump(generated_dataset, f, indent=2)
 
     return True
 
 
-async def generate_multi_turn_dts():
+async def generate_multi_turn_dts(name: str = ""):
     hf_dataset = load_dataset("explodinggradients/amnesty_qa", "english_v3")
     generated_dataset: dict = {
         "user_input": [],
@@ -211,7 +225,9 @@ async def generate_multi_turn_dts():
                 )
                 return False
 
-    with open("test/data/multi_turn_dts.json", "w") as f:
+    with open(
+        f"test/data/{name + "_" if len(name) > 0 else ""}multi_turn_dts.json", "w"
+    ) as f:
         json.dump(generated_dataset, f, indent=2)
 
     return True
@@ -302,6 +318,20 @@ async def main():
 
     # await eval_multi_turn(name="notebooklm")
 
+    # Parent-document retrieval: switch a fresh default collection to parents
+    # mode before embedding the contexts, so they are indexed in child chunks
+    # if not (await set_retrieval_mode("parents")):
+    #     logger.info("Failed to switch to parent-document retrieval.")
+    #     return
+
+    # await embed_retrieved_contexts()
+
+    # if not (await generate_single_turn_dts(name="parents")):
+    #     logger.info("Failed to generate single turn dataset.")
+    #     return
+
+    # await eval_single_turn(name="parents")
+
     return
 
 
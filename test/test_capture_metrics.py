@@ -0,0 +1,28 @@
+import unittest
+
+from src.utils.capture_metrics import CaptureMetrics
+
+
+class CaptureMetricsTest(unittest.TestCase):
+    def test_failed_batches_are_not_counted_as_embedded(self):
+        metrics = CaptureMetrics()
+        metrics.embedding_started()
+        metrics.embedding_started()
+        metrics.embedding_failed()
+        metrics.embedding_finished(64, cache_hits=4)
+
+        self.assertEqual(metrics.chunks_embedded, 64)
+        self.assertEqual(metrics.cache_hits, 4)
+        self.assertGreater(metrics.embed_seconds, 0)
+
+    def test_only_failed_batches_embed_nothing(self):
+        metrics = CaptureMetrics()
+        metrics.embedding_started()
+        metrics.embedding_failed()
+
+        self.assertEqual(metrics.chunks_embedded, 0)
+        self.assertEqual(metrics.rates()["embed_chunks_per_sec"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
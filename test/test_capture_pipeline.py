@@ -0,0 +1,147 @@
+import asyncio
+import tracemalloc
+import unittest
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Tuple
+from unittest import mock
+from langchain_core.documents import Document
+
+import src.apis.capture as capture_module
+from src.configs.settings import settings
+from src.schemas.capture import KnowledgeExtractionHelperOutput
+from test.fixtures import (
+    PgvectorTestCase,
+    count_chunks,
+    default_collection_settings,
+    random_vectors,
+    temporary_collection,
+)
+
+
+class StubEmbeddingCache:
+    """Embedding cache stand-in that returns fresh random vectors."""
+
+    async def aembed_documents(self, texts):
+        return random_vectors(len(texts)), 0
+
+
+class RecordingEmbeddingCache:
+    """Embedding cache stand-in sending one request at a time."""
+
+    def __init__(self, events: List[Tuple[str, int]]):
+        self.events = events
+        self.requests = asyncio.Semaphore(1)
+
+    async def aembed_documents(self, texts):
+        async with self.requests:
+            await asyncio.sleep(0.02)
+        self.events.append(("embedded", len(texts)))
+        return [[0.0] for _ in texts], 0
+
+
+class RecordingWriter:
+    """Chunk writer stand-in that records when batches are written."""
+
+    def __init__(self, events: List[Tuple[str, int]]):
+        self.events = events
+
+    async def skip_stored(self, docs):
+        return docs
+
+    async def write(self, docs, vectors):
+        self.events.append(("written", len(docs)))
+
+
+class EmbedAndStoreTest(unittest.IsolatedAsyncioTestCase):
+    async def test_writes_batches_while_the_next_ones_are_embedded(self):
+        events: List[Tuple[str, int]] = []
+        docs = [Document(page_content=f"chunk {idx}") for idx in range(32)]
+
+        with mock.patch.object(
+            capture_module, "embedding_cache", RecordingEmbeddingCache(events)
+        ), mock.patch.object(settings, "EMBEDDING_BATCH_SIZE", 8):
+            await capture_module._embed_and_store(
+                docs, RecordingWriter(events)  # type: ignore
+            )
+
+        kinds = [kind for kind, _ in events]
+        self.assertEqual(kinds.count("written"), 4)
+        # the first batch is written before the last one is embedded
+        last_embedded = len(kinds) - 1 - kinds[::-1].index("embedded")
+        self.assertLess(kinds.index("written"), last_embedded)
+
+
+class FlushSelectionsTest(unittest.IsolatedAsyncioTestCase):
+    async def test_embeds_a_flush_in_one_request(self):
+        events: List[Tuple[str, int]] = []
+        writer = RecordingWriter(events)
+
+        @asynccontextmanager
+        async def open_writer(knowledge_base, replace_sources=True, metrics=None):
+            yield writer
+
+        async def knowledge_base_exists(knowledge_base):
+            return None
+
+        chunks = settings.EMBEDDING_BATCH_SIZE * 3
+        docs = [Document(page_content=f"selection {idx}") for idx in range(chunks)]
+        with mock.patch.multiple(
+            "src.apis.capture",
+            embedding_cache=RecordingEmbeddingCache(events),
+            open_chunk_writer=open_writer,
+            _ensure_knowledge_base_exists=knowledge_base_exists,
+        ), mock.patch.object(settings, "SELECTION_BUFFER_MAX_CHUNKS", chunks):
+            await capture_module._flush_selections("default", docs)
+
+        self.assertEqual(events, [("embedded", chunks), ("written", chunks)])
+
+
+async def _pages(count: int) -> AsyncIterator[KnowledgeExtractionHelperOutput]:
+    for idx in range(count):
+        yield KnowledgeExtractionHelperOutput(
+            content=f"Page {idx} of a long document. " * 40,
+            metadata={"source": "https://example.com/doc.pdf", "page_number": idx},
+        )
+
+
+class IngestMemoryTest(PgvectorTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        # small batches, so a few pages already fill the pipeline
+        for patcher in (
+            mock.patch.multiple(
+                "src.apis.capture",
+                embedding_cache=StubEmbeddingCache(),
+                get_collection_settings=default_collection_settings,
+            ),
+            mock.patch.object(settings, "CAPTURE_BATCH_EMBED_SIZE", 16),
+            mock.patch.object(settings, "EMBEDDING_BATCH_SIZE", 8),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def _peak_memory(self, pages: int) -> int:
+        async with temporary_collection() as collection:
+            tracemalloc.start()
+            try:
+                progress = await capture_module._ingest_knowledge_stream(
+                    _pages(pages), collection
+                )
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            self.assertEqual(await count_chunks(collection), progress["chunks"])
+        return peak
+
+    async def test_peak_memory_does_not_grow_with_the_page_count(self):
+        # warms up the statement caches of the database clients
+        await self._peak_memory(20)
+
+        small = await self._peak_memory(100)
+        large = await self._peak_memory(800)
+
+        self.assertLess(large, small * 1.5, f"{small} bytes vs {large} bytes")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import asyncio
+import unittest
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest import mock
+
+from src.apis.chat import handle_chat_stream
+
+
+class StubGraph:
+    """Agent stand-in whose turn goes through two nodes."""
+
+    def __init__(self):
+        self.finished = asyncio.Event()
+
+    async def aget_state(self, config):
+        return SimpleNamespace(values={})
+
+    async def astream(self, input, config, stream_mode):
+        for node in ("respond_or_retrieve", "save_to_memory"):
+            await asyncio.sleep(0.01)
+            yield "updates", {node: {}}
+        self.finished.set()
+
+
+class ChatStreamTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.graph = StubGraph()
+
+        @asynccontextmanager
+        async def get_stub_agent(user_id, thread_id):
+            yield self.graph, {}
+
+        patcher = mock.patch("src.apis.chat.get_langgraph_agent", get_stub_agent)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_streams_the_turn_until_done(self):
+        events = [event async for event in handle_chat_stream("default", "question")]
+
+        self.assertEqual(
+            [event.split("\n")[0] for event in events],
+            ["event: node", "event: node", "event: done"],
+        )
+
+    async def test_turn_completes_after_the_client_disconnects(self):
+        stream = handle_chat_stream("default", "question")
+        self.assertTrue((await anext(stream)).startswith("event: node"))
+        await stream.aclose()
+
+        await asyncio.wait_for(self.graph.finished.wait(), timeout=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
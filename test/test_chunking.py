@@ -0,0 +1,101 @@
+import unittest
+from typing import List
+from langchain_core.documents import Document
+
+from src.utils.chunking import count_tokens, normalize_markdown, split_markdown
+
+CHUNK_SIZE = 120
+CHUNK_OVERLAP = 20
+
+CODE_BLOCK = "```python\n# not a heading\nconfig = load()\nrun(config)\n```"
+
+
+def _sentences(topic: str, count: int) -> str:
+    return " ".join(
+        f"Sentence {idx} explains how the {topic} feature works."
+        for idx in range(count)
+    )
+
+
+def _document() -> Document:
+    text = "\n\n".join(
+        [
+            "# Guide",
+            _sentences("intro", 3),
+            "## Setup",
+            _sentences("setup", 4),
+            CODE_BLOCK,
+            "## Usage",
+            "### Options",
+            "\n".join(f"- option_{idx}: enables mode {idx}" for idx in range(5)),
+            "## Internals",
+            _sentences("internals", 60),
+        ]
+    )
+    return Document(page_content=text, metadata={"source": "guide.md"})
+
+
+def _split(doc: Document) -> List[Document]:
+    return split_markdown([doc], CHUNK_SIZE, CHUNK_OVERLAP)
+
+
+class SplitMarkdownTest(unittest.TestCase):
+    def test_chunks_fit_the_token_budget(self):
+        chunks = _split(_document())
+
+        self.assertGreater(len(chunks), 3)
+        for chunk in chunks:
+            # the splitter may add a separator token when it joins pieces
+            self.assertLessEqual(count_tokens(chunk.page_content), CHUNK_SIZE + 8)
+
+    def test_start_index_points_at_the_chunk(self):
+        doc = _document()
+        for chunk in _split(doc):
+            start = chunk.metadata["start_index"]
+            self.assertTrue(doc.page_content[start:].startswith(chunk.page_content))
+            self.assertEqual(chunk.metadata["source"], "guide.md")
+
+    def test_keeps_headings_with_their_content(self):
+        chunks = _split(_document())
+
+        for chunk in chunks:
+            lines = [line for line in chunk.page_content.splitlines() if line]
+            self.assertFalse(all(line.startswith("#") for line in lines))
+
+        internals = [c for c in chunks if c.metadata["section"] == "Guide > Internals"]
+        self.assertGreater(len(internals), 1)
+        self.assertTrue(internals[0].page_content.startswith("## Internals\n"))
+
+        # a heading directly followed by a subsection is part of its chunk
+        options = next(c for c in chunks if "option_0" in c.page_content)
+        self.assertIn("## Usage", options.page_content)
+        self.assertEqual(options.metadata["section"], "Guide > Usage > Options")
+
+    def test_does_not_split_fenced_code_blocks(self):
+        chunks = _split(_document())
+
+        self.assertTrue(any(CODE_BLOCK in chunk.page_content for chunk in chunks))
+        self.assertFalse(any("not a heading" in c.metadata["section"] for c in chunks))
+
+    def test_long_sections_overlap(self):
+        chunks = [
+            chunk
+            for chunk in _split(_document())
+            if chunk.metadata["section"] == "Guide > Internals"
+        ]
+
+        for previous, chunk in zip(chunks, chunks[1:]):
+            previous_end = previous.metadata["start_index"] + len(previous.page_content)
+            self.assertLess(chunk.metadata["start_index"], previous_end)
+
+
+class NormalizeMarkdownTest(unittest.TestCase):
+    def test_collapses_blank_lines_and_trailing_spaces(self):
+        text = "# Title  \n\n\n\n| a | b |\n| - | - |   \n\n\n- item\n"
+        self.assertEqual(
+            normalize_markdown(text), "# Title\n\n| a | b |\n| - | - |\n\n- item"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from crawl4ai import CrawlerRunConfig
+
+from src.utils.crawl_cache import CrawlCache, CrawledPage
+
+CONFIG = CrawlerRunConfig(word_count_threshold=10)
+PAGE = CrawledPage(markdown="x" * 1000, etag='"v1"')
+
+
+class CrawlCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "crawl_cache.db")
+
+    async def _open(self, ttl: float = 3600, max_bytes: int = 1 << 20) -> CrawlCache:
+        cache = CrawlCache(self.path, ttl=ttl, max_bytes=max_bytes)
+        await cache.start()
+        self.addAsyncCleanup(cache.close)
+        return cache
+
+    async def test_serves_pages_by_canonical_url_and_config(self):
+        cache = await self._open()
+        await cache.put("https://example.com/docs", CONFIG, PAGE, 2.0)
+
+        self.assertEqual(
+            await cache.get("HTTPS://example.com/docs/#intro", CONFIG), PAGE
+        )
+        other_config = CrawlerRunConfig(word_count_threshold=20)
+        self.assertIsNone(await cache.get("https://example.com/docs", other_config))
+        self.assertIsNone(await cache.get("https://example.com/blog", CONFIG))
+
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+        self.assertEqual(stats["saved_crawl_seconds"], 2.0)
+
+    async def test_entries_expire_after_the_ttl(self):
+        cache = await self._open(ttl=0.2)
+        await cache.put("https://example.com/docs", CONFIG, PAGE, 1.0)
+        self.assertIsNotNone(await cache.get("https://example.com/docs", CONFIG))
+
+        await asyncio.sleep(0.3)
+        self.assertIsNone(await cache.get("https://example.com/docs", CONFIG))
+
+    async def test_evicts_the_least_recently_used_entries(self):
+        cache = await self._open(max_bytes=3000)
+        for idx in range(3):
+            await cache.put(f"https://example.com/{idx}", CONFIG, PAGE, 1.0)
+            await asyncio.sleep(0.01)
+
+        # page 0 is read again, page 1 becomes the least recently used
+        await cache.get("https://example.com/0", CONFIG)
+        await asyncio.sleep(0.01)
+        await cache.put("https://example.com/3", CONFIG, PAGE, 1.0)
+
+        self.assertIsNone(await cache.get("https://example.com/1", CONFIG))
+        for idx in (0, 2, 3):
+            self.assertIsNotNone(await cache.get(f"https://example.com/{idx}", CONFIG))
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual(cache.stats()["bytes"], 3000)
+
+    async def test_skips_pages_larger_than_the_cache(self):
+        cache = await self._open(max_bytes=500)
+        await cache.put("https://example.com/docs", CONFIG, PAGE, 1.0)
+
+        self.assertIsNone(await cache.get("https://example.com/docs", CONFIG))
+        self.assertEqual(cache.stats()["bytes"], 0)
+
+    async def test_keeps_entries_across_restarts(self):
+        cache = await self._open()
+        await cache.put("https://example.com/docs", CONFIG, PAGE, 1.0)
+        await cache.close()
+
+        reopened = await self._open()
+        self.assertEqual(await reopened.get("https://example.com/docs", CONFIG), PAGE)
+        self.assertEqual(reopened.stats()["bytes"], 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
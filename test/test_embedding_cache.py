@@ -0,0 +1,73 @@
+import unittest
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Any, Dict, List
+from unittest import mock
+
+from src.db.embedding_cache import EmbeddingCache
+
+
+class StubEmbedder:
+    """Embedding client stand-in that defaults to more dims than configured."""
+
+    DEFAULT_DIMS = 3072
+
+    async def aembed_documents(self, texts, output_dimensionality=None):
+        dims = output_dimensionality or self.DEFAULT_DIMS
+        return [[float(len(text))] * dims for text in texts]
+
+
+class StubSession:
+    """Session stand-in that records the cache rows written to it."""
+
+    def __init__(self):
+        self.rows: List[Dict[str, Any]] = []
+
+    async def execute(self, statement, params=None):
+        if "INSERT" in str(statement):
+            self.rows.extend(params)
+        return SimpleNamespace(all=lambda: [])
+
+    async def commit(self):
+        pass
+
+
+class EmbeddingCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.session = StubSession()
+
+        @asynccontextmanager
+        async def get_stub_session():
+            yield self.session
+
+        patcher = mock.patch(
+            "src.db.embedding_cache.get_async_session", get_stub_session
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_stores_vectors_when_the_client_defaults_to_other_dims(self):
+        cache = EmbeddingCache(
+            embedder=StubEmbedder(),  # type: ignore
+            model="embedding-model",
+            dims=1536,
+            table="embedding_cache",
+            lru_size=10,
+            concurrency=1,
+            max_retries=0,
+            retry_backoff=0,
+        )
+
+        vectors, hits = await cache.aembed_documents(["a", "bb", "a"])
+
+        self.assertEqual(hits, 0)
+        self.assertEqual([len(vector) for vector in vectors], [1536] * 3)
+        self.assertEqual(len(self.session.rows), 2)
+        self.assertTrue(all(row["dims"] == 1536 for row in self.session.rows))
+
+        # served from the LRU without another request
+        self.assertEqual((await cache.aembed_documents(["bb"]))[1], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
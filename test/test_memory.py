@@ -0,0 +1,72 @@
+import unittest
+from contextlib import asynccontextmanager
+from unittest import mock
+from uuid import uuid4
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.utils.langgraph.config import MESSAGE_LIMIT, MESSAGES_TO_KEEP
+from src.utils.langgraph.nodes import save_to_memory
+from src.utils.memory_queue import memory_queue
+from test.fixtures import StubMemory
+
+
+class SaveToMemoryTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.memory = StubMemory()
+
+        @asynccontextmanager
+        async def get_stub_memory():
+            yield self.memory
+
+        patcher = mock.patch("src.utils.memory_queue.get_memory", get_stub_memory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        await memory_queue.flush(timeout=10)
+
+    async def test_sends_only_the_current_turn(self):
+        turns = 30
+        state: dict = {"messages": [], "summary": "", "history": []}
+        for turn in range(turns):
+            state["messages"] += [
+                HumanMessage(content=f"question {turn}", id=str(uuid4())),
+                AIMessage(content=f"answer {turn}", id=str(uuid4())),
+            ]
+            state.update(await save_to_memory(state))  # type: ignore
+
+            # the same turn must not be re-sent, e.g. when the node runs again
+            state.update(await save_to_memory(state))  # type: ignore
+
+            # mimic manage_context trimming the window
+            if len(state["messages"]) >= MESSAGE_LIMIT:
+                state["messages"] = state["messages"][-MESSAGES_TO_KEEP:]
+
+        await memory_queue.flush(timeout=10)
+
+        self.assertEqual(self.memory.calls, turns)
+        self.assertEqual(self.memory.messages, 2 * turns)
+
+    async def test_skips_tool_calls_of_the_turn(self):
+        state: dict = {
+            "messages": [
+                HumanMessage(content="question", id=str(uuid4())),
+                AIMessage(
+                    content="",
+                    id=str(uuid4()),
+                    tool_calls=[{"name": "retrieve_docs", "args": {}, "id": "call"}],
+                ),
+                AIMessage(content="answer", id=str(uuid4())),
+            ],
+            "summary": "",
+            "history": [],
+        }
+        await save_to_memory(state)  # type: ignore
+        await memory_queue.flush(timeout=10)
+
+        self.assertEqual(self.memory.calls, 1)
+        self.assertEqual(self.memory.messages, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+import unittest
+from typing import List, Tuple
+from unittest import mock
+from langchain_core.documents import Document
+
+from src.configs.settings import settings
+from src.db.chunk_writer import open_chunk_writer
+from src.db.parent_documents import fetch_parent_documents
+from src.db.vectorstore import get_vector_store
+from test.fixtures import (
+    PgvectorTestCase,
+    count_chunks,
+    random_vectors,
+    temporary_collection,
+)
+
+
+def _capture(contents: List[str]) -> List[Document]:
+    return [
+        Document(
+            page_content=content,
+            metadata={"source": "https://example.com/doc", "start_index": idx},
+        )
+        for idx, content in enumerate(contents)
+    ]
+
+
+async def _write(
+    collection: str, docs: List[Document], replace_sources: bool = True
+) -> Tuple[int, int]:
+    async with open_chunk_writer(collection, replace_sources) as writer:
+        new_docs = await writer.skip_stored(docs)
+        await writer.write(new_docs, random_vectors(len(new_docs)))
+    return writer.inserted, writer.deleted
+
+
+class BulkInsertTest(PgvectorTestCase):
+    async def test_similarity_search_after_copy_on_the_same_pool(self):
+        docs = _capture([f"chunk {idx}" for idx in range(50)])
+        vectors = random_vectors(len(docs))
+
+        async with temporary_collection() as collection:
+            with mock.patch.object(settings, "COPY_INSERT_MIN_ROWS", 1):
+                async with open_chunk_writer(collection) as writer:
+                    await writer.write(await writer.skip_stored(docs), vectors)
+            self.assertEqual(await count_chunks(collection), len(docs))
+
+            # the only pooled connection ran the COPY, PGVector must still bind
+            # its vectors as text on it
+            found = await get_vector_store(collection).asimilarity_search_by_vector(
+                vectors[7], k=1
+            )
+            self.assertEqual(found[0].page_content, "chunk 7")
+
+
+class ChunkWriterTest(PgvectorTestCase):
+    async def test_recapture_replaces_the_previous_version(self):
+        chunks = 500
+        contents = [f"paragraph {idx} of the document" for idx in range(chunks)]
+
+        async with temporary_collection() as collection:
+            self.assertEqual(await _write(collection, _capture(contents)), (chunks, 0))
+
+            # the same content again writes nothing
+            self.assertEqual(await _write(collection, _capture(contents)), (0, 0))
+            self.assertEqual(await count_chunks(collection), chunks)
+
+            # an edited and a removed paragraph
+            changed = contents[:-1]
+            changed[0] = "an edited first paragraph"
+            self.assertEqual(await _write(collection, _capture(changed)), (1, 2))
+            self.assertEqual(await count_chunks(collection), chunks - 1)
+
+    async def test_failed_capture_writes_nothing(self):
+        async with temporary_collection() as collection:
+            with self.assertRaises(RuntimeError):
+                async with open_chunk_writer(collection) as writer:
+                    docs = await writer.skip_stored(_capture(["a", "b"]))
+                    await writer.write(docs, random_vectors(len(docs)))
+                    raise RuntimeError("embedding provider unavailable")
+
+            self.assertEqual(await count_chunks(collection), 0)
+
+    async def test_failed_recapture_keeps_the_previous_version(self):
+        contents = [f"paragraph {idx} of the document" for idx in range(10)]
+        changed = [f"edited paragraph {idx}" for idx in range(10)]
+
+        async with temporary_collection() as collection:
+            await _write(collection, _capture(contents))
+
+            with self.assertRaises(RuntimeError):
+                async with open_chunk_writer(collection) as writer:
+                    # the first batch is inserted before the capture fails
+                    docs = await writer.skip_stored(_capture(changed))
+                    await writer.write(docs[:5], random_vectors(5))
+                    raise RuntimeError("embedding provider unavailable")
+
+            found = await get_vector_store(collection).asimilarity_search_by_vector(
+                random_vectors(1)[0], k=20
+            )
+            self.assertEqual(
+                sorted(doc.page_content for doc in found), sorted(contents)
+            )
+
+
+def _parent(text: str, size: int, **metadata) -> List[Document]:
+    metadata = {"source": "https://example.com/doc", **metadata}
+    return [
+        Document(
+            page_content=text[start : start + size],
+            metadata={**metadata, "start_index": start},
+        )
+        for start in range(0, len(text), size)
+    ]
+
+
+class ParentDocumentsTest(PgvectorTestCase):
+    async def test_stitches_the_selection_of_a_hit(self):
+        text = "the whole selection is rebuilt from its chunks"
+        chunks = _parent(text, 10, selection_id="s1")
+
+        async with temporary_collection() as collection:
+            await _write(collection, chunks, replace_sources=False)
+            parents = await fetch_parent_documents(collection, [chunks[2]], 1000)
+
+        self.assertEqual(parents, [text])
+
+    async def test_keeps_the_hit_of_colliding_legacy_selections(self):
+        first = _parent("first selection of the page", 10)
+        second = _parent("second selection of the page", 10)
+
+        async with temporary_collection() as collection:
+            await _write(collection, first, replace_sources=False)
+            await _write(collection, second, replace_sources=False)
+
+            # both selections have the key (source, '', '', '') and the same offsets
+            hit = Document(
+                page_content=second[1].page_content, metadata=second[1].metadata
+            )
+            parents = await fetch_parent_documents(collection, [hit], 1000)
+
+        self.assertEqual(parents, [second[1].page_content])
+
+    async def test_stitches_each_parent_of_a_shared_section(self):
+        # the same heading path on two pages of a document and on another site
+        section = "Guide > Setup"
+        parents = [
+            _parent("setup of the first page", 8, page_number=1, section=section),
+            _parent("setup of the second page", 8, page_number=2, section=section),
+            _parent(
+                "setup of another site",
+                8,
+                source="https://example.org/doc",
+                section=section,
+            ),
+        ]
+
+        async with temporary_collection() as collection:
+            await _write(collection, sum(parents, []), replace_sources=False)
+            hits = [parents[1][2], parents[2][0], parents[0][1]]
+            stitched = await fetch_parent_documents(collection, hits, 1000)
+
+        self.assertEqual(
+            stitched,
+            [
+                "setup of the second page",
+                "setup of another site",
+                "setup of the first page",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
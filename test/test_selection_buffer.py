@@ -0,0 +1,60 @@
+import asyncio
+import unittest
+from typing import List, Tuple
+from langchain_core.documents import Document
+
+from src.utils.selection_buffer import SelectionBuffer
+
+
+def _selection(idx: int) -> List[Document]:
+    return [Document(page_content=f"selection {idx}")]
+
+
+class SelectionBufferTest(unittest.IsolatedAsyncioTestCase):
+    async def test_starts_lazily_and_coalesces_selections(self):
+        flushed: List[Tuple[str, int]] = []
+
+        async def flusher(knowledge_base: str, docs: List[Document]):
+            flushed.append((knowledge_base, len(docs)))
+
+        buffer = SelectionBuffer(flusher, window=0.01, max_chunks=100)
+        await asyncio.gather(*(buffer.add("default", _selection(i)) for i in range(10)))
+
+        self.assertTrue(buffer.running)
+        self.assertEqual(flushed, [("default", 10)])
+        await buffer.close()
+
+    async def test_flush_errors_reach_every_request(self):
+        async def flusher(knowledge_base: str, docs: List[Document]):
+            raise ValueError("embedding provider unavailable")
+
+        buffer = SelectionBuffer(flusher, window=0.01, max_chunks=100)
+        results = await asyncio.gather(
+            *(buffer.add("default", _selection(i)) for i in range(3)),
+            return_exceptions=True,
+        )
+
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+        self.assertEqual(buffer.stats()["failed"], 3)
+
+    async def test_cancelled_flush_fails_waiting_requests(self):
+        async def flusher(knowledge_base: str, docs: List[Document]):
+            # e.g. the embedding request of the flush was cancelled
+            raise asyncio.CancelledError()
+
+        buffer = SelectionBuffer(flusher, window=0.01, max_chunks=100)
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                *(buffer.add("default", _selection(i)) for i in range(2)),
+                return_exceptions=True,
+            ),
+            timeout=1,
+        )
+        await buffer.close()
+
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+        self.assertEqual(buffer.stats()["failed"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
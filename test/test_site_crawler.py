@@ -0,0 +1,76 @@
+import unittest
+from types import SimpleNamespace
+from typing import List
+from unittest import mock
+import httpx
+
+from src.utils.site_crawler import canonicalize_url, crawl_site
+from test.fixtures import serve_static, site_pages
+
+
+class StubCrawlerPool:
+    """Crawler pool stand-in fetching pages over plain HTTP, without a browser."""
+
+    async def crawl(self, url, config):
+        async with httpx.AsyncClient(follow_redirects=True) as client:
+            response = await client.get(url)
+        return SimpleNamespace(
+            success=response.status_code == 200,
+            html=response.text,
+            redirected_url=str(response.url),
+        )
+
+
+class CanonicalizeUrlTest(unittest.TestCase):
+    def test_spellings_of_a_page_compare_equal(self):
+        self.assertEqual(
+            canonicalize_url("HTTP://Example.com:80/docs/#intro"),
+            canonicalize_url("http://example.com/docs"),
+        )
+        self.assertEqual(
+            canonicalize_url("https://example.com:8443/"), "https://example.com:8443/"
+        )
+
+
+class CrawlSiteTest(unittest.IsolatedAsyncioTestCase):
+    articles = 5
+
+    async def asyncSetUp(self):
+        patcher = mock.patch("src.utils.site_crawler.crawler_pool", StubCrawlerPool())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def _crawl(self, base_url: str, max_depth: int, max_pages: int) -> List[str]:
+        return [
+            url
+            async for url, _ in crawl_site(
+                f"{base_url}/index.html", None, max_depth, max_pages  # type: ignore
+            )
+        ]
+
+    async def test_follows_the_rules_of_the_site(self):
+        with serve_static(site_pages(self.articles)) as base_url:
+            crawled = await self._crawl(base_url, max_depth=2, max_pages=100)
+
+        # no private.html (robots.txt), alias.html (canonical b.html),
+        # deeper.html (3 links deep) or off-site page
+        pages = ["index.html", "a.html", "b.html", "deep.html"]
+        pages += [f"article-{idx}.html" for idx in range(self.articles)]
+        self.assertCountEqual(crawled, [f"{base_url}/{page}" for page in pages])
+
+    async def test_stops_at_the_depth_limit(self):
+        with serve_static(site_pages(self.articles)) as base_url:
+            crawled = await self._crawl(base_url, max_depth=0, max_pages=100)
+
+        self.assertEqual(crawled, [f"{base_url}/index.html"])
+
+    async def test_stops_at_the_page_budget(self):
+        with serve_static(site_pages(self.articles)) as base_url:
+            crawled = await self._crawl(base_url, max_depth=2, max_pages=3)
+
+        pages = ["index.html", "a.html", "b.html"]
+        self.assertCountEqual(crawled, [f"{base_url}/{page}" for page in pages])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import asyncio
+import io
+import multiprocessing
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import HTTPException, UploadFile
+
+from src.utils.uploads import save_upload
+from test.fixtures import peak_rss_of_upload
+
+
+class SaveUploadTest(unittest.IsolatedAsyncioTestCase):
+    async def test_streamed_upload_keeps_peak_rss_flat(self):
+        size_mb = 64
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, "large.pdf")
+            with open(filepath, "wb") as f:
+                for _ in range(size_mb):
+                    f.write(os.urandom(1024 * 1024))
+
+            # a fresh process, as the peak RSS of this one never goes down
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                growth = await asyncio.get_running_loop().run_in_executor(
+                    executor, peak_rss_of_upload, filepath, True
+                )
+
+        self.assertLess(growth, size_mb / 2)
+
+    async def test_rejects_oversized_body_and_removes_partial_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # no declared size, so the limit is only hit while streaming
+            upload = UploadFile(file=io.BytesIO(b"x" * 4096), filename="large.pdf")
+            with self.assertRaises(HTTPException) as raised:
+                await save_upload(upload, directory, max_size=1024)
+
+            self.assertEqual(raised.exception.status_code, 413)
+            self.assertEqual(os.listdir(directory), [])
+
+
+if __name__ == "__main__":
+    unittest.main()